@@ -0,0 +1 @@
+"""Offline benchmarks of the SDK, run with ``python -m benchmarks.<name>``"""
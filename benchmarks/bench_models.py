@@ -0,0 +1,142 @@
+"""Construction time, memory and encoding time of the models
+
+Usage: python -m benchmarks.bench_models [--rounds N]
+
+Construction is compared with eager models, which build every field and
+nested model up front as the models did before LazyModel. Encoding is
+compared with the reflective path the generated serializers replaced (see
+juejin.serializers), kept here as the legacy_* functions.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.payloads import article_detail
+from juejin import codec
+from juejin.models import (ArticleRequest, DescribeArticleDetailResponse, DescribeArticleListRequest,
+                           LazyModel)
+
+
+class LegacyEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, LazyModel):
+            return obj._to_dict()
+        if isinstance(obj, object) and hasattr(obj, '__dict__'):
+            return obj.__dict__
+        return super().default(obj)
+
+
+class EagerModel:
+    """Model with every field of a LazyModel class set as an attribute at construction"""
+
+    def __init__(self, model: type, data: dict):
+        if data is None:
+            data = {}
+        for name in model._fields:
+            field = getattr(model, name)
+            value = data.get(name, field.default)
+            if field.model is not None:
+                if field.many:
+                    value = [EagerModel(field.model, item) for item in value or ()]
+                else:
+                    value = EagerModel(field.model, value)
+            elif isinstance(value, (list, dict)) and name not in data:
+                value = type(value)(value)
+            setattr(self, name, value)
+
+
+def eager_response(data: dict) -> EagerModel:
+    return EagerModel(DescribeArticleDetailResponse, data)
+
+
+def legacy_serialize(obj) -> bytes:
+    return codec.dumps({k: v for k, v in obj._to_dict().items() if v is not None}, ensure_ascii=True)
+
+
+def legacy_to_json(obj) -> str:
+    return json.dumps(obj, cls=LegacyEncoder)
+
+
+def legacy_from_dict(obj, data: dict):
+    attrs = obj.__dict__
+    for k, v in data.items():
+        if k in attrs:
+            setattr(obj, k, v)
+    return obj
+
+
+def _us(fn, rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def bench_encode(rounds: int):
+    """Mean microseconds of (legacy, generated) encoding and decoding by case"""
+    article = ArticleRequest(title="标题", brief_content="摘要" * 50, mark_content="正文" * 500, tag_ids=["1", "2"])
+    listing = DescribeArticleListRequest()
+    # Light detail without the article body, so model handling rather than string escaping dominates
+    data = json.loads(json.dumps(article_detail()))
+    for field in ("content", "mark_content", "app_html_content", "web_html_content"):
+        data["article_info"][field] = ""
+    draft = dict(article._to_dict(), id="1", user_id="2", ctime="1700000000", mtime="1700000000", status=0)
+    cases = {
+        "ArticleRequest._serialize": (lambda: legacy_serialize(article), article._serialize),
+        "DescribeArticleListRequest._serialize": (lambda: legacy_serialize(listing), listing._serialize),
+        "ArticleRequest.to_json": (lambda: legacy_to_json(article), article.to_json),
+        "DescribeArticleDetailResponse.to_json": (lambda: legacy_to_json(DescribeArticleDetailResponse(data)),
+                                                  lambda: DescribeArticleDetailResponse(data).to_json()),
+        "ArticleRequest.from_dict": (lambda: legacy_from_dict(ArticleRequest(), draft),
+                                     lambda: ArticleRequest().from_dict(draft)),
+    }
+    return {name: (_us(legacy, rounds), _us(generated, rounds)) for name, (legacy, generated) in cases.items()}
+
+
+def bench_construct(payloads, rounds: int, model=DescribeArticleDetailResponse) -> float:
+    """Mean microseconds to build a response and read a few fields"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for data in payloads:
+            resp = model(data)
+            resp.article_info.title
+            resp.article_info.view_count
+            resp.author_user_info.user_name
+    return (time.perf_counter() - start) / (rounds * len(payloads)) * 1e6
+
+
+def bench_memory(payloads, model=DescribeArticleDetailResponse) -> float:
+    """Mean bytes allocated per response object on top of its decoded payload"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    responses = [model(data) for data in payloads]
+    for resp in responses:
+        resp.article_info.title
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(responses)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--payloads", type=int, default=50)
+    args = parser.parse_args()
+
+    raw = json.dumps(article_detail())
+    payloads = [json.loads(raw) for _ in range(args.payloads)]
+    print(f"payload size: {len(raw)} bytes")
+    print(f"{'construction':<40}{'eager':>12}{'lazy':>12}")
+    eager, lazy = (bench_construct(payloads, args.rounds, model) for model in (eager_response, DescribeArticleDetailResponse))
+    print(f"{'construct + 3 field reads':<40}{eager:>9.2f} us{lazy:>9.2f} us")
+    eager, lazy = (bench_memory(payloads, model) for model in (eager_response, DescribeArticleDetailResponse))
+    print(f"{'memory per response':<40}{eager:>9.0f} B {lazy:>9.0f} B ")
+    print(f"{'encoding':<40}{'legacy':>12}{'generated':>12}")
+    for name, (legacy, generated) in bench_encode(args.rounds * 10).items():
+        print(f"{name:<40}{legacy:>9.2f} us{generated:>9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
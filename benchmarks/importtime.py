@@ -0,0 +1,102 @@
+"""Import time of the SDK in fresh interpreters, measured with ``python -X importtime``
+
+Usage: python -m benchmarks.importtime [--runs N] [--budget NAME=MS ...]
+
+Every statement of STATEMENTS runs in --runs fresh interpreters. The import time
+of a run is the sum of the cumulative times of the top-level imports the
+statement triggers, interpreter startup (site and the like) left out. The wall
+time is how much longer the process takes than ``python -c pass``. Medians are
+reported. Exits with status 1 if an import time is over its budget.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List, Set, Tuple
+
+# What a short-lived process does, by name
+STATEMENTS = {
+    "import_juejin": "import juejin",
+    "sync_client": "import juejin; juejin.JuejinClient(cookie='')",
+    "async_client": "import juejin; juejin.AsyncJuejinClient(cookie='')",
+}
+
+# Upper bounds of the import times in milliseconds checked by default, with room for slow CI machines.
+# Creating a sync client took about 50 ms before the imports were deferred, about 4 ms since.
+DEFAULT_BUDGETS = {
+    "import_juejin": 10.0,
+    "sync_client": 15.0,
+}
+
+
+def _top_level_imports(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds of each top-level import in -X importtime output"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, _, cumulative, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        if not cumulative.isdigit():
+            continue
+        # Nested imports are indented by two spaces per level
+        if not line.rsplit("|", 1)[1].startswith("  "):
+            imports[name] = int(cumulative)
+    return imports
+
+
+def _imports(statement: str) -> Dict[str, int]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True)
+    return _top_level_imports(result.stderr)
+
+
+def _wall(statement: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(statement: str, runs: int, startup: Set[str], startup_wall: float) -> Tuple[float, float]:
+    """Median import and wall milliseconds of a statement"""
+    imports: List[float] = []
+    walls: List[float] = []
+    for _ in range(runs):
+        imports.append(sum(us for name, us in _imports(statement).items() if name not in startup) / 1000)
+        walls.append(_wall(statement) - startup_wall)
+    return statistics.median(imports), statistics.median(walls)
+
+
+def bench_imports(runs: int, statements: Iterable[str] = STATEMENTS) -> Dict[str, Tuple[float, float]]:
+    """Median (import, wall) milliseconds of the named statements"""
+    startup = set(_imports("pass"))
+    startup_wall = statistics.median(_wall("pass") for _ in range(runs))
+    return {name: measure(STATEMENTS[name], runs, startup, startup_wall) for name in statements}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS",
+                        help="fail if NAME takes longer than MS milliseconds, overrides the default budgets")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for budget in args.budget:
+        name, _, ms = budget.partition("=")
+        budgets[name] = float(ms)
+
+    over = False
+    print(f"{'statement':<24}{'imports':>12}{'wall':>12}")
+    for name, (ms, wall) in bench_imports(args.runs).items():
+        budget = budgets.get(name)
+        flag = ""
+        if budget is not None and ms > budget:
+            flag = f"  OVER BUDGET ({budget:.1f} ms)"
+            over = True
+        print(f"{name:<24}{ms:>9.2f} ms{wall:>9.2f} ms{flag}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
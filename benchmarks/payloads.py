@@ -0,0 +1,182 @@
+"""Realistic response payloads shaped like the Juejin API's"""
+import copy
+from typing import Any, Dict, List
+
+_PARAGRAPH = ("掘金是一个帮助开发者成长的社区，这里汇聚了大量关于 Python、Go、前端和后端架构的技术文章。"
+              "This paragraph mixes English and Chinese text the way real posts do, with `inline code` and links. ")
+
+_CODE = "```python\nfor i in range(10):\n    print(i)\n```\n"
+
+
+def _markdown(paragraphs: int) -> str:
+    parts = []
+    for i in range(paragraphs):
+        parts.append(f"## 第 {i} 节\n\n{_PARAGRAPH * 3}\n\n{_CODE}")
+    return "\n".join(parts)
+
+
+def _html(markdown: str) -> str:
+    return "".join(f"<p>{line}</p>" for line in markdown.splitlines() if line)
+
+
+_MARKDOWN = _markdown(40)
+_HTML = _html(_MARKDOWN)
+
+_AUTHOR = {
+    "user_id": "4019470241710792", "user_name": "occrq", "company": "某互联网公司", "job_title": "后端工程师",
+    "avatar_large": "https://p3-passport.byteacctimg.com/img/user-avatar/avatar.awebp", "level": 4,
+    "description": "热爱开源", "followee_count": 12, "follower_count": 1024, "post_article_count": 88,
+    "digg_article_count": 300, "got_digg_count": 5000, "got_view_count": 400000, "post_shortmsg_count": 3,
+    "digg_shortmsg_count": 5, "isfollowed": False, "favorable_author": 1, "power": 9000, "study_point": 0,
+    "university": {"university_id": "0", "name": "", "logo": ""},
+    "major": {"major_id": "0", "parent_id": "0", "name": ""},
+    "student_status": 0, "select_event_count": 0, "select_online_course_count": 0, "identity": 0,
+    "is_select_annual": False, "select_annual_rank": 0, "annual_list_type": 0, "extraMap": {},
+    "is_logout": 0, "annual_info": [], "account_amount": 0,
+    "user_growth_info": {
+        "user_id": 4019470241710792, "jpower": 9000, "jscore": 12345.6, "jpower_level": 6, "jscore_level": 5,
+        "jscore_title": "掘金一级", "author_achievement_list": [1, 2], "vip_level": 2, "vip_title": "掘友",
+        "jscore_next_level_score": 20000, "jscore_this_level_mini_score": 10000, "vip_score": 100,
+    },
+    "is_vip": False, "become_author_days": 1000, "collection_set_article_count": 10,
+    "recommend_article_count_daily": 0, "article_collect_count_daily": 0,
+    "user_priv_info": {
+        "administrator": 0, "builder": 0, "favorable_author": 1, "book_author": 0, "forbidden_words": 0,
+        "can_tag_cnt": 0, "auto_recommend": 0, "signed_author": 0, "popular_author": 0, "can_add_video": 0,
+    },
+}
+
+_TAGS = [
+    {"id": 2546490, "tag_id": "6809640408797167623", "tag_name": "Python", "color": "#000000",
+     "icon": "https://p1-jj.byteimg.com/tos-cn-i-t2oaga2asx/leancloud-assets/python.awebp",
+     "back_ground": "", "show_navi": 0, "ctime": 1435971430, "mtime": 1700000000, "id_type": 9,
+     "tag_alias": "", "post_article_count": 50000, "concern_user_count": 300000},
+    {"id": 2546516, "tag_id": "6809640445233070094", "tag_name": "后端", "color": "#C679FF",
+     "icon": "https://p1-jj.byteimg.com/tos-cn-i-t2oaga2asx/leancloud-assets/backend.awebp",
+     "back_ground": "", "show_navi": 1, "ctime": 1435971430, "mtime": 1700000000, "id_type": 9,
+     "tag_alias": "", "post_article_count": 400000, "concern_user_count": 2000000},
+]
+
+_THEME = {
+    "theme_id": "7193349399543922746", "name": "Python 实战", "cover": "", "brief": "话题简介",
+    "is_lottery": False, "is_rec": True, "rec_rank": 0, "topic_ids": [], "hot": 100, "view_cnt": 1000,
+    "user_cnt": 100, "status": 1, "ctime": 1674000000, "mtime": 1700000000, "lottery_begin_time": 0,
+    "lottery_end_time": 0, "theme_type": 1, "last_hot": 0, "has_expiration": False, "valid_begin_time": 0,
+    "valid_end_time": 0, "expired": False,
+}
+
+
+def article_info(article_id: str, version: int = 1, mtime: str = "1700000000") -> Dict[str, Any]:
+    return {
+        "article_id": article_id, "user_id": _AUTHOR["user_id"], "category_id": "6809637769959178254",
+        "tag_ids": [6809640408797167623, 6809640445233070094], "visible_level": 0, "link_url": "",
+        "cover_image": "", "is_gfw": 0, "title": f"Python SDK 性能优化实践 {article_id}",
+        "brief_content": _PARAGRAPH[:100], "is_english": 0, "is_original": 1, "user_index": 10.5,
+        "original_type": 0, "original_author": "", "content": _MARKDOWN, "ctime": "1690000000",
+        "mtime": mtime, "rtime": "1690000100", "draft_id": f"7{article_id[1:]}", "view_count": 1234,
+        "collect_count": 56, "digg_count": 78, "comment_count": 9, "hot_index": 300, "is_hot": 0,
+        "rank_index": 0.5, "status": 2, "verify_status": 1, "audit_status": 2, "mark_content": _MARKDOWN,
+        "display_count": 0, "is_markdown": 1, "app_html_content": _HTML, "version": version,
+        "web_html_content": _HTML, "meta_info": "", "catalog": "", "homepage_top_time": -62135596800,
+        "homepage_top_status": 0, "content_count": len(_MARKDOWN), "read_time": "10分钟",
+        "pics_expire_time": 0,
+    }
+
+
+def article_detail(article_id: str = "7429626822868336649", version: int = 1) -> Dict[str, Any]:
+    """The data field of /content_api/v1/article/detail"""
+    return {
+        "article_id": article_id,
+        "article_info": article_info(article_id, version),
+        "author_user_info": copy.deepcopy(_AUTHOR),
+        "category": {"category_id": "6809637769959178254", "category_name": "后端", "category_url": "backend"},
+        "tags": copy.deepcopy(_TAGS),
+        "user_interact": {"id": int(article_id), "omitempty": 2, "user_id": 0, "is_digg": False,
+                          "is_follow": False, "is_collect": False, "collect_set_count": 0},
+        "org": {"is_followed": False},
+        "req_id": "202410181200000000000000000000",
+        "status": {"push_status": 0},
+        "theme_list": [{"theme": copy.deepcopy(_THEME)}],
+    }
+
+
+def article_list_item(article_id: str, version: int = 1, mtime: str = "1700000000") -> Dict[str, Any]:
+    """One item of /content_api/v1/article/list_by_user"""
+    info = article_info(article_id, version, mtime)
+    for field in ("content", "mark_content", "app_html_content", "web_html_content"):
+        info[field] = ""
+    return {
+        "article_id": article_id, "article_info": info, "author_user_info": copy.deepcopy(_AUTHOR),
+        "category": {"category_id": "6809637769959178254", "category_name": "后端"},
+        "tags": copy.deepcopy(_TAGS), "user_interact": {"id": int(article_id), "is_digg": False},
+        "req_id": "202410181200000000000000000000", "status": {"push_status": 0},
+    }
+
+
+def article_ids(count: int) -> List[str]:
+    return [str(7429626822868336649 + i) for i in range(count)]
+
+
+def draft_detail(draft_id: str = "7429626822868336650") -> Dict[str, Any]:
+    """The data field of /content_api/v1/article_draft/detail"""
+    info = article_info(f"7{draft_id[1:]}")
+    return {
+        "article_draft": {
+            "id": draft_id, "article_id": "0", "user_id": _AUTHOR["user_id"], "category_id": info["category_id"],
+            "tag_ids": info["tag_ids"], "link_url": "", "cover_image": "", "is_gfw": 0, "title": info["title"],
+            "brief_content": info["brief_content"], "is_english": 0, "is_original": 1, "edit_type": 10,
+            "html_content": "deprecated", "mark_content": _MARKDOWN, "ctime": "1690000000",
+            "mtime": "1700000000", "status": 0, "original_type": 0, "theme_ids": [], "pics_expire_time": 0,
+        },
+        "tags": copy.deepcopy(_TAGS),
+        "category": {"category_id": info["category_id"], "category_name": "后端", "category_url": "backend"},
+        "columns": [],
+        "themes": [copy.deepcopy(_THEME)],
+    }
+
+
+def draft_list_item(draft_id: str, mtime: str = "1700000000") -> Dict[str, Any]:
+    """One item of /content_api/v1/article_draft/list_by_user"""
+    item = draft_detail(draft_id)
+    item["article_draft"]["mark_content"] = ""
+    item["article_draft"]["mtime"] = mtime
+    return item
+
+
+def user_counts() -> Dict[str, Any]:
+    """The data field of /growth_api/v1/get_counts"""
+    return {"cont_count": 42, "sum_count": 365}
+
+
+def today_status() -> bool:
+    """The data field of /growth_api/v2/get_today_status"""
+    return False
+
+
+def info_pack() -> Dict[str, Any]:
+    """The data field of /user_api/v1/user/get_info_pack"""
+    return {
+        "user_basic": copy.deepcopy(_AUTHOR),
+        "user_counter": {"digg_article_count": 300, "followee_count": 12, "follower_count": 1024,
+                         "got_digg_count": 5000, "got_view_count": 400000, "post_article_count": 88},
+        "user_growth_info": copy.deepcopy(_AUTHOR["user_growth_info"]),
+    }
+
+
+def user_rank(size: int = 20) -> Dict[str, Any]:
+    """The data field of /user_api/v1/quality_user/rank"""
+    return {
+        "user_rank_list": [{"user_info": copy.deepcopy(_AUTHOR), "rank": i + 1, "score": 1000 - i}
+                           for i in range(size)],
+        "cursor": str(size), "has_more": True,
+    }
+
+
+def user_dynamic(size: int = 20) -> Dict[str, Any]:
+    """The data field of /user_api/v1/user/dynamic"""
+    ids = article_ids(size)
+    return {
+        "list": [{"action": 0, "time": 1700000000 - i, "target_type": 2, "target_data": article_list_item(aid)}
+                 for i, aid in enumerate(ids)],
+        "cursor": str(size), "count": 1000, "has_more": True,
+    }
@@ -0,0 +1,241 @@
+"""Offline benchmarks of the SDK's own overhead against the local stub server
+
+Usage: python -m benchmarks.run [--quick] [--output FILE] [--compare BASELINE] [--threshold PCT]
+
+Measures requests/sec of every endpoint through the sync client, of a shared client
+driven by threads and of the async client, the CPU time per call of
+_prepare_request, _parse_response and response model construction, the memory
+retained per parsed response and the import time of the package (see
+benchmarks.importtime). --output writes the results as JSON, --compare prints
+the change against such a file and exits with status 1 if a metric got worse than
+--threshold percent.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+import juejin
+from benchmarks import payloads
+from benchmarks.importtime import bench_imports
+from benchmarks.server import StubServer, envelope
+from juejin import codec
+from juejin.models import DescribeArticleDetailRequest, DescribeArticleDetailResponse, DescribeArticleListRequest
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def _result(value: float, unit: str, higher_is_better: bool) -> Dict[str, Any]:
+    return {"value": round(value, 3), "unit": unit, "higher_is_better": higher_is_better}
+
+
+def _detail_request(article_id: str = "7429626822868336649") -> DescribeArticleDetailRequest:
+    req = DescribeArticleDetailRequest()
+    req.article_id = article_id
+    return req
+
+
+def _sync_calls(client: juejin.JuejinClient) -> Dict[str, Callable[[], Any]]:
+    """One call of every endpoint the client reads"""
+    return {
+        "article_detail": lambda: client.describe_article_detail(_detail_request()),
+        "article_list": lambda: client.describe_article_list(DescribeArticleListRequest()),
+        "draft_detail": lambda: client.describe_article_draft_detail("8429626822868336649"),
+        "draft_list": lambda: client.describe_article_draft_list(DescribeArticleListRequest()),
+        "user_counts": client.describe_user_counts,
+        "today_status": client.describe_user_today_status,
+        "info_pack": client.describe_user_info_package,
+        "rank": client.describe_user_rank_info,
+        "dynamic": client.describe_user_dynamic,
+    }
+
+
+def _rate(fn: Callable[[], Any], calls: int) -> float:
+    fn()  # warm up the connection
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return calls / (time.perf_counter() - start)
+
+
+def bench_sync(client_class, calls: int) -> Results:
+    client = client_class(cookie="")
+    return {f"sync.{name}": _result(_rate(fn, calls), "req/s", True)
+            for name, fn in _sync_calls(client).items()}
+
+
+def bench_threaded(client_class, calls: int, threads: int) -> Results:
+    config = juejin.RequestConfig()
+    config.pool_maxsize = threads
+    client = client_class(cookie="", config=config)
+    req = _detail_request()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: client.describe_user_counts(), range(threads)))
+        results = {}
+        for name, fn in (("user_counts", client.describe_user_counts),
+                         ("article_detail", lambda: client.describe_article_detail(req))):
+            start = time.perf_counter()
+            list(pool.map(lambda _: fn(), range(calls)))
+            results[f"threaded{threads}.{name}"] = _result(calls / (time.perf_counter() - start), "req/s", True)
+    return results
+
+
+def bench_async(url: str, calls: int, concurrency: int) -> Results:
+    try:
+        client_class = type("StubAsyncClient", (juejin.AsyncJuejinClient,), {"BASE_URL": url})
+        client_class(cookie="")
+    except ImportError:
+        print("aiohttp is not installed, skipping the async benchmarks", file=sys.stderr)
+        return {}
+
+    async def run() -> Results:
+        req = _detail_request()
+        results = {}
+        async with client_class(cookie="") as client:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one(fn):
+                async with semaphore:
+                    await fn()
+
+            for name, fn in (("user_counts", client.describe_user_counts),
+                             ("article_detail", lambda: client.describe_article_detail(req))):
+                await fn()
+                start = time.perf_counter()
+                await asyncio.gather(*(one(fn) for _ in range(calls)))
+                results[f"async{concurrency}.{name}"] = _result(calls / (time.perf_counter() - start), "req/s", True)
+        return results
+
+    return asyncio.run(run())
+
+
+def _cpu_us(fn: Callable[[], Any], rounds: int) -> float:
+    fn()
+    start = time.process_time()
+    for _ in range(rounds):
+        fn()
+    return (time.process_time() - start) / rounds * 1e6
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def bench_cpu(rounds: int) -> Results:
+    """CPU time per call of the client's request preparation, parsing and model construction"""
+    client = juejin.JuejinClient(cookie="")
+    detail_req = _detail_request()
+    detail = _response(envelope(payloads.article_detail()))
+    page = _response(envelope([payloads.article_list_item(i) for i in payloads.article_ids(10)], has_more=True))
+    data = client._parse_response(detail)
+    return {
+        "cpu.prepare_request.article_detail": _result(
+            _cpu_us(lambda: client._prepare_request("POST", "/content_api/v1/article/detail", data=detail_req),
+                    rounds), "us", False),
+        "cpu.parse_response.article_detail": _result(
+            _cpu_us(lambda: client._parse_response(detail), rounds), "us", False),
+        "cpu.parse_response.article_list": _result(
+            _cpu_us(lambda: client._parse_response(page), rounds), "us", False),
+        "cpu.model.article_detail": _result(
+            _cpu_us(lambda: DescribeArticleDetailResponse(data).article_info.title, rounds), "us", False),
+        "cpu.model.encode.article_detail": _result(
+            _cpu_us(lambda: DescribeArticleDetailResponse(data)._encode(), rounds), "us", False),
+        "cpu.model.serialize.article_detail_request": _result(
+            _cpu_us(detail_req._serialize, rounds), "us", False),
+    }
+
+
+def bench_memory(count: int) -> Results:
+    """Bytes retained per parsed article detail response, body decoding included"""
+    client = juejin.JuejinClient(cookie="")
+    body = envelope(payloads.article_detail())
+    responses = [_response(body) for _ in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [DescribeArticleDetailResponse(client._parse_response(response)) for response in responses]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {"memory.article_detail": _result((after - before) / len(kept), "bytes", False)}
+
+
+def bench_import(runs: int) -> Results:
+    """Import milliseconds of the package and of each client in fresh interpreters"""
+    return {f"import.{name}": _result(ms, "ms", False) for name, (ms, _) in bench_imports(runs).items()}
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> bool:
+    """Print the change of every metric against a baseline, return whether one regressed"""
+    regressed = False
+    print(f"\n{'metric':<42}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or not base["value"]:
+            continue
+        change = (result["value"] - base["value"]) / base["value"] * 100
+        worse = -change if result["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:<42}{base['value']:>14.2f}{result['value']:>14.2f}{change:>+9.1f}%{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke run")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    calls, rounds = (50, 200) if args.quick else (500, 2000)
+    results: Results = {}
+    with StubServer() as server:
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": server.url})
+        results.update(bench_sync(client_class, calls))
+        results.update(bench_threaded(client_class, calls * 4, args.threads))
+        results.update(bench_async(server.url, calls * 4, args.concurrency))
+    results.update(bench_cpu(rounds))
+    results.update(bench_memory(50))
+    results.update(bench_import(3 if args.quick else 7))
+
+    for name, result in results.items():
+        print(f"{name:<42}{result['value']:>14.2f} {result['unit']}")
+
+    report = {
+        "meta": {
+            "sdk_version": juejin.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": codec.backend,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    regressed = False
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline: Optional[Dict[str, Any]] = json.load(f)
+        regressed = compare(results, baseline["results"], args.threshold)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Local stub of the Juejin API serving realistic payloads for every endpoint the clients call
+
+Usage: python -m benchmarks.server [--port N]
+"""
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Set
+from urllib.parse import urlsplit
+
+from benchmarks import payloads
+from juejin import compression, endpoints
+
+# Items in the stub's article and draft lists
+LIST_SIZE = 100
+
+
+def envelope(data: Any, **extra: Any) -> bytes:
+    return json.dumps(dict({"err_no": 0, "err_msg": "success", "data": data}, **extra),
+                      ensure_ascii=False).encode("utf-8")
+
+
+def _list_page(item: Callable[..., Dict[str, Any]], ids, req: Dict[str, Any], mtimes: Dict[str, str]) -> bytes:
+    size = int(req.get("page_size") or 10)
+    cursor = (int(req.get("page_no") or 1) - 1) * size
+    page = ids[cursor:cursor + size]
+    return envelope([item(i, mtime=mtimes.get(i, "1700000000")) for i in page], cursor=str(cursor + len(page)),
+                    count=len(ids),
+                    has_more=cursor + len(page) < len(ids))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes, Nagle would hold small bodies for a delayed ACK
+    disable_nagle_algorithm = True
+
+    # Response bodies encoded once, so the stub costs as little as possible per request
+    static: Dict[str, bytes] = {}
+    details: Dict[str, bytes] = {}
+    article_ids = payloads.article_ids(LIST_SIZE)
+    draft_ids = [f"8{i[1:]}" for i in article_ids]
+    # mtime of listed articles and drafts by id, set it to simulate edits
+    mtimes: Dict[str, str] = {}
+    # Send an ETag with every response and answer a matching If-None-Match with 304
+    etags = False
+    # Compress responses of at least this many bytes to clients accepting it, None never does
+    gzip_min_size: Optional[int] = None
+    # Content coding of compressed responses, see juejin.compression.compress
+    response_encoding = "gzip"
+    # Accept gzip request bodies, answer them with 415 when False
+    gzip_requests = True
+    # Answer every request with this status and an empty body, e.g. 503 to simulate an outage
+    outage_status: Optional[int] = None
+    # Paths the outage hits, all paths when None
+    outage_paths: Optional[Set[str]] = None
+    # Retry-After header of the outage responses
+    retry_after: Optional[str] = None
+    # Seconds to wait before answering, to keep requests in flight
+    delay = 0.0
+    # Drafts created through the API by id, with their title, ctime and article_id once published
+    drafts: Dict[str, Dict[str, str]] = {}
+    new_draft_ids = itertools.count(8500000000000000000)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self, path: str, req: Dict[str, Any]) -> bytes:
+        if path in self.static:
+            return self.static[path]
+        if path == endpoints.ARTICLE_DETAIL:
+            article_id = str(req.get("article_id"))
+            body = self.details.get(article_id)
+            if body is None:
+                body = self.details[article_id] = envelope(payloads.article_detail(article_id))
+            return body
+        if path == endpoints.ARTICLE_DRAFT_CREATE:
+            draft_id = str(next(self.new_draft_ids))
+            draft = self.drafts[draft_id] = {"title": req.get("title", ""), "ctime": str(int(time.time())),
+                                             "article_id": "0"}
+            return envelope(dict(draft, id=draft_id))
+        if path == endpoints.ARTICLE_PUBLISH:
+            draft_id = str(req.get("draft_id"))
+            article_id = f"7{draft_id[1:]}"
+            if draft_id in self.drafts:
+                self.drafts[draft_id]["article_id"] = article_id
+            return envelope({"article_id": article_id, "draft_id": draft_id})
+        if path == endpoints.ARTICLE_DRAFT_DETAIL:
+            draft_id = str(req.get("draft_id"))
+            detail = payloads.draft_detail(draft_id)
+            detail["article_draft"].update(self.drafts.get(draft_id, {}))
+            return envelope(detail)
+        if path == endpoints.ARTICLE_LIST:
+            return _list_page(payloads.article_list_item, self.article_ids, req, self.mtimes)
+        if path == endpoints.ARTICLE_DRAFT_LIST and req.get("keyword"):
+            matches = [dict(payloads.draft_list_item(i)["article_draft"], **draft, id=i)
+                       for i, draft in list(self.drafts.items()) if req["keyword"] in draft["title"]]
+            return envelope([{"article_draft": draft} for draft in matches], has_more=False, count=len(matches))
+        if path == endpoints.ARTICLE_DRAFT_LIST:
+            return _list_page(payloads.draft_list_item, self.draft_ids, req, self.mtimes)
+        return envelope({"path": path})
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.delay:
+            time.sleep(self.delay)
+        if self.outage_status is not None and (self.outage_paths is None
+                                               or urlsplit(self.path).path in self.outage_paths):
+            self.send_response(self.outage_status)
+            if self.retry_after is not None:
+                self.send_header("Retry-After", self.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("Content-Encoding") == "gzip":
+            if not self.gzip_requests:
+                self.send_response(415)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            raw = gzip.decompress(raw)
+        req = json.loads(raw) if raw else {}
+        body = self._body(urlsplit(self.path).path, req)
+        etag = f'"{hashlib.sha1(body).hexdigest()}"' if self.etags else None
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        accepted = {e.strip() for e in (self.headers.get("Accept-Encoding") or "").split(",")}
+        if (self.gzip_min_size is not None and len(body) >= self.gzip_min_size
+                and self.response_encoding in accepted):
+            body = compression.compress(body, self.response_encoding)
+            self.send_header("Content-Encoding", self.response_encoding)
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _handle
+
+
+StubHandler.static = {
+    endpoints.USER_COUNTS: envelope(payloads.user_counts()),
+    endpoints.USER_TODAY_STATUS: envelope(payloads.today_status()),
+    endpoints.USER_INFO_PACK: envelope(payloads.info_pack()),
+    endpoints.USER_RANK: envelope(payloads.user_rank()),
+    endpoints.USER_DYNAMIC: envelope(payloads.user_dynamic()),
+    endpoints.USER_CHECK_IN: envelope({"incr_point": 100, "sum_point": 10000}),
+}
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for a burst of concurrent connects, the default backlog of 5 drops SYNs and costs a 1s retry
+    request_queue_size = 256
+
+
+class StubServer:
+    """Stub server running in a daemon thread, usable as a context manager"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = _HTTPServer((host, port), StubHandler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = StubServer(port=args.port)
+    print(f"serving on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from unittest.mock import MagicMock
 
 import juejin
 from juejin.models import ArticleRequest, UpdateArticleRequest, DescribeArticleDetailRequest, DescribeArticleListRequest
+from juejin.transport import transport_from_env
 
 print(print(os.environ))
 
@@ -14,7 +15,11 @@ class TestArticleAPI(unittest.TestCase):
         ms_token = os.getenv("JUEJIN_MS_TOKEN")
         a_bogus = os.getenv("JUEJIN_A_BOGUS")
 
-        self.client = juejin.JuejinClient(cookie=cookies, ms_token=ms_token, a_bogus=a_bogus)
+        auth_config = juejin.AuthConfig()
+        auth_config.ms_token = ms_token
+        auth_config.a_bogus = a_bogus
+        # JUEJIN_CASSETTE replays recorded responses instead of calling the API, see juejin.transport
+        self.client = juejin.JuejinClient(cookie=cookies, auth_config=auth_config, transport=transport_from_env())
         self.mock_response = MagicMock()
         self.mock_response.json.return_value = {
             "err_no": 0,
@@ -0,0 +1,114 @@
+import asyncio
+import socket
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer, envelope
+from juejin import endpoints
+from juejin.error import JuejinAPIError
+from juejin.models import DescribeArticleDetailRequest, DescribeArticleListRequest
+
+ARTICLE_ID = "7429626822868336649"
+
+
+class TestAsyncClient(unittest.TestCase):
+    """The async client against the local stub server, checked against the sync client"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.sync_client = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})(cookie="")
+        self.client_class = type("StubClient", (juejin.AsyncJuejinClient,), {"BASE_URL": self.server.url})
+        self.static = dict(StubHandler.static)
+
+    def tearDown(self):
+        StubHandler.static = self.static
+        StubHandler.outage_status = None
+        self.server.stop()
+
+    def run_async(self, call, **kwargs):
+        """Result of call(client) on a fresh async client"""
+        async def run():
+            async with self.client_class(cookie="", **kwargs) as client:
+                return await call(client)
+
+        return asyncio.run(run())
+
+    def respond(self, path: str, body: bytes) -> None:
+        StubHandler.static = dict(StubHandler.static, **{path: body})
+
+    def assert_api_error(self, call, code: int) -> None:
+        """Both clients raise a JuejinAPIError of the same code for call"""
+        with self.assertRaises(JuejinAPIError) as sync_cm:
+            call(self.sync_client)
+        with self.assertRaises(JuejinAPIError) as async_cm:
+            self.run_async(call)
+        self.assertEqual(sync_cm.exception.code, code)
+        self.assertEqual(async_cm.exception.code, code)
+
+    def test_responses_match_the_sync_client(self):
+        req = DescribeArticleDetailRequest()
+        req.article_id = ARTICLE_ID
+        list_req = DescribeArticleListRequest()
+        list_req.page_size = 10
+
+        async def calls(client):
+            return (await client.describe_article_detail(req), await client.describe_article_list(list_req),
+                    await client.describe_user_counts())
+
+        detail, articles, counts = self.run_async(calls)
+        self.assertEqual(detail.article_id, ARTICLE_ID)
+        self.assertEqual(detail.to_json(), self.sync_client.describe_article_detail(req).to_json())
+        self.assertEqual(len(articles), 10)
+        self.assertEqual(articles, self.sync_client.describe_article_list(list_req))
+        self.assertEqual(counts, self.sync_client.describe_user_counts())
+
+    def test_raw_responses_keep_the_envelope(self):
+        async def call(client):
+            return await client.request("GET", endpoints.USER_COUNTS, raw=True)
+
+        rsp = self.run_async(call)
+        self.assertEqual(rsp["err_no"], 0)
+        self.assertEqual(rsp, self.sync_client.request("GET", endpoints.USER_COUNTS, raw=True))
+
+    def test_api_errors_keep_their_code(self):
+        self.respond(endpoints.USER_COUNTS, envelope(None, err_no=403, err_msg="must login"))
+        self.assert_api_error(lambda client: client.describe_user_counts(), 403)
+
+    def test_malformed_json_is_a_json_error(self):
+        self.respond(endpoints.USER_COUNTS, b'{"err_no": 0, "data": ')
+        self.assert_api_error(lambda client: client.describe_user_counts(), -1)
+
+    def test_http_errors_are_network_errors(self):
+        StubHandler.outage_status = 404
+        self.assert_api_error(lambda client: client.describe_user_counts(), -2)
+
+    def test_connection_errors_are_network_errors(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        # Nothing listens there any more
+        self.sync_client.BASE_URL = self.client_class.BASE_URL = url
+        self.assert_api_error(lambda client: client.describe_user_counts(), -2)
+
+    def test_close_releases_the_session(self):
+        async def run():
+            client = self.client_class(cookie="")
+            await client.describe_user_counts()
+            session = client.session
+            await client.close()
+            closed = session.closed
+            # A closed client opens a new session on its next call
+            await client.describe_user_counts()
+            reopened = client.session is not session
+            async with client:
+                pass
+            return closed, reopened, client._session
+
+        closed, reopened, session = asyncio.run(run())
+        self.assertTrue(closed)
+        self.assertTrue(reopened)
+        self.assertIsNone(session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from juejin.batch import arun_batch, run_batch
+from juejin.error import JuejinAPIError
+
+
+class Concurrency:
+    """Tracks the most calls running at once"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.running -= 1
+
+
+def delay(key: int) -> float:
+    # Later keys finish first
+    return 0.005 * (20 - key % 20)
+
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.concurrency = Concurrency()
+
+    def work(self, key: int) -> int:
+        with self.concurrency:
+            time.sleep(delay(key))
+            if key % 7 == 3:
+                raise JuejinAPIError(f"failed {key}", 403)
+            return key * 10
+
+    def test_ordered_results_follow_the_input(self):
+        results = list(run_batch(self.work, range(40), max_workers=4))
+        self.assertEqual([result.key for result in results], list(range(40)))
+
+    def test_unordered_results_come_as_they_complete(self):
+        results = list(run_batch(self.work, range(8), max_workers=8, ordered=False))
+        self.assertEqual(sorted(result.key for result in results), list(range(8)))
+        self.assertEqual(results[0].key, 7)
+
+    def test_concurrency_is_bounded(self):
+        list(run_batch(self.work, range(40), max_workers=3))
+        self.assertEqual(self.concurrency.peak, 3)
+        list(run_batch(self.work, range(40), max_workers=5, ordered=False))
+        self.assertEqual(self.concurrency.peak, 5)
+
+    def test_errors_are_isolated_per_item(self):
+        results = list(run_batch(self.work, range(20), max_workers=4))
+        for result in results:
+            if result.key % 7 == 3:
+                self.assertFalse(result.ok)
+                self.assertIsNone(result.value)
+                self.assertEqual(result.error.code, 403)
+            else:
+                self.assertTrue(result.ok)
+                self.assertEqual(result.value, result.key * 10)
+
+    def test_input_is_consumed_lazily(self):
+        consumed = []
+
+        def keys():
+            for key in range(1000):
+                consumed.append(key)
+                yield key
+
+        batch = run_batch(lambda key: key, keys(), max_workers=2)
+        self.assertEqual([next(batch).key for _ in range(3)], [0, 1, 2])
+        batch.close()
+        # Only the window of max_workers * 2 calls runs ahead of the caller
+        self.assertLess(len(consumed), 10)
+
+
+class TestArunBatch(unittest.TestCase):
+    def collect(self, keys, max_workers: int, ordered: bool = True):
+        concurrency = Concurrency()
+
+        async def work(key: int) -> int:
+            with concurrency:
+                await asyncio.sleep(delay(key))
+                if key % 7 == 3:
+                    raise JuejinAPIError(f"failed {key}", 403)
+                return key * 10
+
+        async def run():
+            return [result async for result in arun_batch(work, keys, max_workers, ordered)]
+
+        return asyncio.run(run()), concurrency.peak
+
+    def test_ordered_results_follow_the_input(self):
+        results, peak = self.collect(range(40), max_workers=4)
+        self.assertEqual([result.key for result in results], list(range(40)))
+        self.assertEqual(peak, 4)
+
+    def test_unordered_results_come_as_they_complete(self):
+        results, peak = self.collect(range(8), max_workers=8, ordered=False)
+        self.assertEqual(sorted(result.key for result in results), list(range(8)))
+        self.assertEqual(results[0].key, 7)
+        self.assertEqual(peak, 8)
+
+    def test_errors_are_isolated_per_item(self):
+        results, _ = self.collect(range(20), max_workers=4, ordered=False)
+        failed = sorted(result.key for result in results if not result.ok)
+        self.assertEqual(failed, [3, 10, 17])
+        self.assertTrue(all(result.value == result.key * 10 for result in results if result.ok))
+
+
+if __name__ == '__main__':
+    unittest.main()
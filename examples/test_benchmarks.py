@@ -0,0 +1,62 @@
+import contextlib
+import io
+import unittest
+
+from benchmarks.run import _result, compare
+
+BASELINE = {
+    "sync.detail": _result(1000.0, "req/s", True),
+    "cpu.parse": _result(50.0, "us", False),
+    "memory.detail": _result(200.0, "KiB", False),
+    "import.juejin": _result(0.0, "ms", False),
+}
+
+
+class TestCompare(unittest.TestCase):
+    def compare(self, results, threshold: float = 10.0):
+        """Whether compare() reports a regression, and the line it printed per metric"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            regressed = compare(results, BASELINE, threshold)
+        lines = {line.split()[0]: line for line in out.getvalue().splitlines()[2:]}
+        return regressed, lines
+
+    def test_unchanged_results_do_not_regress(self):
+        regressed, lines = self.compare(BASELINE)
+        self.assertFalse(regressed)
+        self.assertIn("+0.0%", lines["sync.detail"])
+
+    def test_lower_throughput_regresses(self):
+        regressed, lines = self.compare(dict(BASELINE, **{"sync.detail": _result(850.0, "req/s", True)}))
+        self.assertTrue(regressed)
+        self.assertTrue(lines["sync.detail"].endswith("-15.0%  REGRESSION"))
+        self.assertNotIn("REGRESSION", lines["cpu.parse"])
+
+    def test_higher_cost_regresses(self):
+        regressed, lines = self.compare(dict(BASELINE, **{"cpu.parse": _result(60.0, "us", False)}))
+        self.assertTrue(regressed)
+        self.assertTrue(lines["cpu.parse"].endswith("+20.0%  REGRESSION"))
+
+    def test_improvements_do_not_regress(self):
+        regressed, lines = self.compare(dict(BASELINE, **{"sync.detail": _result(2000.0, "req/s", True),
+                                                          "memory.detail": _result(100.0, "KiB", False)}))
+        self.assertFalse(regressed)
+        self.assertTrue(lines["sync.detail"].endswith("+100.0%"))
+        self.assertTrue(lines["memory.detail"].endswith("-50.0%"))
+
+    def test_change_at_the_threshold_does_not_regress(self):
+        results = dict(BASELINE, **{"cpu.parse": _result(55.0, "us", False)})
+        self.assertFalse(self.compare(results, threshold=10.0)[0])
+        self.assertTrue(self.compare(results, threshold=9.9)[0])
+
+    def test_metrics_without_a_usable_baseline_are_skipped(self):
+        results = dict(BASELINE, **{"import.juejin": _result(30.0, "ms", False),
+                                    "async.detail": _result(1.0, "req/s", True)})
+        regressed, lines = self.compare(results)
+        self.assertFalse(regressed)
+        self.assertNotIn("import.juejin", lines)
+        self.assertNotIn("async.detail", lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
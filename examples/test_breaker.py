@@ -0,0 +1,85 @@
+import asyncio
+import time
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer
+from juejin.breaker import CIRCUIT_OPEN, CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from juejin.error import JuejinAPIError
+from juejin.retry import RetryPolicy
+
+COUNTS = "/growth_api/v1/get_counts"
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Failing fast during a simulated outage of the local stub server"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.transitions = []
+        self.breaker = CircuitBreaker(min_calls=4, window=10, open_for=0.2,
+                                      hooks=[lambda *change: self.transitions.append(change)])
+        self.client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.client = self.client_class(cookie="", circuit_breaker=self.breaker,
+                                        retry_policy=RetryPolicy(max_retries=0))
+
+    def tearDown(self):
+        StubHandler.outage_status = None
+        self.server.stop()
+
+    def _fail_calls(self, calls):
+        codes = []
+        for _ in range(calls):
+            with self.assertRaises(JuejinAPIError) as cm:
+                self.client.describe_user_counts()
+            codes.append(cm.exception.code)
+        return codes
+
+    def test_opens_on_failures_and_closes_after_a_probe(self):
+        StubHandler.outage_status = 503
+        self.assertEqual(self._fail_calls(6), [-2] * 4 + [CIRCUIT_OPEN] * 2)
+        self.assertEqual(self.breaker.state(COUNTS), OPEN)
+        self.assertEqual(self.breaker.rejected, 2)
+
+        StubHandler.outage_status = None
+        time.sleep(0.25)
+        self.assertEqual(self.breaker.state(COUNTS), HALF_OPEN)
+        self.client.describe_user_counts()
+        self.assertEqual(self.breaker.state(COUNTS), CLOSED)
+        self.assertEqual([(old, new) for _, _, old, new in self.transitions],
+                         [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)])
+
+    def test_failed_probe_reopens(self):
+        StubHandler.outage_status = 503
+        self._fail_calls(4)
+        time.sleep(0.25)
+        self.assertEqual(self._fail_calls(2), [-2, CIRCUIT_OPEN])
+        self.assertEqual(self.transitions[-1][2:], (HALF_OPEN, OPEN))
+
+    def test_circuits_are_per_endpoint_and_account(self):
+        self.breaker.per_account = True
+        StubHandler.outage_status = 503
+        self._fail_calls(4)
+        StubHandler.outage_status = None
+        self.client.describe_user_today_status()
+        other = self.client_class(cookie="sessionid=other", circuit_breaker=self.breaker)
+        other.describe_user_counts()
+        self.assertEqual(self.breaker.state(COUNTS, ""), OPEN)
+        self.assertEqual(self.breaker.state(COUNTS, "sessionid=other"), CLOSED)
+
+    def test_async_client_fails_fast(self):
+        StubHandler.outage_status = 502
+        self._fail_calls(4)
+
+        async def counts():
+            client_class = type("StubClient", (juejin.AsyncJuejinClient,), {"BASE_URL": self.server.url})
+            async with client_class(cookie="", circuit_breaker=self.breaker) as client:
+                return await client.describe_user_counts()
+
+        with self.assertRaises(JuejinAPIError) as cm:
+            asyncio.run(counts())
+        self.assertEqual(cm.exception.code, CIRCUIT_OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from unittest import mock
+
+import juejin
+from benchmarks.server import StubServer
+from juejin import endpoints
+from juejin.cache import ResponseCache, endpoint_tag, entity_tag, mutation_tags, response_tags
+from juejin.metrics import MetricsCollector
+from juejin.models import DescribeArticleDetailRequest, UpdateArticleRequest
+
+DRAFT_ID = "8429626822868336649"
+ARTICLE_ID = "7429626822868336649"
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("juejin.cache.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ResponseCache(max_size=3)
+
+    def test_entries_expire_after_their_ttl(self):
+        self.cache.set("a", 1, ttl=10)
+        self.now += 9.9
+        self.assertEqual(self.cache.get("a"), (True, 1))
+        self.now += 0.1
+        self.assertEqual(self.cache.get("a"), (False, None))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        for key in "abc":
+            self.cache.set(key, key, ttl=60)
+        self.cache.get("a")
+        self.cache.set("d", "d", ttl=60)
+        self.assertEqual(self.cache.get("b"), (False, None))
+        self.cache.set("c", "c2", ttl=60)
+        self.cache.set("e", "e", ttl=60)
+        # "a" was used before "c" was replaced, so it goes next
+        self.assertEqual([self.cache.get(key)[0] for key in "acde"], [False, True, True, True])
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_invalidate_drops_the_tagged_entries_only(self):
+        self.cache.set("detail", 1, ttl=60, tags=("draft:1", "endpoint:detail"))
+        self.cache.set("other", 2, ttl=60, tags=("draft:2",))
+        self.assertEqual(self.cache.invalidate("draft:1"), 1)
+        self.assertEqual(self.cache.get("detail"), (False, None))
+        self.assertEqual(self.cache.get("other"), (True, 2))
+        # Its other tags went with it
+        self.assertEqual(self.cache.invalidate("endpoint:detail"), 0)
+
+    def test_tags_of_reads_and_writes_meet(self):
+        read = response_tags(endpoints.ARTICLE_DRAFT_DETAIL, {"draft_id": DRAFT_ID},
+                             {"article_draft": {"id": DRAFT_ID, "article_id": "0"}})
+        self.assertEqual(read, (endpoint_tag(endpoints.ARTICLE_DRAFT_DETAIL), entity_tag("draft", DRAFT_ID)))
+        self.assertEqual(mutation_tags(endpoints.ARTICLE_DRAFT_UPDATE, {"id": DRAFT_ID}),
+                         (entity_tag("draft", DRAFT_ID),))
+        self.assertEqual(mutation_tags(endpoints.ARTICLE_DRAFT_DETAIL, {"draft_id": DRAFT_ID}), ())
+
+
+class TestClientCache(unittest.TestCase):
+    """Writes through the client invalidate the cached reads they make stale"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.metrics = MetricsCollector()
+        self.cache = ResponseCache()
+        self.client = self.account_client("")
+
+    def account_client(self, cookie: str):
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        auth_config = juejin.AuthConfig()
+        auth_config.aid, auth_config.uuid, auth_config.ms_token, auth_config.a_bogus = "2608", "1", "token", "bogus"
+        return client_class(cookie=cookie, auth_config=auth_config, cache=self.cache, instrumentation=self.metrics)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def http_requests(self, endpoint: str) -> int:
+        return self.metrics.snapshot()[endpoint]["http_requests"]
+
+    def test_draft_update_invalidates_the_cached_draft(self):
+        other_id = "8429626822868336650"
+        for _ in range(2):
+            self.client.describe_article_draft_detail(DRAFT_ID)
+            self.client.describe_article_draft_detail(other_id)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DETAIL), 2)
+        update = UpdateArticleRequest(DRAFT_ID)
+        update.title = "新标题"
+        self.client.update_article_draft(update)
+        self.client.describe_article_draft_detail(DRAFT_ID)
+        self.client.describe_article_draft_detail(other_id)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DETAIL), 3)
+
+    def test_article_delete_invalidates_the_cached_article(self):
+        req = DescribeArticleDetailRequest()
+        req.article_id = ARTICLE_ID
+        self.client.describe_article_detail(req)
+        self.client.describe_article_detail(req)
+        self.client.delete_article(ARTICLE_ID)
+        self.client.describe_article_detail(req)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DETAIL), 2)
+
+    def test_check_in_invalidates_the_user_counts(self):
+        self.client.describe_user_counts()
+        self.client.describe_user_counts()
+        self.client.create_user_sign_in()
+        self.client.describe_user_counts()
+        self.assertEqual(self.http_requests(endpoints.USER_COUNTS), 2)
+
+    def test_accounts_sharing_a_cache_are_kept_apart(self):
+        other = self.account_client("sessionid=other")
+        for client in (self.client, other, self.client, other):
+            client.describe_user_counts()
+        self.assertEqual(self.http_requests(endpoints.USER_COUNTS), 2)
+        # A check-in makes the counts of its own account stale only
+        other.create_user_sign_in()
+        self.client.describe_user_counts()
+        other.describe_user_counts()
+        self.assertEqual(self.http_requests(endpoints.USER_COUNTS), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,8 @@ import os
 import unittest
 from unittest.mock import MagicMock
 
-from juejin.client import JuejinClient
+from juejin.client import AuthConfig, JuejinClient
+from juejin.transport import transport_from_env
 
 
 class TestClient(unittest.TestCase):
@@ -11,7 +12,11 @@ class TestClient(unittest.TestCase):
         ms_token = os.environ["JUEJIN_MS_TOKEN"]
         a_bogus = os.environ["JUEJIN_A_BOGUS"]
 
-        self.client = JuejinClient(cookie=cookies, ms_token=ms_token, a_bogus=a_bogus)
+        auth_config = AuthConfig()
+        auth_config.ms_token = ms_token
+        auth_config.a_bogus = a_bogus
+        # JUEJIN_CASSETTE replays recorded responses instead of calling the API, see juejin.transport
+        self.client = JuejinClient(cookie=cookies, auth_config=auth_config, transport=transport_from_env())
         self.mock_response = MagicMock()
         self.mock_response.json.return_value = {
             "err_no": 0,
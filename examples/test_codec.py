@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from juejin import codec
+from juejin.models import ArticleRequest, Tag
+
+DATA = {
+    "title": "掘金 🚀 标题",
+    "escapes": "\"引号\" \\ / \n\t \x1f \x7f   é",
+    "numbers": [0, -1, 2 ** 40, 2.5, 0.1],
+    "flags": [True, False, None],
+    "nested": {"tags": [{"tag_name": "Python"}, {"tag_name": "后端"}], "empty": {}},
+}
+
+
+class TestCodec(unittest.TestCase):
+    def setUp(self):
+        self.backend = codec.backend
+
+    def tearDown(self):
+        codec.set_backend(self.backend)
+
+    def encode_with_every_backend(self, obj, **kwargs):
+        encoded = {}
+        for name in codec.BACKENDS:
+            codec.set_backend(name)
+            encoded[name] = codec.dumps(obj, **kwargs)
+        return encoded
+
+    def test_backends_encode_the_same_bytes(self):
+        for ensure_ascii in (False, True):
+            encoded = self.encode_with_every_backend(DATA, ensure_ascii=ensure_ascii)
+            expected = json.dumps(DATA, ensure_ascii=ensure_ascii, separators=(",", ":")).encode("utf-8")
+            for name, data in encoded.items():
+                self.assertEqual(data, expected, f"{name} ensure_ascii={ensure_ascii}")
+
+    def test_ensure_ascii_escapes_everything_past_ascii(self):
+        for name, data in self.encode_with_every_backend(DATA, ensure_ascii=True).items():
+            self.assertTrue(data.isascii(), name)
+            self.assertNotIn(b"\x7f", data, name)
+            self.assertIn(b"\\ud83d\\ude80", data, name)
+            self.assertEqual(json.loads(data), DATA, name)
+
+    def test_models_serialize_the_same_bytes(self):
+        article = ArticleRequest(title="标题 🚀")
+        article.pics = [Tag(tag_name="嵌套")]
+        encoded = {}
+        for name in codec.BACKENDS:
+            codec.set_backend(name)
+            encoded[name] = article._serialize()
+        self.assertEqual(len(set(encoded.values())), 1, encoded)
+        # Request bodies are sent as raw UTF-8
+        self.assertIn("标题 🚀".encode("utf-8"), encoded["json"])
+        self.assertEqual(json.loads(encoded["json"])["pics"][0]["tag_name"], "嵌套")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            codec.set_backend("simplejson")
+        self.assertEqual(codec.backend, self.backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
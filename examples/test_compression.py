@@ -0,0 +1,69 @@
+import unittest
+
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ACCEPT_ENCODING
+
+import juejin
+from benchmarks.server import StubHandler, StubServer
+from juejin import compression
+from juejin.metrics import MetricsCollector
+from juejin.models import DescribeArticleDetailRequest, UpdateArticleRequest
+
+
+class TestCompressedTransfer(unittest.TestCase):
+    """Compressed responses and request bodies against the local stub server"""
+
+    def setUp(self):
+        StubHandler.gzip_min_size = 1024
+        self.server = StubServer().start()
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        config = juejin.RequestConfig()
+        config.compress_request_min_size = 1024
+        self.metrics = MetricsCollector()
+        self.client = client_class(cookie="", config=config, instrumentation=self.metrics)
+        self.draft = UpdateArticleRequest("8429626822868336649")
+        self.draft.title = "标题"
+        self.draft.mark_content = "正文" * 2000
+
+    def tearDown(self):
+        StubHandler.gzip_min_size = None
+        StubHandler.gzip_requests = True
+        StubHandler.response_encoding = "gzip"
+        self.server.stop()
+
+    def test_wire_and_decoded_bytes_are_counted(self):
+        req = DescribeArticleDetailRequest()
+        req.article_id = "7429626822868336649"
+        self.client.describe_article_detail(req)
+        self.client.update_article_draft(self.draft)
+        stats = self.metrics.snapshot()
+        detail = stats["/content_api/v1/article/detail"]
+        self.assertLess(detail["wire_bytes_received"], detail["bytes_received"])
+        update = stats["/content_api/v1/article_draft/update"]
+        self.assertLess(update["wire_bytes_sent"], update["bytes_sent"])
+
+    def test_rejected_compression_falls_back_to_plain_bodies(self):
+        StubHandler.gzip_requests = False
+        self.client.update_article_draft(self.draft)
+        self.client.update_article_draft(self.draft)
+        update = self.metrics.snapshot()["/content_api/v1/article_draft/update"]
+        # One rejected compressed attempt, then plain bodies only
+        self.assertEqual(update["http_requests"], 3)
+        self.assertEqual(update["statuses"], {200: 2})
+
+    def test_only_encodings_urllib3_decodes_are_offered(self):
+        offered = {e.strip() for e in self.client._accept_encoding().split(",")}
+        self.assertLessEqual(offered, {e.strip() for e in URLLIB3_ACCEPT_ENCODING.split(",")})
+        self.assertIn("gzip", offered)
+
+    @unittest.skipUnless(compression.zstandard is not None, "zstandard is not installed")
+    def test_zstd_responses_are_decoded(self):
+        # The server answers in zstd only if the client offered it, and plain otherwise
+        StubHandler.response_encoding = "zstd"
+        req = DescribeArticleDetailRequest()
+        req.article_id = "7429626822868336649"
+        data = self.client.describe_article_detail(req)
+        self.assertEqual(data.article_id, "7429626822868336649")
+
+
+if __name__ == '__main__':
+    unittest.main()
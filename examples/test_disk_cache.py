@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer
+from juejin.disk_cache import DiskCache
+from juejin.error import JuejinAPIError
+from juejin.models import DescribeArticleDetailRequest
+
+
+class TestDiskCache(unittest.TestCase):
+    """Persistent cache against the local stub server"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "cache.db")
+        self.server = StubServer().start()
+        self.client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.req = DescribeArticleDetailRequest()
+        self.req.article_id = "7429626822868336649"
+
+    def tearDown(self):
+        StubHandler.etags = False
+        self.server.stop()
+        self.dir.cleanup()
+
+    def test_restarted_client_reads_from_disk(self):
+        cache = DiskCache(self.path)
+        client = self.client_class(cookie="a", disk_cache=cache)
+        title = client.describe_article_detail(self.req).article_info.title
+        counts = client.describe_user_counts()
+        cache.close()
+
+        cache = DiskCache(self.path)
+        client = self.client_class(cookie="a", disk_cache=cache)
+        self.server.stop()
+        self.assertEqual(client.describe_article_detail(self.req).article_info.title, title)
+        self.assertEqual(client.describe_user_counts(), counts)
+        self.assertEqual(cache.stats()["hits"], 2)
+        # Entries are per account
+        with self.assertRaises(JuejinAPIError):
+            self.client_class(cookie="b", disk_cache=cache).describe_user_counts()
+        cache.close()
+
+    def test_etag_is_revalidated(self):
+        StubHandler.etags = True
+        cache = DiskCache(self.path)
+        client = self.client_class(cookie="a", disk_cache=cache)
+        first = client.describe_user_counts()
+        self.assertEqual(client.describe_user_counts(), first)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["revalidated"]), (0, 1))
+        cache.close()
+
+    def test_mutation_drops_stale_entries(self):
+        cache = DiskCache(self.path)
+        client = self.client_class(cookie="a", disk_cache=cache)
+        client.describe_article_draft_detail("8429626822868336649")
+        client.describe_user_counts()
+        client.delete_article_draft("8429626822868336649")
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.close()
+
+    def test_processes_sharing_a_file_evict_against_the_shared_size(self):
+        # Two connections to one file stand in for two processes
+        first, second = DiskCache(self.path, max_bytes=10000), DiskCache(self.path, max_bytes=10000)
+        for i in range(20):
+            cache = first if i % 2 else second
+            cache.set(f"key-{i}", "/endpoint", os.urandom(1000), {})
+        size = first.conn.execute("SELECT SUM(size) FROM http_cache").fetchone()[0]
+        self.assertLessEqual(size, 10000)
+        self.assertEqual(first.stats()["bytes"], size)
+        self.assertEqual(second.stats()["bytes"], size)
+        self.assertGreater(first.stats()["evictions"] + second.stats()["evictions"], 0)
+        first.close()
+        second.close()
+
+    def test_invalidating_more_keys_than_sqlite_binds(self):
+        cache = DiskCache(self.path)
+        for i in range(1500):
+            cache.set(f"key-{i}", "/endpoint", b"body", {}, tags=("many",))
+        cache.set("other", "/other", b"body", {})
+        self.assertEqual(cache.invalidate("many"), 1500)
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["bytes"], cache.conn.execute("SELECT size FROM http_cache").fetchone()[0])
+        self.assertEqual(cache.conn.execute("SELECT COUNT(*) FROM http_cache_tags").fetchone()[0], 1)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+import juejin
+from benchmarks.server import StubServer
+from juejin.fingerprint import FingerprintStore
+from juejin.metrics import MetricsCollector
+from juejin.models import UpdateArticleRequest
+
+UPDATE = "/content_api/v1/article_draft/update"
+
+
+def draft(content="正文" * 50000):
+    req = UpdateArticleRequest("8429626822868336649")
+    req.title = "标题"
+    req.mark_content = content
+    return req
+
+
+class TestFingerprintStore(unittest.TestCase):
+    """Skipping unchanged draft updates against the local stub server"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.metrics = MetricsCollector()
+        self.store = FingerprintStore()
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.client = client_class(cookie="", fingerprints=self.store, instrumentation=self.metrics)
+
+    def tearDown(self):
+        self.store.close()
+        self.server.stop()
+
+    def sent(self):
+        return self.metrics.snapshot().get(UPDATE, {}).get("requests", 0)
+
+    def test_unchanged_update_is_skipped(self):
+        first = self.client.update_article_draft_if_changed(draft())
+        self.assertFalse(first.skipped)
+        self.assertIn("mark_content", first.changed_fields)
+
+        second = self.client.update_article_draft_if_changed(draft())
+        self.assertTrue(second.skipped)
+        self.assertIsNone(second.response)
+        self.assertEqual(self.sent(), 1)
+
+    def test_changed_fields_are_reported(self):
+        self.client.update_article_draft(draft())
+        req = draft()
+        req.title = "新标题"
+        req.tag_ids = ["6809640408797167623"]
+        update = self.client.update_article_draft_if_changed(req)
+        self.assertEqual(update.changed_fields, ["tag_ids", "title"])
+        self.assertEqual(self.sent(), 2)
+
+    def test_forgotten_drafts_are_sent_again(self):
+        self.client.update_article_draft_if_changed(draft())
+        self.client.delete_article_draft("8429626822868336649")
+        self.assertFalse(self.client.update_article_draft_if_changed(draft()).skipped)
+        self.assertEqual(self.sent(), 2)
+
+    def test_async_client_shares_the_store(self):
+        self.client.update_article_draft(draft())
+
+        async def update():
+            client_class = type("StubClient", (juejin.AsyncJuejinClient,), {"BASE_URL": self.server.url})
+            async with client_class(cookie="", fingerprints=self.store) as client:
+                return await client.update_article_draft_if_changed(draft())
+
+        self.assertTrue(asyncio.run(update()).skipped)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import re
+import unittest
+
+from juejin.metrics import Histogram, MetricsCollector, RequestEvent
+
+DETAIL = "/content_api/v1/article/detail"
+COUNTS = "/growth_api/v1/get_counts"
+
+# One sample line of the Prometheus text format: name{label="value",...} number
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*\{([a-zA-Z_]+="(?:[^"\\]|\\.)*",?)*\} [-+]?[0-9.e+Inf]+$')
+
+
+def event(endpoint: str, duration: float, status=200, error_code=None, attempts=1, cached=False,
+          bytes_received=0) -> RequestEvent:
+    e = RequestEvent("POST", endpoint)
+    e.duration = duration
+    e.status = status
+    e.error_code = error_code
+    e.attempts = attempts
+    e.cached = cached
+    e.bytes_received = bytes_received
+    return e
+
+
+class TestHistogram(unittest.TestCase):
+    def setUp(self):
+        self.histogram = Histogram((1.0, 2.0, 4.0))
+
+    def test_values_fall_into_the_first_bucket_bounding_them(self):
+        for value in (0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 100.0):
+            self.histogram.observe(value)
+        # Upper bounds are inclusive, as Prometheus' le
+        self.assertEqual(self.histogram.counts, [2, 2, 2, 1])
+        self.assertEqual(self.histogram.count, 7)
+        self.assertEqual(self.histogram.sum, 112.0)
+
+    def test_quantiles_interpolate_inside_their_bucket(self):
+        for value in (0.5, 1.5, 1.5, 3.0):
+            self.histogram.observe(value)
+        self.assertEqual(self.histogram.quantile(0.25), 1.0)
+        self.assertEqual(self.histogram.quantile(0.5), 1.5)
+        self.assertEqual(self.histogram.quantile(0.75), 2.0)
+        self.assertEqual(self.histogram.quantile(1.0), 4.0)
+
+    def test_quantiles_in_the_overflow_bucket_report_the_last_bound(self):
+        for value in (0.5, 10.0, 20.0):
+            self.histogram.observe(value)
+        self.assertEqual(self.histogram.quantile(0.9), 4.0)
+
+    def test_empty_histogram_has_no_quantiles(self):
+        self.assertIsNone(self.histogram.quantile(0.5))
+
+
+class TestMetricsCollector(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsCollector(buckets=(0.1, 1.0))
+        self.metrics.on_request_end(event(DETAIL, 0.05, bytes_received=100))
+        self.metrics.on_request_end(event(DETAIL, 0.5, status=503, error_code=-2, attempts=3))
+        self.metrics.on_request_end(event(DETAIL, 0.0, status=None, attempts=0, cached=True))
+        self.metrics.on_request_end(event(COUNTS, 2.0))
+
+    def test_snapshot(self):
+        detail = self.metrics.snapshot()[DETAIL]
+        self.assertEqual(detail["requests"], 3)
+        self.assertEqual(detail["cache_hits"], 1)
+        self.assertEqual(detail["http_requests"], 4)
+        self.assertEqual(detail["retries"], 2)
+        self.assertEqual(detail["bytes_received"], 100)
+        # Cache hits stay out of the latency histogram
+        self.assertEqual(detail["latency"]["count"], 2)
+        self.assertEqual(detail["latency"]["sum"], 0.55)
+        self.assertEqual(detail["statuses"], {200: 1, 503: 1})
+        self.assertEqual(detail["errors"], {-2: 1})
+
+    def test_prometheus_exposition(self):
+        text = self.metrics.to_prometheus()
+        self.assertTrue(text.endswith("\n"))
+        lines = text.splitlines()
+        for line in lines:
+            if line.startswith("#"):
+                self.assertRegex(line, r"^# (HELP [a-z_]+ .+|TYPE [a-z_]+ (counter|histogram))$")
+            else:
+                self.assertRegex(line, SAMPLE)
+        # Every family is announced once and every sample belongs to one
+        families = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+        self.assertEqual(len(families), len(set(families)))
+        for line in lines:
+            if not line.startswith("#"):
+                name = line.split("{")[0]
+                self.assertTrue(name in families or re.sub(r"_(bucket|sum|count)$", "", name) in families, line)
+
+        histogram = "juejin_request_duration_seconds"
+        self.assertIn(f"# TYPE {histogram} histogram", lines)
+        self.assertEqual([line for line in lines if line.startswith(f'{histogram}_bucket{{endpoint="{DETAIL}"')], [
+            f'{histogram}_bucket{{endpoint="{DETAIL}",le="0.1"}} 1',
+            f'{histogram}_bucket{{endpoint="{DETAIL}",le="1.0"}} 2',
+            f'{histogram}_bucket{{endpoint="{DETAIL}",le="+Inf"}} 2',
+        ])
+        self.assertIn(f'{histogram}_count{{endpoint="{DETAIL}"}} 2', lines)
+        self.assertIn(f'{histogram}_bucket{{endpoint="{COUNTS}",le="+Inf"}} 1', lines)
+        self.assertIn(f'juejin_requests_total{{endpoint="{DETAIL}"}} 3', lines)
+        self.assertIn(f'juejin_responses_total{{endpoint="{DETAIL}",status="503"}} 1', lines)
+        self.assertIn(f'juejin_errors_total{{endpoint="{DETAIL}",code="-2"}} 1', lines)
+
+    def test_label_values_are_escaped(self):
+        self.metrics.on_request_end(event('/a"b\\c\n', 0.01))
+        text = self.metrics.to_prometheus(prefix="app")
+        self.assertIn('app_requests_total{endpoint="/a\\"b\\\\c\\n"} 1', text.splitlines())
+
+    def test_reset(self):
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
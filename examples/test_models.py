@@ -0,0 +1,95 @@
+import copy
+import json
+import unittest
+
+from benchmarks.payloads import article_detail
+from juejin.models import (AuthorUserInfo, DescribeArticleDetailResponse, Field, LazyModel, Tag, University,
+                           UserGrowthInfo, UserInteract)
+
+
+class TestField(unittest.TestCase):
+    def test_missing_mutable_defaults_are_copied_per_instance(self):
+        first, second = UserGrowthInfo({}), UserGrowthInfo({})
+        self.assertEqual(first.author_achievement_list, [])
+        self.assertIsNot(first.author_achievement_list, second.author_achievement_list)
+        first.author_achievement_list.append("achievement")
+        self.assertEqual(second.author_achievement_list, [])
+        self.assertEqual(UserGrowthInfo.author_achievement_list.default, [])
+        # The copy is kept, so changes to it stick
+        self.assertEqual(first.author_achievement_list, ["achievement"])
+
+    def test_present_values_are_the_raw_values(self):
+        data = {"author_achievement_list": ["a"], "jscore": 1.5}
+        info = UserGrowthInfo(data)
+        self.assertIs(info.author_achievement_list, data["author_achievement_list"])
+        self.assertEqual(info.jscore, 1.5)
+        self.assertIsNone(info.vip_level)
+
+    def test_nested_models_are_built_once(self):
+        resp = DescribeArticleDetailResponse(article_detail())
+        self.assertIs(resp.article_info, resp.article_info)
+        self.assertIs(resp.author_user_info.university, resp.author_user_info.university)
+        self.assertIs(resp.tags, resp.tags)
+        self.assertIsInstance(resp.tags[0], Tag)
+        self.assertEqual(resp.tags[0].tag_name, resp._data["tags"][0]["tag_name"])
+
+    def test_missing_or_none_nested_models_are_empty(self):
+        info = AuthorUserInfo({"university": None})
+        self.assertIsInstance(info.university, University)
+        self.assertIsNone(info.university.name)
+        self.assertIsNone(info.major.name)
+        self.assertEqual(DescribeArticleDetailResponse({}).tags, [])
+
+    def test_assignment_leaves_the_raw_data_alone(self):
+        data = article_detail()
+        original = copy.deepcopy(data)
+        resp = DescribeArticleDetailResponse(data)
+        resp.article_id = "changed"
+        resp.article_info.title = "改过的标题"
+        resp.tags[0].tag_name = "改过的标签"
+        self.assertEqual(resp.article_id, "changed")
+        self.assertEqual(resp.article_info.title, "改过的标题")
+        self.assertEqual(data, original)
+
+    def test_class_access_returns_the_descriptor(self):
+        self.assertIsInstance(Tag.tag_name, Field)
+        self.assertEqual(Tag.tag_name.name, "tag_name")
+
+
+class TestLazyModel(unittest.TestCase):
+    def test_fields_follow_declaration_order_across_subclasses(self):
+        class Base(LazyModel):
+            __slots__ = ()
+            b = Field()
+            a = Field(default=1)
+
+        class Child(Base):
+            __slots__ = ()
+            c = Field()
+
+        self.assertEqual(Child._fields, ("b", "a", "c"))
+        self.assertEqual(Child(c=3)._to_dict(), {"b": None, "a": 1, "c": 3})
+
+    def test_instances_have_no_dict(self):
+        self.assertFalse(hasattr(Tag({}), "__dict__"))
+
+    def test_from_dict_round_trip(self):
+        data = {"id": "1", "user_id": "2", "is_digg": True, "collect_set_count": 3}
+        interact = UserInteract().from_dict(dict(data, undeclared=1))
+        encoded = interact._encode()
+        self.assertEqual(encoded, dict(data, omitempty=None, is_follow=False, is_collect=False))
+        self.assertFalse(hasattr(interact, "undeclared"))
+        self.assertEqual(UserInteract(encoded)._encode(), encoded)
+
+    def test_encoding_round_trip(self):
+        resp = DescribeArticleDetailResponse(article_detail())
+        resp.article_info.title = "改过的标题"
+        encoded = json.loads(resp.to_json())
+        self.assertEqual(encoded["article_info"]["title"], "改过的标题")
+        again = DescribeArticleDetailResponse(encoded)
+        self.assertEqual(json.loads(again.to_json()), encoded)
+        self.assertEqual(again.author_user_info.university.name, resp.author_user_info.university.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import unittest
+
+import juejin
+from benchmarks.server import LIST_SIZE, StubServer
+from juejin import endpoints
+from juejin.metrics import MetricsCollector
+from juejin.models import DescribeArticleListRequest
+from juejin.pagination import aiter_pages, iter_pages
+
+
+class FakePages:
+    """fetch() of a list of total items, recording the pages requested"""
+
+    def __init__(self, total: int, has_more: bool = True, count: bool = True, cursor: bool = True):
+        self.total = total
+        self.fields = {"has_more": has_more, "count": count, "cursor": cursor}
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def _page(self, req):
+        with self._lock:
+            self.requested.append(req.page_no)
+        start = (req.page_no - 1) * req.page_size
+        items = list(range(start, min(start + req.page_size, self.total)))
+        rsp = {"err_no": 0, "data": items}
+        end = start + len(items)
+        if self.fields["has_more"]:
+            rsp["has_more"] = end < self.total
+        if self.fields["count"]:
+            rsp["count"] = self.total
+        if self.fields["cursor"]:
+            rsp["cursor"] = str(end)
+        return rsp
+
+    def __call__(self, req):
+        return self._page(req)
+
+    async def fetch_async(self, req):
+        await asyncio.sleep(0)
+        return self._page(req)
+
+
+def request(page_size: int = 10, page_no: int = 1) -> DescribeArticleListRequest:
+    req = DescribeArticleListRequest()
+    req.page_size = page_size
+    req.page_no = page_no
+    return req
+
+
+def collect_async(pages: FakePages, req, prefetch: int):
+    async def run():
+        return [item async for item in aiter_pages(pages.fetch_async, req, prefetch)]
+
+    return asyncio.run(run())
+
+
+class TestIterPages(unittest.TestCase):
+    def assert_pages(self, pages_factory, req, expected_items, expected_pages):
+        """Sync and async iteration yield the items and request each page once, and no other"""
+        for prefetch in (0, 1, 3):
+            pages = pages_factory()
+            self.assertEqual(list(iter_pages(pages, req, prefetch)), expected_items)
+            self.assertEqual(sorted(pages.requested), expected_pages, f"prefetch={prefetch}")
+            pages = pages_factory()
+            self.assertEqual(collect_async(pages, req, prefetch), expected_items)
+            self.assertEqual(sorted(pages.requested), expected_pages, f"async prefetch={prefetch}")
+
+    def test_no_page_past_the_last_one_is_requested(self):
+        self.assert_pages(lambda: FakePages(45), request(), list(range(45)), [1, 2, 3, 4, 5])
+
+    def test_full_last_page(self):
+        self.assert_pages(lambda: FakePages(40), request(), list(range(40)), [1, 2, 3, 4])
+
+    def test_empty_first_page(self):
+        self.assert_pages(lambda: FakePages(0), request(), [], [1])
+        self.assert_pages(lambda: FakePages(0, has_more=False, count=False, cursor=False), request(), [], [1])
+
+    def test_single_page(self):
+        self.assert_pages(lambda: FakePages(7), request(), list(range(7)), [1])
+
+    def test_cursor_and_count_stand_in_for_has_more(self):
+        self.assert_pages(lambda: FakePages(45, has_more=False), request(), list(range(45)), [1, 2, 3, 4, 5])
+
+    def test_starting_page(self):
+        self.assert_pages(lambda: FakePages(45), request(page_no=3), list(range(20, 45)), [3, 4, 5])
+
+    def test_without_count_prefetching_stops_at_the_last_page(self):
+        # Pages ahead may be in flight already, no page after them is requested
+        pages = FakePages(45, count=False, cursor=False)
+        self.assertEqual(list(iter_pages(pages, request(), prefetch=2)), list(range(45)))
+        self.assertLessEqual(max(pages.requested), 5 + 2)
+        self.assertEqual(sorted(set(pages.requested)), sorted(pages.requested))
+
+
+class TestClientPagination(unittest.TestCase):
+    """iter_articles and iter_drafts against the stub server"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.metrics = MetricsCollector()
+        self.client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.client = self.client_class(cookie="", instrumentation=self.metrics)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def http_requests(self, endpoint: str) -> int:
+        return self.metrics.snapshot()[endpoint]["http_requests"]
+
+    def test_every_page_is_fetched_once(self):
+        articles = list(self.client.iter_articles(request(page_size=15), prefetch=3))
+        self.assertEqual(len(articles), LIST_SIZE)
+        self.assertEqual(len({item["article_id"] for item in articles}), LIST_SIZE)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_LIST), 7)
+
+    def test_empty_first_page_is_the_only_request(self):
+        req = request()
+        req.keyword = "no such title"
+        self.assertEqual(list(self.client.iter_drafts(req, prefetch=3)), [])
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_LIST), 1)
+
+    def test_async_client(self):
+        async def run():
+            async with type("StubClient", (juejin.AsyncJuejinClient,), {"BASE_URL": self.server.url})(
+                    cookie="", instrumentation=self.metrics) as client:
+                return [item async for item in client.iter_drafts(request(page_size=30), prefetch=2)]
+
+        self.assertEqual(len(asyncio.run(run())), LIST_SIZE)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_LIST), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
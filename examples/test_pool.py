@@ -0,0 +1,60 @@
+import unittest
+
+import juejin
+from benchmarks.server import StubServer
+from juejin.error import JuejinAPIError
+from juejin.metrics import MetricsCollector
+from juejin.pool import Account, JuejinClientPool
+
+
+class TestClientPool(unittest.TestCase):
+    """Running one operation for many accounts against the local stub server"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.metrics = MetricsCollector()
+        records = [{"name": f"user{i}", "cookie": f"sessionid=s{i}", "aid": "2608", "uuid": str(i),
+                    "ms_token": "token", "a_bogus": "bogus"}
+                   for i in range(40)]
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        pool_class = type("StubPool", (JuejinClientPool,), {"client_class": client_class})
+        self.pool = pool_class(records, max_workers=8, instrumentation=self.metrics)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def test_runs_for_every_account(self):
+        results = self.pool.run("create_user_sign_in")
+        self.assertEqual(list(results), self.pool.names)
+        self.assertTrue(all(r.ok and r.value["sum_point"] == 10000 for r in results.values()))
+        self.assertEqual(self.metrics.snapshot()["/growth_api/v1/check_in"]["requests"], 40)
+        self.assertEqual(self.pool.client("user3").auth_config.uuid, "3")
+
+    def test_errors_stay_with_their_account(self):
+        def counts(client, fail):
+            if client.auth_config.uuid in fail:
+                raise JuejinAPIError("Unauthorized", 403)
+            return client.describe_user_counts()
+
+        results = self.pool.run(counts, {"1", "7"}, names=["user0", "user1", "user7"])
+        self.assertTrue(results["user0"].ok)
+        self.assertEqual(results["user1"].error.code, 403)
+        self.assertEqual(results["user7"].error.code, 403)
+
+    def test_accounts_are_isolated(self):
+        first, second = self.pool.client("user0"), self.pool.client("user1")
+        self.assertIsNot(first.rate_limiter, second.rate_limiter)
+        self.assertIs(first.session.get_adapter(self.server.url), second.session.get_adapter(self.server.url))
+        self.assertNotEqual(first.session.headers["Cookie"], second.session.headers["Cookie"])
+
+    def test_accounts_can_be_added_and_removed(self):
+        self.pool.add(Account("extra", "sessionid=x"))
+        self.pool.remove("user0")
+        self.assertIn("extra", self.pool)
+        self.assertNotIn("user0", self.pool)
+        self.assertEqual(len(self.pool), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
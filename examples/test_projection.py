@@ -0,0 +1,102 @@
+import copy
+import unittest
+
+import juejin
+from benchmarks.server import StubServer
+from juejin.models import DescribeArticleDetailRequest, DescribeArticleListRequest
+from juejin.projection import HEAVY_CONTENT_FIELDS, Projection
+
+DETAIL = {
+    "article_id": "1",
+    "article_info": {"title": "标题", "content": "正文", "mark_content": "# 正文", "view_count": 10},
+    "author_user_info": {"user_name": "作者", "avatar_large": "https://example.com/a.png"},
+    "tags": [{"tag_id": "1", "tag_name": "Python", "color": "#000"},
+             {"tag_id": "2", "tag_name": "Go", "color": "#fff"}],
+}
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self):
+        self.data = copy.deepcopy(DETAIL)
+
+    def apply(self, fields=None, exclude=None):
+        result = Projection(fields, exclude).apply(self.data)
+        self.assertEqual(self.data, DETAIL, "the source was modified")
+        return result
+
+    def test_nested_fields(self):
+        self.assertEqual(self.apply(fields=("article_id", "article_info.title", "author_user_info.user_name")), {
+            "article_id": "1",
+            "article_info": {"title": "标题"},
+            "author_user_info": {"user_name": "作者"},
+        })
+
+    def test_exclude_paths(self):
+        result = self.apply(exclude=HEAVY_CONTENT_FIELDS + ("author_user_info",))
+        self.assertEqual(result["article_info"], {"title": "标题", "view_count": 10})
+        self.assertNotIn("author_user_info", result)
+        self.assertIs(result["tags"], self.data["tags"])
+
+    def test_fields_then_exclude(self):
+        self.assertEqual(self.apply(fields=("article_info",), exclude=("article_info.content",)), {
+            "article_info": {"title": "标题", "mark_content": "# 正文", "view_count": 10},
+        })
+
+    def test_lists_of_dicts(self):
+        self.assertEqual(self.apply(fields=("tags.tag_name",))["tags"], [{"tag_name": "Python"}, {"tag_name": "Go"}])
+        self.assertEqual(self.apply(exclude=("tags.color",))["tags"],
+                         [{"tag_id": "1", "tag_name": "Python"}, {"tag_id": "2", "tag_name": "Go"}])
+        # A projection of one item applies to every item of a list page
+        page = [self.data, self.data]
+        self.assertEqual(Projection(("article_info.title",)).apply(page), [{"article_info": {"title": "标题"}}] * 2)
+
+    def test_missing_paths_and_scalars(self):
+        self.assertEqual(self.apply(fields=("missing", "article_id.deeper", "article_info.missing")),
+                         {"article_id": "1", "article_info": {}})
+        self.assertEqual(self.apply(exclude=("missing.path",)), DETAIL)
+
+    def test_broader_path_wins(self):
+        for fields in (("article_info", "article_info.title"), ("article_info.title", "article_info")):
+            self.assertEqual(self.apply(fields=fields), {"article_info": DETAIL["article_info"]})
+
+    def test_result_can_be_modified_without_touching_the_source(self):
+        result = self.apply(fields=("article_info.title", "tags.tag_id"))
+        result["article_info"]["title"] = "改"
+        result["tags"][0]["tag_id"] = "9"
+        self.assertEqual(self.data, DETAIL)
+
+    def test_of_and_equality(self):
+        self.assertIsNone(Projection.of())
+        self.assertEqual(Projection.of(["a.b"]), Projection(("a.b",)))
+        self.assertEqual(len({Projection(("a",)), Projection(["a"])}), 1)
+
+
+class TestClientProjection(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer().start()
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.client = client_class(cookie="")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_detail_without_heavy_fields(self):
+        req = DescribeArticleDetailRequest()
+        req.article_id = "7429626822868336649"
+        full = self.client.describe_article_detail(req)
+        light = self.client.describe_article_detail(req, exclude=HEAVY_CONTENT_FIELDS)
+        self.assertTrue(full.article_info.mark_content)
+        self.assertEqual(light.article_info.title, full.article_info.title)
+        self.assertIsNone(light.article_info.mark_content)
+
+    def test_list_items_are_projected(self):
+        req = DescribeArticleListRequest()
+        items = self.client.describe_article_list(req, fields=("article_id", "article_info.title"))
+        self.assertEqual(len(items), req.page_size)
+        for item in items:
+            self.assertEqual(set(item), {"article_id", "article_info"})
+            self.assertEqual(set(item["article_info"]), {"title"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import unittest
+
+import juejin
+from benchmarks.server import StubServer
+from juejin.error import JuejinAPIError
+from juejin.metrics import MetricsCollector
+from juejin.models import ArticleRequest
+from juejin.publish import CREATING, PublishJournal, PublishPipeline, request_key
+
+
+def articles(count):
+    return [ArticleRequest(title=f"文章 {i}", mark_content=f"正文 {i}") for i in range(count)]
+
+
+class TestPublishPipeline(unittest.TestCase):
+    """Publishing drafts against the local stub server, resumed from a journal"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.metrics = MetricsCollector()
+        self.client = self.client_class(cookie="", instrumentation=self.metrics)
+        fd, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.journal = PublishJournal(self.path)
+
+    def tearDown(self):
+        self.journal.close()
+        os.remove(self.path)
+        self.server.stop()
+
+    def requests(self, endpoint):
+        return self.metrics.snapshot().get(endpoint, {}).get("requests", 0)
+
+    def test_publishes_every_request_once(self):
+        results = list(PublishPipeline(self.client, self.journal).run(articles(20)))
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(r.ok and r.article_id == f"7{r.draft_id[1:]}" for r in results))
+
+        # A second run with the same journal sends nothing
+        again = {r.key: r.article_id for r in PublishPipeline(self.client, self.journal).run(articles(20))}
+        self.assertEqual(again, {r.key: r.article_id for r in results})
+        self.assertEqual(self.requests("/content_api/v1/article_draft/create"), 20)
+        self.assertEqual(self.requests("/content_api/v1/article/publish"), 20)
+
+    def test_duplicate_requests_are_skipped(self):
+        reqs = articles(3)
+        results = list(PublishPipeline(self.client, self.journal).run(reqs + reqs[::-1] + reqs))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(self.journal), 3)
+        self.assertEqual(self.requests("/content_api/v1/article_draft/create"), 3)
+        self.assertNotIn("run", self.journal.state(results[0].key))
+
+    def test_stopping_early_runs_no_queued_write(self):
+        pipeline = PublishPipeline(self.client, self.journal, create_workers=1, update_workers=1, publish_workers=1)
+        results = pipeline.run(articles(20))
+        self.assertTrue(next(results).ok)
+        results.close()
+        created = self.requests("/content_api/v1/article_draft/create")
+        # Only the window of 2 * 3 workers was queued, and the queued writes not running yet were dropped
+        self.assertLessEqual(created, 6)
+        self.assertEqual(len(self.journal), created)
+
+    def test_resumes_at_the_failed_stage(self):
+        class FailingClient(self.client_class):
+            def publish_article_draft(self, draft_id):
+                raise JuejinAPIError("Too many requests", 429)
+
+        failing = FailingClient(cookie="", instrumentation=self.metrics)
+        failed = list(PublishPipeline(failing, self.journal).run(articles(5)))
+        self.assertTrue(all(r.stage == "publish" and r.error.code == 429 and r.draft_id for r in failed))
+
+        self.journal.close()
+        self.journal = PublishJournal(self.path)
+        results = list(PublishPipeline(self.client, self.journal).run(articles(5)))
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual({r.draft_id for r in results}, {r.draft_id for r in failed})
+        self.assertEqual(self.requests("/content_api/v1/article_draft/create"), 5)
+        self.assertEqual(self.requests("/content_api/v1/article_draft/update"), 5)
+
+    def test_unconfirmed_create_is_looked_up(self):
+        req = ArticleRequest(title="崩溃前创建的草稿")
+        # The draft was created but the process died before journaling its ID
+        self.journal.record(request_key(req), CREATING)
+        draft_id = self.client.create_article_draft(req)["id"]
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": "torn"})[:10])
+
+        self.journal.close()
+        self.journal = PublishJournal(self.path)
+        result, = PublishPipeline(self.client, self.journal).run([req])
+        self.assertEqual(result.draft_id, draft_id)
+        self.assertEqual(self.requests("/content_api/v1/article_draft/create"), 1)
+        self.journal.close()
+        self.assertEqual(PublishJournal(self.path).state(result.key)["event"], "published")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer
+from juejin import endpoints
+from juejin.error import JuejinAPIError
+from juejin.metrics import MetricsCollector
+from juejin.ratelimit import RateLimiter
+from juejin.retry import RetryPolicy
+
+COUNTS = endpoints.USER_COUNTS
+
+
+class TestAIMD(unittest.TestCase):
+    """Additive increase, multiplicative decrease of the adaptive rates"""
+
+    def setUp(self):
+        self.limiter = RateLimiter(rate=10.0, endpoint_rates={COUNTS: 4.0}, throttle_err_nos=(1001,),
+                                   decrease_factor=0.5, recovery=0.1, min_rate=1.0, cooldown=0.0)
+
+    def test_throttling_halves_the_rates(self):
+        self.limiter.record(COUNTS, status=429)
+        self.assertEqual(self.limiter.rate(), 5.0)
+        self.assertEqual(self.limiter.rate(COUNTS), 2.0)
+        self.limiter.record(COUNTS, err_no=1001)
+        self.assertEqual(self.limiter.rate(), 2.5)
+        self.assertEqual(self.limiter.rate(COUNTS), 1.0)
+        self.assertEqual(self.limiter.throttled, 2)
+
+    def test_rates_never_drop_below_min_rate(self):
+        for _ in range(10):
+            self.limiter.record(COUNTS, status=429)
+        self.assertEqual(self.limiter.rate(), 1.0)
+        self.assertEqual(self.limiter.rate(COUNTS), 1.0)
+
+    def test_successes_win_back_a_share_of_the_configured_rate(self):
+        self.limiter.record(COUNTS, status=429)
+        self.limiter.record(COUNTS, err_no=0)
+        self.assertAlmostEqual(self.limiter.rate(), 6.0)
+        self.assertAlmostEqual(self.limiter.rate(COUNTS), 2.4)
+        for _ in range(20):
+            self.limiter.record(COUNTS, err_no=0)
+        # Capped at the configured rates
+        self.assertEqual(self.limiter.rate(), 10.0)
+        self.assertEqual(self.limiter.rate(COUNTS), 4.0)
+
+    def test_other_failures_leave_the_rates_alone(self):
+        self.limiter.record(COUNTS, status=429)
+        for outcome in ({"err_no": -1}, {"err_no": -2}, {"err_no": 403}, {"status": 503}, {}):
+            self.limiter.record(COUNTS, **outcome)
+        self.assertEqual(self.limiter.rate(), 5.0)
+        self.assertEqual(self.limiter.rate(COUNTS), 2.0)
+
+    def test_cooldown_absorbs_a_burst_of_throttled_responses(self):
+        self.limiter.cooldown = 60.0
+        for _ in range(3):
+            self.limiter.record(COUNTS, status=429)
+        self.assertEqual(self.limiter.rate(), 5.0)
+        self.assertEqual(self.limiter.throttled, 3)
+
+
+class TestAttemptFeedback(unittest.TestCase):
+    """Clients feed every HTTP attempt back to the rate limiter exactly once"""
+
+    def setUp(self):
+        StubHandler.outage_status = 429
+        self.server = StubServer().start()
+        self.limiter = RateLimiter(rate=1000.0, cooldown=60.0)
+        self.policy = RetryPolicy(max_retries=2, backoff_factor=0.0)
+
+    def tearDown(self):
+        StubHandler.outage_status = None
+        self.server.stop()
+
+    def client(self, base=juejin.JuejinClient):
+        client_class = type("StubClient", (base,), {"BASE_URL": self.server.url})
+        return client_class(cookie="", rate_limiter=self.limiter, retry_policy=self.policy)
+
+    def test_each_throttled_attempt_is_recorded_once(self):
+        with self.assertRaises(JuejinAPIError):
+            self.client().describe_user_counts()
+        self.assertEqual(self.limiter.throttled, 3)
+
+    def test_probed_attempts_are_recorded_once(self):
+        # A 503 read as throttling makes the failed delete probe whether the draft still exists
+        StubHandler.outage_status = 503
+        self.limiter.throttle_status_codes = frozenset({503})
+        metrics = MetricsCollector()
+        client = self.client()
+        client.instrumentation = metrics
+        with self.assertRaises(JuejinAPIError):
+            client.delete_article_draft("8429626822868336649")
+        stats = metrics.snapshot()
+        self.assertIn(endpoints.ARTICLE_DRAFT_DETAIL, stats)
+        self.assertEqual(self.limiter.throttled, sum(s["http_requests"] for s in stats.values()))
+
+    def test_async_client_records_each_attempt_once(self):
+        async def counts():
+            async with self.client(juejin.AsyncJuejinClient) as client:
+                await client.describe_user_counts()
+
+        with self.assertRaises(JuejinAPIError):
+            asyncio.run(counts())
+        self.assertEqual(self.limiter.throttled, 3)
+
+    def test_recovery_after_throttling(self):
+        self.limiter.cooldown = 0.0
+        with self.assertRaises(JuejinAPIError):
+            self.client().describe_user_counts()
+        throttled_rate = self.limiter.rate()
+        StubHandler.outage_status = None
+        self.client().describe_user_counts()
+        self.assertAlmostEqual(self.limiter.rate(), throttled_rate + 1000.0 * self.limiter.recovery)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import time
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer, envelope
+from juejin import endpoints
+from juejin.error import JuejinAPIError
+from juejin.metrics import MetricsCollector
+from juejin.models import ArticleRequest, DescribeArticleDetailRequest
+from juejin.retry import RetryPolicy
+
+DRAFT_ID = "8429626822868336649"
+
+
+class TestRetryDecisions(unittest.TestCase):
+    """Which failed calls are retried, against the local stub server"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.metrics = MetricsCollector()
+        self.policy = RetryPolicy(max_retries=2, backoff_factor=0.0)
+        self.static = dict(StubHandler.static)
+
+    def tearDown(self):
+        StubHandler.outage_status = None
+        StubHandler.outage_paths = None
+        StubHandler.retry_after = None
+        StubHandler.static = self.static
+        self.server.stop()
+
+    def client(self, base=juejin.JuejinClient):
+        client_class = type("StubClient", (base,), {"BASE_URL": self.server.url})
+        return client_class(cookie="", retry_policy=self.policy, instrumentation=self.metrics)
+
+    def http_requests(self, endpoint: str) -> int:
+        return self.metrics.snapshot().get(endpoint, {}).get("http_requests", 0)
+
+    def outage(self, status: int, *paths: str) -> None:
+        StubHandler.outage_status = status
+        StubHandler.outage_paths = set(paths) or None
+
+    def test_idempotent_post_reads_are_retried_on_5xx(self):
+        self.outage(502)
+        req = DescribeArticleDetailRequest()
+        req.article_id = "7429626822868336649"
+        with self.assertRaises(JuejinAPIError) as cm:
+            self.client().describe_article_detail(req)
+        self.assertEqual(cm.exception.code, -2)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DETAIL), 3)
+
+    def test_other_statuses_are_not_retried(self):
+        self.outage(404)
+        with self.assertRaises(JuejinAPIError):
+            self.client().describe_user_counts()
+        self.assertEqual(self.http_requests(endpoints.USER_COUNTS), 1)
+
+    def test_mutations_are_not_retried_on_5xx(self):
+        self.outage(503)
+        req = ArticleRequest()
+        req.title = "标题"
+        with self.assertRaises(JuejinAPIError):
+            self.client().create_article_draft(req)
+        with self.assertRaises(JuejinAPIError):
+            self.client().publish_article_draft(DRAFT_ID)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_CREATE), 1)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_PUBLISH), 1)
+
+    def test_retry_after_is_honoured(self):
+        self.policy.max_retries = 1
+        self.outage(503)
+        StubHandler.retry_after = "1"
+        started = time.monotonic()
+        with self.assertRaises(JuejinAPIError):
+            self.client().describe_user_counts()
+        self.assertGreaterEqual(time.monotonic() - started, 0.9)
+        self.assertEqual(self.http_requests(endpoints.USER_COUNTS), 2)
+
+    def test_retry_after_is_capped(self):
+        self.policy.max_retry_after = 0.0
+        self.outage(429)
+        StubHandler.retry_after = "3600"
+        started = time.monotonic()
+        with self.assertRaises(JuejinAPIError):
+            self.client().describe_user_counts()
+        self.assertLess(time.monotonic() - started, 5.0)
+        self.assertEqual(self.http_requests(endpoints.USER_COUNTS), 3)
+
+    def test_mutation_is_retried_while_the_probe_shows_it_did_not_land(self):
+        # The draft is still there after every failed delete
+        self.outage(503, endpoints.ARTICLE_DRAFT_DELETE)
+        with self.assertRaises(JuejinAPIError):
+            self.client().delete_article_draft(DRAFT_ID)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DELETE), 3)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DETAIL), 2)
+
+    def test_mutation_is_not_retried_once_the_probe_shows_it_landed(self):
+        self.outage(503, endpoints.ARTICLE_DRAFT_DELETE)
+        StubHandler.static = dict(StubHandler.static, **{
+            endpoints.ARTICLE_DRAFT_DETAIL: envelope(None, err_no=404, err_msg="draft not found")})
+        with self.assertRaises(JuejinAPIError):
+            self.client().delete_article_draft(DRAFT_ID)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DELETE), 1)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DETAIL), 1)
+
+    def test_async_client_awaits_the_probe(self):
+        self.outage(503, endpoints.ARTICLE_DRAFT_DELETE)
+
+        async def delete():
+            async with self.client(juejin.AsyncJuejinClient) as client:
+                await client.delete_article_draft(DRAFT_ID)
+
+        with self.assertRaises(JuejinAPIError):
+            asyncio.run(delete())
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DELETE), 3)
+        self.assertEqual(self.http_requests(endpoints.ARTICLE_DRAFT_DETAIL), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer
+from juejin.models import DescribeArticleDetailRequest, UpdateArticleRequest
+from juejin.search import ARTICLES, DRAFTS, SearchIndex, tokenize
+from juejin.sync import SyncEngine, SyncStore
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Python 性能优化"), ["python", "性能", "能优", "优化", "化"])
+        self.assertEqual(tokenize("用asyncio并发"), ["用", "asyncio", "并发", "发"])
+
+    def test_title_matches_rank_first(self):
+        self.index.index(ARTICLES, "1", "缓存设计", "", "正文提到性能优化")
+        self.index.index(ARTICLES, "2", "性能优化实践", "", "正文")
+        self.index.index(ARTICLES, "3", "性能与优化", "", "无关内容")
+        self.assertEqual(self.index.search("性能优化"), ["2", "1"])
+        self.assertEqual(self.index.search("python 性能"), [])
+
+    def test_single_character_queries(self):
+        self.index.index(ARTICLES, "1", "性能优化", "", "")
+        self.index.index(ARTICLES, "2", "缓存", "", "用")
+        for query, expected in (("性", ["1"]), ("能", ["1"]), ("化", ["1"]), ("用", ["2"]), ("缓", ["2"]),
+                                ("存", ["2"]), ("优 缓", []), ("优 性能", ["1"]), ("慢", [])):
+            self.assertEqual(self.index.search(query), expected, query)
+
+    def test_unchanged_text_is_not_reindexed(self):
+        self.assertTrue(self.index.index(DRAFTS, "1", "标题", "", "正文"))
+        self.assertFalse(self.index.index(DRAFTS, "1", "标题", "", "正文"))
+        self.assertTrue(self.index.index(DRAFTS, "1", "新标题", "", "正文"))
+        self.assertEqual(self.index.search("新标题", DRAFTS), ["1"])
+        self.assertTrue(self.index.remove(DRAFTS, "1"))
+        self.assertEqual(self.index.search("标题", DRAFTS), [])
+
+
+class TestSearchIndexWithClient(unittest.TestCase):
+    """The index follows the client's calls and syncs against the local stub server"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.index = SearchIndex()
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.client = client_class(cookie="", search_index=self.index)
+
+    def tearDown(self):
+        self.index.close()
+        self.server.stop()
+
+    def test_fetched_and_updated_content_is_indexed(self):
+        req = DescribeArticleDetailRequest()
+        req.article_id = "7429626822868336649"
+        self.client.describe_article_detail(req)
+        self.assertEqual(self.index.search("SDK 性能优化"), ["7429626822868336649"])
+
+        draft = UpdateArticleRequest("8429626822868336649")
+        draft.title = "草稿标题"
+        draft.mark_content = "草稿正文"
+        self.client.update_article_draft(draft)
+        self.assertEqual(self.index.search("草稿", DRAFTS), ["8429626822868336649"])
+        self.client.delete_article_draft("8429626822868336649")
+        self.assertEqual(self.index.count(DRAFTS), 0)
+
+    def test_sync_indexes_and_prunes(self):
+        store = SyncStore()
+        engine = SyncEngine(self.client, store, page_size=50, prune=True, search_index=self.index)
+        engine.sync_articles()
+        self.assertEqual(self.index.count(ARTICLES), 100)
+        ids = StubHandler.article_ids
+        try:
+            StubHandler.article_ids = ids[:-5]
+            engine.sync_articles()
+        finally:
+            StubHandler.article_ids = ids
+        self.assertEqual(self.index.count(ARTICLES), 95)
+        self.assertEqual(self.index.search(ids[10]), [ids[10]])
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
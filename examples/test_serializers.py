@@ -0,0 +1,54 @@
+import json
+import unittest
+
+from benchmarks.payloads import article_detail
+from juejin.models import ArticleRequest, DescribeArticleDetailResponse, DescribeArticleListRequest, Tag
+
+
+class TestGeneratedSerializers(unittest.TestCase):
+    """Encoding and decoding through the serializers generated per model class"""
+
+    def test_response_encodes_like_its_models(self):
+        data = article_detail()
+        data["article_info"]["undeclared"] = 1
+        resp = DescribeArticleDetailResponse(data)
+        encoded = json.loads(resp.to_json())
+        self.assertEqual(encoded["article_info"]["title"], data["article_info"]["title"])
+        # Declared fields only, missing ones with their defaults
+        self.assertNotIn("undeclared", encoded["article_info"])
+        self.assertEqual(encoded["org"], {"is_followed": False})
+        self.assertEqual(encoded["tags"][0]["tag_name"], data["tags"][0]["tag_name"])
+
+        resp.tags[0].tag_name = "改过的标签"
+        resp.article_info.title = "改过的标题"
+        encoded = json.loads(resp.to_json())
+        self.assertEqual(encoded["tags"][0]["tag_name"], "改过的标签")
+        self.assertEqual(encoded["article_info"]["title"], "改过的标题")
+
+    def test_request_skips_none_and_encodes_nested_models(self):
+        req = DescribeArticleListRequest()
+        self.assertNotIn(b"audit_status", req._serialize())
+        self.assertIn('"audit_status": null', req.to_json())
+
+        article = ArticleRequest(title="标题")
+        article.pics = [Tag(tag_name="嵌套")]
+        self.assertEqual(json.loads(article._serialize())["pics"][0]["tag_name"], "嵌套")
+
+    def test_instances_with_other_attributes_take_the_generic_path(self):
+        ArticleRequest()._serialize()
+        req = ArticleRequest(title="标题")
+        req.column_ids = ["1"]
+        del req.author
+        body = json.loads(req._serialize())
+        self.assertEqual(body["column_ids"], ["1"])
+        self.assertNotIn("author", body)
+
+    def test_from_dict_sets_known_attributes_only(self):
+        req = ArticleRequest().from_dict({"title": "标题", "unknown": 1})
+        self.assertEqual(req.title, "标题")
+        self.assertFalse(hasattr(req, "unknown"))
+        self.assertEqual(Tag().from_dict({"tag_name": "标签", "unknown": 1}).tag_name, "标签")
+
+
+if __name__ == '__main__':
+    unittest.main()
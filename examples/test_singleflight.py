@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import juejin
+from benchmarks.server import StubHandler, StubServer
+from juejin import endpoints
+from juejin.error import JuejinAPIError
+from juejin.metrics import MetricsCollector
+from juejin.retry import RetryPolicy
+from juejin.singleflight import AsyncSingleFlight, SingleFlight
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out")
+        time.sleep(0.001)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def upstream(self, result=None, error=None):
+        def fn():
+            self.calls += 1
+            self.release.wait(5)
+            if error is not None:
+                raise error
+            return result
+        return fn
+
+    def run_callers(self, fn):
+        """Outcome of every caller of do("key", fn), released once all of them are in"""
+        def call():
+            try:
+                return self.flight.do("key", fn)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            futures = [executor.submit(call) for _ in range(CALLERS)]
+            wait_for(lambda: self.flight.deduplicated == CALLERS - 1)
+            self.release.set()
+            return [future.result() for future in futures]
+
+    def test_concurrent_calls_share_one_call(self):
+        result = {"data": 1}
+        outcomes = self.run_callers(self.upstream(result))
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(outcome is result for outcome in outcomes))
+        self.assertEqual(self.flight.stats(), {"executed": 1, "deduplicated": CALLERS - 1, "in_flight": 0})
+
+    def test_errors_reach_every_caller(self):
+        error = JuejinAPIError("boom", -2)
+        outcomes = self.run_callers(self.upstream(error=error))
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(outcome is error for outcome in outcomes))
+
+    def test_later_calls_run_again(self):
+        self.release.set()
+        self.flight.do("key", self.upstream(1))
+        self.flight.do("key", self.upstream(1))
+        self.flight.do("other", self.upstream(1))
+        self.assertEqual(self.calls, 3)
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def run_callers(self, fn):
+        flight = AsyncSingleFlight()
+
+        async def run():
+            outcomes = await asyncio.gather(*(flight.do("key", fn) for _ in range(CALLERS)),
+                                            return_exceptions=True)
+            return outcomes, flight.stats()
+
+        return asyncio.run(run())
+
+    def test_concurrent_calls_share_one_call(self):
+        calls = []
+        result = {"data": 1}
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return result
+
+        outcomes, stats = self.run_callers(fn)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(outcome is result for outcome in outcomes))
+        self.assertEqual(stats, {"executed": 1, "deduplicated": CALLERS - 1, "in_flight": 0})
+
+    def test_errors_reach_every_caller(self):
+        calls = []
+        error = JuejinAPIError("boom", -2)
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise error
+
+        outcomes, _ = self.run_callers(fn)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(outcome is error for outcome in outcomes))
+
+    def test_cancelled_caller_does_not_cancel_the_others(self):
+        flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.05)
+            return 1
+
+        async def run():
+            first = asyncio.ensure_future(flight.do("key", fn))
+            second = asyncio.ensure_future(flight.do("key", fn))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+
+class TestCoalescedRequests(unittest.TestCase):
+    """Identical concurrent reads of the clients send one HTTP request"""
+
+    def setUp(self):
+        StubHandler.delay = 0.3
+        self.server = StubServer().start()
+        self.metrics = MetricsCollector()
+
+    def tearDown(self):
+        StubHandler.delay = 0.0
+        StubHandler.outage_status = None
+        self.server.stop()
+
+    def client(self, base, flight, cookie: str = ""):
+        client_class = type("StubClient", (base,), {"BASE_URL": self.server.url})
+        return client_class(cookie=cookie, single_flight=flight, instrumentation=self.metrics,
+                            retry_policy=RetryPolicy(max_retries=0))
+
+    def http_requests(self) -> int:
+        return self.metrics.snapshot()[endpoints.USER_COUNTS]["http_requests"]
+
+    def sync_calls(self):
+        client = self.client(juejin.JuejinClient, SingleFlight())
+
+        def call():
+            try:
+                return client.describe_user_counts()
+            except JuejinAPIError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            return list(executor.map(lambda _: call(), range(CALLERS)))
+
+    def async_calls(self):
+        async def run():
+            async with self.client(juejin.AsyncJuejinClient, AsyncSingleFlight()) as client:
+                return await asyncio.gather(*(client.describe_user_counts() for _ in range(CALLERS)),
+                                            return_exceptions=True)
+
+        return asyncio.run(run())
+
+    def test_sync_client_sends_one_request(self):
+        outcomes = self.sync_calls()
+        self.assertEqual(self.http_requests(), 1)
+        self.assertTrue(all(outcome == outcomes[0] for outcome in outcomes))
+
+    def test_async_client_sends_one_request(self):
+        outcomes = self.async_calls()
+        self.assertEqual(self.http_requests(), 1)
+        self.assertTrue(all(outcome == outcomes[0] for outcome in outcomes))
+
+    def test_accounts_do_not_share_calls(self):
+        flight = SingleFlight()
+        clients = [self.client(juejin.JuejinClient, flight, cookie=f"sessionid={i % 2}") for i in range(CALLERS)]
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            list(executor.map(lambda client: client.describe_user_counts(), clients))
+        self.assertEqual(self.http_requests(), 2)
+        self.assertEqual(flight.stats()["executed"], 2)
+
+    def test_failures_reach_every_caller(self):
+        StubHandler.outage_status = 503
+        for outcomes in (self.sync_calls(), self.async_calls()):
+            self.assertTrue(all(isinstance(outcome, JuejinAPIError) and outcome.code == -2
+                                for outcome in outcomes))
+        self.assertEqual(self.http_requests(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
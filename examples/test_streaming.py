@@ -0,0 +1,137 @@
+import asyncio
+import json
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer, envelope
+from juejin import endpoints
+from juejin.error import JuejinAPIError
+from juejin.metrics import MetricsCollector
+from juejin.models import DescribeArticleListRequest
+from juejin.ratelimit import RateLimiter
+from juejin.streaming import JSONArrayParser
+
+
+def parse(chunks):
+    """Items and envelope of a body fed to a parser in chunks"""
+    parser = JSONArrayParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return items, parser.envelope
+
+
+class TestJSONArrayParser(unittest.TestCase):
+    def assert_any_split(self, body: bytes):
+        """Every split of body into two chunks, and one byte per chunk, parse like json.loads"""
+        expected = json.loads(body)
+        items = expected.pop("data")
+        for i in range(len(body) + 1):
+            self.assertEqual(parse([body[:i], body[i:]]), (items, expected), f"split at {i}")
+        self.assertEqual(parse([body[i:i + 1] for i in range(len(body))]), (items, expected))
+
+    def test_multibyte_characters_split_across_chunks(self):
+        self.assert_any_split(json.dumps({"err_no": 0, "data": [{"title": "掘金 🚀 文章"}, "é"], "err_msg": "成功"},
+                                         ensure_ascii=False).encode("utf-8"))
+
+    def test_escapes_split_across_chunks(self):
+        self.assert_any_split(r'{"data": ["a\"b\\c", "\u00e9\n\ud83d\ude80", {"k\"": "\/"}], "err_msg": "成"}'
+                              .encode("utf-8"))
+
+    def test_err_no_before_data_is_known_before_the_items(self):
+        parser = JSONArrayParser()
+        items = parser.feed(b'{"err_no": 403, "err_msg": "must login", "data": [{"id": 1}')
+        self.assertEqual(parser.envelope, {"err_no": 403, "err_msg": "must login"})
+        self.assertEqual(items, [])
+
+    def test_err_no_after_data_is_known_at_the_end(self):
+        parser = JSONArrayParser()
+        self.assertEqual(parser.feed(b'{"data": [{"id": 1}, {"id": 2}], '), [{"id": 1}, {"id": 2}])
+        self.assertEqual(parser.envelope, {})
+        self.assertEqual(parser.feed(b'"err_no": 0}'), [])
+        self.assertEqual(parser.close(), [])
+        self.assertEqual(parser.envelope, {"err_no": 0})
+
+    def test_number_at_the_end_of_the_document(self):
+        self.assert_any_split(b'{"data": [1, 2.5, -3e2], "count": 42}')
+        parser = JSONArrayParser()
+        parser.feed(b'{"data": [12')
+        self.assertEqual(parser.feed(b'34], "count": 4'), [1234])
+        parser.feed(b'2')
+        # The number may still go on until the closing brace arrives
+        self.assertNotIn("count", parser.envelope)
+        parser.feed(b"}")
+        self.assertEqual(parser.envelope, {"count": 42})
+        self.assertTrue(parser.done)
+
+    def test_truncated_and_trailing_data_are_errors(self):
+        parser = JSONArrayParser()
+        parser.feed(b'{"data": [1, 2')
+        with self.assertRaises(json.JSONDecodeError):
+            parser.close()
+        with self.assertRaises(json.JSONDecodeError):
+            JSONArrayParser().feed(b'{"data": []} {}')
+
+
+class RecordingRateLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(rate=1000)
+        self.outcomes = []
+
+    def record(self, endpoint, status=None, err_no=None):
+        self.outcomes.append((endpoint, status, err_no))
+        super().record(endpoint, status, err_no)
+
+
+class TestStreamedRequests(unittest.TestCase):
+    """Streamed list requests go through the metrics and rate limiter feedback of plain requests"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        self.metrics = MetricsCollector()
+        self.limiter = RecordingRateLimiter()
+        self.static = dict(StubHandler.static)
+        self.req = DescribeArticleListRequest()
+        self.req.page_size = 20
+
+    def tearDown(self):
+        StubHandler.static = self.static
+        self.server.stop()
+
+    def client(self, base=juejin.JuejinClient):
+        client_class = type("StubClient", (base,), {"BASE_URL": self.server.url})
+        return client_class(cookie="", instrumentation=self.metrics, rate_limiter=self.limiter)
+
+    def stream_async(self):
+        async def run():
+            async with self.client(juejin.AsyncJuejinClient) as client:
+                return [item async for item in client.stream_article_draft_list(self.req)]
+
+        return asyncio.run(run())
+
+    def test_streams_are_measured_and_fed_back(self):
+        items = list(self.client().stream_article_draft_list(self.req))
+        self.assertEqual(len(items), 20)
+        self.assertEqual(len(self.stream_async()), 20)
+        stats = self.metrics.snapshot()[endpoints.ARTICLE_DRAFT_LIST]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["statuses"], {200: 2})
+        self.assertGreater(stats["bytes_received"], 0)
+        self.assertEqual(self.limiter.outcomes, [(endpoints.ARTICLE_DRAFT_LIST, None, 0)] * 2)
+
+    def test_stream_errors_are_measured_and_fed_back(self):
+        StubHandler.static = dict(StubHandler.static, **{
+            endpoints.ARTICLE_DRAFT_LIST: envelope([], err_no=403, err_msg="must login")})
+        with self.assertRaises(JuejinAPIError):
+            list(self.client().stream_article_draft_list(self.req))
+        with self.assertRaises(JuejinAPIError):
+            self.stream_async()
+        stats = self.metrics.snapshot()[endpoints.ARTICLE_DRAFT_LIST]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["errors"], {403: 2})
+        self.assertEqual(self.limiter.outcomes, [(endpoints.ARTICLE_DRAFT_LIST, None, 403)] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
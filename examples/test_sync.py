@@ -0,0 +1,95 @@
+import unittest
+
+import juejin
+from benchmarks.server import StubHandler, StubServer
+from juejin.error import JuejinAPIError
+from juejin.sync import ARTICLES, DRAFTS, SyncEngine, SyncStore
+
+
+class TestIncrementalSync(unittest.TestCase):
+    """Sync against the local stub server, which lists 100 articles and 100 drafts"""
+
+    def setUp(self):
+        self.server = StubServer().start()
+        StubHandler.mtimes = {}
+        client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": self.server.url})
+        self.client = client_class(cookie="")
+        self.store = SyncStore()
+        self.engine = SyncEngine(self.client, self.store, page_size=30)
+
+    def tearDown(self):
+        StubHandler.mtimes = {}
+        self.store.close()
+        self.server.stop()
+
+    def test_only_changed_items_are_fetched(self):
+        reports = self.engine.sync()
+        self.assertEqual((reports[ARTICLES].listed, reports[ARTICLES].fetched), (100, 100))
+        self.assertEqual((reports[DRAFTS].listed, reports[DRAFTS].fetched), (100, 100))
+        self.assertEqual(self.store.count(ARTICLES), 100)
+
+        article_id = StubHandler.article_ids[42]
+        StubHandler.mtimes = {article_id: "1800000000"}
+        report = self.engine.sync_articles()
+        self.assertEqual((report.fetched, report.unchanged), (1, 99))
+        self.assertEqual(self.store.get_article(article_id)["article_id"], article_id)
+        self.assertEqual(self.engine.sync_drafts().fetched, 0)
+
+    def test_interrupted_sync_resumes_after_last_committed_page(self):
+        fetch_page = self.client.fetch_article_page
+        pages = []
+
+        def failing_fetch_page(req, projection=None):
+            pages.append(req.page_no)
+            if req.page_no == 3 and len(pages) == 3:
+                raise JuejinAPIError("Network request failed", -2)
+            return fetch_page(req, projection)
+
+        self.client.fetch_article_page = failing_fetch_page
+        with self.assertRaises(JuejinAPIError):
+            self.engine.sync_articles()
+        self.assertEqual(self.store.count(ARTICLES), 60)
+
+        report = self.engine.sync_articles()
+        self.assertTrue(report.resumed)
+        self.assertEqual(pages[3:], [3, 4])
+        self.assertEqual((report.fetched, report.removed), (40, 0))
+        self.assertEqual(self.store.count(ARTICLES), 100)
+        self.assertFalse(self.engine.sync_articles().resumed)
+
+    def test_items_no_longer_listed_are_removed(self):
+        engine = SyncEngine(self.client, self.store, page_size=30, prune=True)
+        engine.sync_articles()
+        ids = StubHandler.article_ids
+        try:
+            StubHandler.article_ids = ids[:-5]
+            self.assertEqual(self.engine.sync_articles().removed, 0)
+            report = engine.sync_articles()
+        finally:
+            StubHandler.article_ids = ids
+        self.assertEqual((report.fetched, report.removed), (0, 5))
+        self.assertEqual(self.store.count(ARTICLES), 95)
+
+    def test_items_shifted_between_pages_are_not_removed(self):
+        engine = SyncEngine(self.client, self.store, page_size=30, prune=True)
+        engine.sync_articles()
+        fetch_page = self.client.fetch_article_page
+        ids = StubHandler.article_ids
+
+        def fetch_page_with_deletion(req, projection=None):
+            # Two articles on the first page are deleted once it was listed, shifting the later pages up
+            if req.page_no == 2:
+                StubHandler.article_ids = ids[2:]
+            return fetch_page(req, projection)
+
+        self.client.fetch_article_page = fetch_page_with_deletion
+        try:
+            report = engine.sync_articles()
+        finally:
+            StubHandler.article_ids = ids
+        self.assertEqual((report.listed, report.removed), (98, 0))
+        self.assertEqual(self.store.count(ARTICLES), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
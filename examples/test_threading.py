@@ -0,0 +1,112 @@
+import json
+import logging
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import juejin
+from juejin.client import RequestConfig
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    ports = set()
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            self.ports.add(self.client_address[1])
+        body = json.dumps({"err_no": 0, "err_msg": "success", "data": {"thread": self.path}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestThreadSharedClient(unittest.TestCase):
+    """One JuejinClient shared by many threads, against a local stub server"""
+
+    threads = 16
+    calls = 400
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        _StubHandler.ports = set()
+
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": base_url})
+
+        self.log_handler = _RecordingHandler()
+        logging.getLogger("urllib3.connectionpool").addHandler(self.log_handler)
+
+    def tearDown(self):
+        logging.getLogger("urllib3.connectionpool").removeHandler(self.log_handler)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _hammer(self, client):
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            results = list(pool.map(lambda _: client.describe_user_counts(), range(self.calls)))
+        self.assertEqual(len(results), self.calls)
+        self.assertTrue(all(r == {"thread": "/growth_api/v1/get_counts"} for r in results))
+
+    def test_shared_session_reuses_keep_alive_connections(self):
+        config = RequestConfig()
+        config.pool_maxsize = self.threads
+        self._hammer(self.client_class(cookie="", config=config))
+
+        self.assertLessEqual(len(_StubHandler.ports), self.threads)
+        self.assertEqual(self.log_handler.records, [])
+
+    def test_blocking_pool_never_exceeds_its_size(self):
+        config = RequestConfig()
+        config.pool_maxsize = 4
+        config.pool_block = True
+        self._hammer(self.client_class(cookie="", config=config))
+
+        self.assertLessEqual(len(_StubHandler.ports), 4)
+        self.assertEqual(self.log_handler.records, [])
+
+    def test_session_per_thread(self):
+        config = RequestConfig()
+        config.session_per_thread = True
+        client = self.client_class(cookie="", config=config)
+        self._hammer(client)
+
+        # Hold the sessions themselves, the ids of freed ones may be reused
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(client.session)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(session) for session in sessions}), 3)
+        self.assertIs(client.session, client.session)
+        self.assertLessEqual(len(_StubHandler.ports), self.threads + 1)
+
+    def test_default_configs_are_not_shared(self):
+        first = juejin.JuejinClient(cookie="")
+        second = juejin.JuejinClient(cookie="")
+        first.auth_config.aid = "2608"
+        self.assertIsNot(first.auth_config, second.auth_config)
+        self.assertIsNot(first._config, second._config)
+        self.assertFalse(hasattr(second.auth_config, "aid"))
+
+
+if __name__ == '__main__':
+    unittest.main()
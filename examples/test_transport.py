@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import juejin
+from benchmarks.server import StubServer
+from juejin.error import JuejinAPIError
+from juejin.models import DescribeArticleDetailRequest, DescribeArticleListRequest
+from juejin.transport import Cassette, RecordingTransport, ReplayTransport
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Record exchanges with the local stub server, then replay them with the server gone"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "juejin.jsonl")
+        self.auth_config = juejin.AuthConfig()
+        self.auth_config.aid = "2608"
+        self.auth_config.uuid = "1"
+        self.auth_config.ms_token = "recorded"
+        self.auth_config.a_bogus = "recorded"
+        self.detail_req = DescribeArticleDetailRequest()
+        self.detail_req.article_id = "7429626822868336649"
+
+        with StubServer() as server:
+            self.client_class = type("StubClient", (juejin.JuejinClient,), {"BASE_URL": server.url})
+            transport = RecordingTransport(self.path)
+            client = self.client_class(cookie="", auth_config=self.auth_config, transport=transport)
+            self.recorded = self._calls(client)
+            transport.close()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _calls(self, client):
+        return (
+            client.describe_article_detail(self.detail_req).to_json(),
+            client.describe_article_list(DescribeArticleListRequest()),
+            list(client.stream_article_draft_list(DescribeArticleListRequest())),
+            client.describe_user_counts(),
+            client.create_user_sign_in(),
+        )
+
+    def _replay_client(self, transport=None):
+        return self.client_class(cookie="", auth_config=self.auth_config,
+                                 transport=transport or ReplayTransport(self.path))
+
+    def test_replay_returns_recorded_responses(self):
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+        # Fresh signing parameters must not change the keys
+        self.auth_config.a_bogus = "replayed"
+        self.assertEqual(self._calls(self._replay_client()), self.recorded)
+
+    def test_missing_exchange_is_a_network_error(self):
+        client = self._replay_client()
+        req = DescribeArticleDetailRequest()
+        req.article_id = "1"
+        with self.assertRaises(JuejinAPIError) as ctx:
+            client.describe_article_detail(req)
+        self.assertEqual(ctx.exception.code, -2)
+
+    def test_stale_index_is_rebuilt(self):
+        with open(self.path + ".idx", "wb") as f:
+            f.write(b"{}")
+        cassette = Cassette(self.path)
+        self.assertEqual(sum(len(offsets) for offsets in cassette.index.values()), len(self.recorded))
+        self.assertEqual(self._calls(self._replay_client(ReplayTransport(cassette))), self.recorded)
+
+
+if __name__ == '__main__':
+    unittest.main()
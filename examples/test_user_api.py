@@ -4,6 +4,7 @@ from unittest.mock import MagicMock
 
 import juejin
 from juejin.client import AuthConfig
+from juejin.transport import transport_from_env
 
 
 class TestUserClient(unittest.TestCase):
@@ -15,7 +16,7 @@ class TestUserClient(unittest.TestCase):
         auth_config.aid = '2608'
         auth_config.uuid = '7491181683644925450'
         cookie = ''
-        self.client = juejin.JuejinClient(auth_config=auth_config, cookie=cookie)
+        self.client = juejin.JuejinClient(auth_config=auth_config, cookie=cookie, transport=transport_from_env())
 
         self.mock_response = MagicMock()
         self.mock_response.json.return_value = {
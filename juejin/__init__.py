@@ -1,4 +1,43 @@
-from .client import JuejinClient
+"""
+Juejin API SDK.
+
+The clients are imported on first access (PEP 562), so ``import juejin`` costs
+almost nothing, ``juejin.JuejinClient`` loads requests but not aiohttp, and
+``juejin.AsyncJuejinClient`` loads aiohttp but only when it is used. Submodules
+such as ``juejin.codec`` resolve the same way.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
 __version__ = "0.1.0"
-__all__ = ["JuejinClient"]
+__all__ = ["JuejinClient", "AsyncJuejinClient", "AuthConfig", "RequestConfig"]
+
+# Public name -> module defining it
+_LAZY = {
+    "JuejinClient": "juejin.client",
+    "AuthConfig": "juejin.client",
+    "RequestConfig": "juejin.client",
+    "AsyncJuejinClient": "juejin.async_client",
+}
+
+if TYPE_CHECKING:
+    from .async_client import AsyncJuejinClient
+    from .client import AuthConfig, JuejinClient, RequestConfig
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(module), name)
+        globals()[name] = value
+        return value
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
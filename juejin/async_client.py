@@ -0,0 +1,723 @@
+import asyncio
+import logging
+import zlib
+from functools import partial
+from typing import TYPE_CHECKING, Optional, Dict, Any, Union, AsyncIterator, Iterable, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from juejin import codec, compression
+from juejin.ratelimit import RateLimiter
+from juejin.breaker import CircuitBreaker
+from juejin.retry import GIVE_UP, PROBE, RETRY, RetryPolicy
+from juejin.endpoints import get_endpoint
+from juejin.singleflight import AsyncSingleFlight
+from juejin.metrics import Instrumentation, RequestEvent
+from juejin.cache import ResponseCache
+from juejin.client import AuthConfig, BaseJuejinClient, RequestConfig
+from juejin.batch import BatchResult, arun_batch
+from juejin.const import DRAFT_ID, ARTICLE_ID
+from juejin.error import JuejinAPIError
+from juejin.projection import Projection
+from juejin.streaming import AsyncItemStream, JSONArrayParser
+from juejin.pagination import aiter_pages
+from juejin.models import BaseModule, ArticleRequest, UpdateArticleRequest, DescribeArticleDetailRequest, \
+    DescribeArticleListRequest, DescribeArticleDetailResponse
+
+if TYPE_CHECKING:
+    from juejin.disk_cache import DiskCache
+    from juejin.fingerprint import DraftUpdate, FingerprintStore
+    from juejin.search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+def _connect_failed(error: Exception) -> bool:
+    """Whether a request failed before a connection was made, so the server never saw it"""
+    connection_timeout = getattr(aiohttp, "ConnectionTimeoutError", ())
+    return isinstance(error, (aiohttp.ClientConnectorError, connection_timeout))
+
+
+class AsyncJuejinClient(BaseJuejinClient):
+    """Asyncio Juejin API client
+
+    One client keeps a pooled aiohttp connector, so a single event loop can keep
+    up to ``RequestConfig.max_connections`` requests in flight. Use it as an async
+    context manager or call :meth:`close` when done.
+    """
+
+    def __init__(self, cookie: str, auth_config: Optional[AuthConfig] = None,
+                 config: Optional[RequestConfig] = None, cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None,
+                 single_flight: Optional[AsyncSingleFlight] = None, instrumentation: Optional[Instrumentation] = None,
+                 search_index: Optional["SearchIndex"] = None, disk_cache: Optional["DiskCache"] = None,
+                 fingerprints: Optional["FingerprintStore"] = None, circuit_breaker: Optional[CircuitBreaker] = None):
+        """
+        Initialize the async Juejin client
+
+        Parameters:
+            cookie: Juejin authentication cookie
+            auth_config: Authentication parameters, required for sign-in
+            config: Request configuration
+            cache: Optional response cache for read endpoints, may be shared with sync clients
+            rate_limiter: Optional client-side rate limiter, may be shared with sync clients
+            retry_policy: Retry policy, built from config by default
+            single_flight: Optional group coalescing identical concurrent calls of read endpoints
+            instrumentation: Optional request hooks, e.g. a juejin.metrics.MetricsCollector
+            search_index: Optional local full-text index kept current with fetched and updated content
+            disk_cache: Optional persistent cache of read responses, may be shared with sync clients
+            fingerprints: Optional store of the drafts' last updates, letting unchanged updates be skipped
+            circuit_breaker: Optional circuit breaker failing calls fast during outages, may be shared with sync clients
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncJuejinClient requires aiohttp, "
+                              "install it with `pip install occrq-juejin-python-sdk[async]`")
+        self._config = config if config is not None else RequestConfig()
+        self._cookie = cookie
+        self.auth_config = auth_config if auth_config is not None else AuthConfig()
+        self._headers = self._default_headers(cookie)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy.from_config(self._config)
+        self.single_flight = single_flight
+        self.instrumentation = instrumentation
+        self.search_index = search_index
+        self.disk_cache = disk_cache
+        self.fingerprints = fingerprints
+        self.circuit_breaker = circuit_breaker
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def __aenter__(self) -> "AsyncJuejinClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """The pooled HTTP session, created lazily inside the running event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._config.max_connections)
+            # Bodies are decoded by _read_body, which counts their size on the wire
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self._config.timeout),
+                auto_decompress=False,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _send(self, method: str, endpoint: str, url: str, req: Any,
+                    event: Optional[RequestEvent] = None, **kwargs) -> "aiohttp.ClientResponse":
+        """
+        Send a request, retrying the failures the retry policy allows for the endpoint.
+
+        req is the unserialized request data handed to the endpoint's probe. Returns the
+        last response with its body unread, whose status the caller still has to check.
+        """
+        spec = get_endpoint(endpoint, method)
+        body, headers = kwargs.get("data"), kwargs.get("headers")
+        kwargs["data"], kwargs["headers"] = self._compress_request(endpoint, body, headers)
+        attempt = 0
+        while True:
+            attempt += 1
+            if event is not None:
+                event.attempts = attempt
+                if body is not None:
+                    event.bytes_sent += len(body)
+                    event.wire_bytes_sent += len(kwargs["data"])
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.acquire(endpoint, self._cookie)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint)
+
+            error = response = status = retry_after = None
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+                sent = not _connect_failed(e)
+            finally:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record(endpoint, self._cookie,
+                                                response.status if response is not None else None)
+            if error is None:
+                if self.rate_limiter is not None and response.status >= 400:
+                    # Failed attempts are fed back here once each, successes once their err_no is read
+                    self.rate_limiter.record(endpoint, status=response.status)
+                if response.status == 415 and kwargs["data"] is not body:
+                    # Rejected before processing, resending the plain body is safe even for mutations
+                    response.release()
+                    self._reject_compression(endpoint)
+                    kwargs["data"], kwargs["headers"] = body, headers
+                    continue
+                if not self.retry_policy.retryable_status(response.status):
+                    return response
+                status = response.status
+                retry_after = self.retry_policy.parse_retry_after(response.headers.get("Retry-After"))
+                sent = True
+
+            decision = self._retry_decision(spec, attempt, sent, status)
+            if decision == PROBE:
+                # The probe reads the entity, which must not come from the cache
+                if self.cache is not None or self.disk_cache is not None:
+                    self._cache_invalidate(endpoint, req)
+                decision = RETRY if await spec.probe(self, req) else GIVE_UP
+            if decision == GIVE_UP:
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.release()
+            await asyncio.sleep(self.retry_policy.backoff(attempt, retry_after))
+
+    async def _read_body(self, response: "aiohttp.ClientResponse") -> Tuple[bytes, int]:
+        """Decoded body of a response and its size on the wire, decompressed as it arrives"""
+        decoder = compression.decoder(response.headers.get("Content-Encoding"))
+        chunks = []
+        wire_bytes = 0
+        async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+            wire_bytes += len(chunk)
+            chunks.append(decoder.decompress(chunk))
+        chunks.append(decoder.flush())
+        return b"".join(chunks), wire_bytes
+
+    async def request(
+            self,
+            method: str,
+            endpoint: str,
+            params: Optional[Dict[str, Any]] = None,
+            data: Optional[Union[Dict[str, Any], BaseModule]] = None,
+            headers: Optional[Dict[str, str]] = None,
+            extra_auth: bool = False,
+            raw: bool = False,
+            projection: Optional[Projection] = None
+    ) -> Dict[str, Any]:
+        event = self._start_event(method, endpoint) if self.instrumentation is not None else None
+        try:
+            # Prepare request parameters
+            url, request_data, headers, params = self._prepare_request(
+                method, endpoint, params, data, headers, extra_auth
+            )
+
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self._cache_key(method, endpoint, request_data, params, raw, projection)
+                if cache_key is not None:
+                    hit, value = self.cache.get(cache_key)
+                    if hit:
+                        logger.debug(f"Cache hit: {method} {url}")
+                        if event is not None:
+                            event.cached = True
+                        return value
+
+            disk_key = None
+            if self.disk_cache is not None:
+                disk_key = self._disk_key(method, endpoint, request_data, params)
+
+            fetch = partial(self._fetch, method, endpoint, url, params, data, request_data, headers, raw,
+                            projection, cache_key, event, disk_key)
+            if self._coalesce(method, endpoint):
+                key = self._request_key(method, endpoint, request_data, params, raw, projection)
+                return await self.single_flight.do(key, fetch)
+            return await fetch()
+
+        except JuejinAPIError as e:
+            if event is not None:
+                event.error_code = e.code
+            raise
+        except Exception as e:
+            logger.error(f"Unknown error: {str(e)}", exc_info=True)
+            if event is not None:
+                event.error_code = -3
+            raise JuejinAPIError(f"Unknown error: {str(e)}", -3)
+        finally:
+            if self.cache is not None or self.disk_cache is not None:
+                self._cache_invalidate(endpoint, data)
+            if event is not None:
+                self._end_event(event)
+
+    async def _fetch(self, method: str, endpoint: str, url: str, params, data, request_data: Optional[bytes],
+                     headers: Dict[str, str], raw: bool, projection: Optional[Projection], cache_key,
+                     event: Optional[RequestEvent] = None, disk_key: Optional[str] = None) -> Dict[str, Any]:
+        """Send a prepared request and parse its response, raising JuejinAPIError on failure"""
+        try:
+            entry = self._disk_get(disk_key) if disk_key is not None else None
+            validators = None
+            if entry is not None:
+                if entry.fresh:
+                    logger.debug(f"Disk cache hit: {method} {url}")
+                    if event is not None:
+                        event.cached = True
+                    result = self._parse_body(entry.body, raw, projection)
+                    if cache_key is not None:
+                        self._cache_store(cache_key, endpoint, data, result)
+                    return result
+                validators = entry.validators()
+                if validators:
+                    headers = dict(headers, **validators)
+
+            logger.debug(f"Sending request: {method} {url}")
+
+            response = await self._send(method, endpoint, url, data, params=params, data=request_data,
+                                        headers=headers, event=event)
+            if event is not None:
+                event.status = response.status
+            async with response:
+                if validators and response.status == 304:
+                    # Unchanged since it was stored
+                    self._disk_refresh(disk_key, response.headers)
+                    body = None
+                else:
+                    response.raise_for_status()
+                    body, wire_bytes = await self._read_body(response)
+                    if event is not None:
+                        event.bytes_received = len(body)
+                        event.wire_bytes_received = wire_bytes
+
+            # Parse the response
+            if body is None:
+                result = self._parse_body(entry.body, raw, projection)
+            else:
+                result = self._parse_body(body, raw, projection)
+                if disk_key is not None:
+                    self._disk_store(disk_key, endpoint, data, body, response.headers, result)
+            if cache_key is not None:
+                self._cache_store(cache_key, endpoint, data, result)
+            if self.search_index is not None:
+                self._search_observe(endpoint, data, result)
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=0)
+            return result
+
+        except JuejinAPIError as e:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=e.code)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, zlib.error) as e:
+            logger.error(f"Network request failed: {str(e)}")
+            raise JuejinAPIError(f"Network request failed: {str(e)}", -2)
+
+    def request_stream(
+            self,
+            method: str,
+            endpoint: str,
+            params: Optional[Dict[str, Any]] = None,
+            data: Optional[Union[Dict[str, Any], BaseModule]] = None,
+            headers: Optional[Dict[str, str]] = None,
+            extra_auth: bool = False,
+            key: str = "data",
+            projection: Optional[Projection] = None
+    ) -> AsyncItemStream:
+        """Send a request and stream the items of the array under ``key``, see JuejinClient.request_stream"""
+        parser = JSONArrayParser(key)
+        items = self._stream_items(parser, method, endpoint, params, data, headers, extra_auth, projection)
+        return AsyncItemStream(items, parser)
+
+    async def _stream_items(self, parser: JSONArrayParser, method: str, endpoint: str, params, data, headers,
+                            extra_auth: bool, projection: Optional[Projection]) -> AsyncIterator[Any]:
+        event = self._start_event(method, endpoint) if self.instrumentation is not None else None
+        items = self._stream_response(parser, method, endpoint, params, data, headers, extra_auth, projection, event)
+        try:
+            async for item in items:
+                yield item
+        except JuejinAPIError as e:
+            if event is not None:
+                event.error_code = e.code
+            raise
+        finally:
+            # Releases the connection when the caller stops early
+            await items.aclose()
+            if event is not None:
+                self._end_event(event)
+
+    async def _stream_response(self, parser: JSONArrayParser, method: str, endpoint: str, params, data, headers,
+                               extra_auth: bool, projection: Optional[Projection],
+                               event: Optional[RequestEvent] = None) -> AsyncIterator[Any]:
+        """Send a request and parse its response as it arrives, raising JuejinAPIError on failure"""
+        try:
+            url, request_data, headers, params = self._prepare_request(
+                method, endpoint, params, data, headers, extra_auth
+            )
+
+            logger.debug(f"Streaming request: {method} {url}")
+
+            response = await self._send(method, endpoint, url, data, params=params, data=request_data,
+                                        headers=headers, event=event)
+            async with response:
+                if event is not None:
+                    event.status = response.status
+                response.raise_for_status()
+                decoder = compression.decoder(response.headers.get("Content-Encoding"))
+                async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                    body = decoder.decompress(chunk)
+                    if event is not None:
+                        event.wire_bytes_received += len(chunk)
+                        event.bytes_received += len(body)
+                    items = parser.feed(body)
+                    self._check_stream(parser)
+                    for item in items:
+                        yield item if projection is None else projection.apply(item)
+                body = decoder.flush()
+                if event is not None:
+                    event.bytes_received += len(body)
+                items = parser.feed(body) + parser.close()
+                self._check_stream(parser, final=True)
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=0)
+            for item in items:
+                yield item if projection is None else projection.apply(item)
+
+        except JuejinAPIError as e:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=e.code)
+            raise
+        except codec.DecodeError as e:
+            logger.error(f"JSON parsing failed: {e}")
+            raise JuejinAPIError(f"JSON parsing failed: {str(e)}", -1)
+        except (aiohttp.ClientError, asyncio.TimeoutError, zlib.error) as e:
+            logger.error(f"Network request failed: {str(e)}")
+            raise JuejinAPIError(f"Network request failed: {str(e)}", -2)
+        except Exception as e:
+            logger.error(f"Unknown error: {str(e)}", exc_info=True)
+            raise JuejinAPIError(f"Unknown error: {str(e)}", -3)
+
+    async def create_article_draft(self, req: ArticleRequest) -> Dict[str, Any]:
+        """
+        Create a new article draft.
+
+        Args:
+            req (ArticleRequest): Request object containing article draft details.
+
+        Returns:
+            Dict[str, Any]: API response.
+        """
+        return await self.request("POST", "/content_api/v1/article_draft/create", data=req)
+
+    async def update_article_draft(self, req: UpdateArticleRequest) -> Dict[str, Any]:
+        """
+        Update an existing article draft.
+
+        Args:
+            req (UpdateArticleRequest): Request object containing updated article draft details.
+
+        Returns:
+            Dict[str, Any]: API response.
+        """
+        result = await self.request("POST", "/content_api/v1/article_draft/update", data=req)
+        if self.fingerprints is not None:
+            self._fingerprint_record(req)
+        return result
+
+    async def update_article_draft_if_changed(self, req: UpdateArticleRequest) -> "DraftUpdate":
+        """
+        Update an article draft unless it equals the last update sent, see juejin.fingerprint.
+
+        Args:
+            req (UpdateArticleRequest): Request object containing updated article draft details.
+
+        Returns:
+            DraftUpdate: The fields that changed and the API response, or skipped when no
+            field changed. Without a fingerprint store every update is sent.
+        """
+        from juejin.fingerprint import DraftUpdate
+
+        digests, changed = self._draft_changes(req)
+        if not changed:
+            logger.debug(f"Draft {req.id} is unchanged, skipping its update")
+            return DraftUpdate(str(req.id), changed)
+        result = await self.request("POST", "/content_api/v1/article_draft/update", data=req)
+        if self.fingerprints is not None:
+            self._fingerprint_record(req, digests)
+        return DraftUpdate(str(req.id), changed, result)
+
+    async def describe_article_draft_detail(self, draft_id: str) -> Dict[str, Any]:
+        """
+        Get details of an article draft.
+
+        Args:
+            draft_id (str): ID of the article draft.
+
+        Returns:
+            Dict[str, Any]: API response containing draft details.
+        """
+        return await self.request("POST", "/content_api/v1/article_draft/detail", data={DRAFT_ID: draft_id})
+
+    async def describe_article_detail(self, req: DescribeArticleDetailRequest, fields: Optional[Iterable[str]] = None,
+                                      exclude: Optional[Iterable[str]] = None) -> DescribeArticleDetailResponse:
+        """
+        Get details of an article.
+
+        Args:
+            req (DescribeArticleDetailRequest): Request object containing article ID.
+            fields (Iterable[str]): Dotted paths to keep, e.g. "article_info.title". Defaults to all.
+            exclude (Iterable[str]): Dotted paths to drop while parsing, e.g. HEAVY_CONTENT_FIELDS.
+
+        Returns:
+            DescribeArticleDetailResponse: Article details.
+        """
+        data = await self.request("POST", "/content_api/v1/article/detail", data=req,
+                                  projection=Projection.of(fields, exclude))
+        return DescribeArticleDetailResponse(data)
+
+    def describe_article_details(self, ids: Iterable[str], max_workers: int = 8, ordered: bool = True,
+                                 fields: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) \
+            -> AsyncIterator[BatchResult]:
+        """
+        Get details of many articles concurrently.
+
+        Args:
+            ids (Iterable[str]): Article IDs, consumed lazily.
+            max_workers (int): Maximum number of requests in flight.
+            ordered (bool): Yield results in input order, otherwise as they complete.
+            fields (Iterable[str]): Dotted paths to keep, see describe_article_detail.
+            exclude (Iterable[str]): Dotted paths to drop, see describe_article_detail.
+
+        Returns:
+            AsyncIterator[BatchResult]: One result per ID with the DescribeArticleDetailResponse as value,
+            or the JuejinAPIError of that ID as error.
+        """
+        return arun_batch(partial(self._describe_article_detail_by_id, fields=fields, exclude=exclude),
+                          ids, max_workers, ordered)
+
+    async def _describe_article_detail_by_id(self, article_id: str, fields: Optional[Iterable[str]] = None,
+                                             exclude: Optional[Iterable[str]] = None) -> DescribeArticleDetailResponse:
+        req = DescribeArticleDetailRequest()
+        req.article_id = article_id
+        return await self.describe_article_detail(req, fields, exclude)
+
+    async def delete_article_draft(self, draft_id: str) -> Dict[str, Any]:
+        """
+        Delete an article draft.
+
+        Args:
+            draft_id (str): ID of the article draft to delete.
+
+        Returns:
+            Dict[str, Any]: API response indicating the result of the delete operation.
+        """
+        result = await self.request("POST", "/content_api/v1/article_draft/delete", data={DRAFT_ID: draft_id})
+        if self.fingerprints is not None:
+            self._fingerprint_forget(draft_id)
+        return result
+
+    async def delete_article(self, article_id: str) -> Dict[str, Any]:
+        """
+        Delete an article.
+
+        Args:
+            article_id (str): ID of the article to delete.
+
+        Returns:
+            Dict[str, Any]: API response indicating the result of the delete operation.
+        """
+        return await self.request("POST", "/content_api/v1/article/delete", data={ARTICLE_ID: article_id})
+
+    async def publish_article_draft(self, draft_id: str) -> Dict[str, Any]:
+        """
+        Publish an article draft.
+
+        Args:
+            draft_id (str): ID of the article draft to publish.
+
+        Returns:
+            Dict[str, Any]: API response indicating the result of the publish operation.
+        """
+        return await self.request("POST", "/content_api/v1/article/publish", data={DRAFT_ID: draft_id})
+
+    async def describe_article_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                                    exclude: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Get a list of articles.
+
+        Args:
+            req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item, e.g. "article_info.title".
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
+
+        Returns:
+            Dict[str, Any]: API response containing a list of articles.
+        """
+        return await self.request("POST", "/content_api/v1/article/list_by_user", data=req,
+                                  projection=Projection.of(fields, exclude))
+
+    async def describe_article_draft_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                                          exclude: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Get a list of article drafts.
+
+        Args:
+            req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item, e.g. "article_info.title".
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
+
+        Returns:
+            Dict[str, Any]: API response containing a list of article drafts.
+        """
+        return await self.request("POST", "/content_api/v1/article_draft/list_by_user", data=req,
+                                  projection=Projection.of(fields, exclude))
+
+    def stream_article_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                            exclude: Optional[Iterable[str]] = None) -> AsyncItemStream:
+        """
+        Get one page of articles, parsing the response incrementally.
+
+        Args:
+            req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item.
+
+        Returns:
+            AsyncItemStream: Items yielded one at a time as they are parsed, has_more/cursor are
+            available on it once exhausted.
+        """
+        return self.request_stream("POST", "/content_api/v1/article/list_by_user", data=req,
+                                   projection=Projection.of(fields, exclude))
+
+    def stream_article_draft_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                                  exclude: Optional[Iterable[str]] = None) -> AsyncItemStream:
+        """
+        Get one page of article drafts, parsing the response incrementally.
+
+        Args:
+            req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item.
+
+        Returns:
+            AsyncItemStream: Items yielded one at a time as they are parsed, has_more/cursor are
+            available on it once exhausted.
+        """
+        return self.request_stream("POST", "/content_api/v1/article_draft/list_by_user", data=req,
+                                   projection=Projection.of(fields, exclude))
+
+    def iter_articles(self, req: Optional[DescribeArticleListRequest] = None, prefetch: int = 2,
+                      fields: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) \
+            -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all articles, following pagination until the server reports no more pages.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the first page, defaults to page 1.
+            prefetch (int): Number of pages fetched in the background ahead of the caller.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Article items, yielded lazily.
+        """
+        fetch = partial(self.fetch_article_page, projection=Projection.of(fields, exclude))
+        return aiter_pages(fetch, req or DescribeArticleListRequest(), prefetch)
+
+    def iter_drafts(self, req: Optional[DescribeArticleListRequest] = None, prefetch: int = 2,
+                    fields: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) \
+            -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all article drafts, following pagination until the server reports no more pages.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the first page, defaults to page 1.
+            prefetch (int): Number of pages fetched in the background ahead of the caller.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Draft items, yielded lazily.
+        """
+        fetch = partial(self.fetch_draft_page, projection=Projection.of(fields, exclude))
+        return aiter_pages(fetch, req or DescribeArticleListRequest(), prefetch)
+
+    async def fetch_article_page(self, req: DescribeArticleListRequest, projection: Optional[Projection] = None) \
+            -> Dict[str, Any]:
+        """
+        Get one page of the user's articles as the full response body, the page
+        fetch behind iter_articles.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the page to fetch.
+            projection (Projection): Fields to keep in or drop from each item while parsing.
+
+        Returns:
+            Dict[str, Any]: Response body with the items under ``data`` and the ``has_more``, ``cursor``
+            and ``count`` pagination fields.
+        """
+        return await self.request("POST", "/content_api/v1/article/list_by_user", data=req,
+                                  raw=True, projection=projection)
+
+    async def fetch_draft_page(self, req: DescribeArticleListRequest, projection: Optional[Projection] = None) \
+            -> Dict[str, Any]:
+        """
+        Get one page of the user's article drafts as the full response body, the page
+        fetch behind iter_drafts.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the page to fetch.
+            projection (Projection): Fields to keep in or drop from each item while parsing.
+
+        Returns:
+            Dict[str, Any]: Response body with the items under ``data`` and the ``has_more``, ``cursor``
+            and ``count`` pagination fields.
+        """
+        return await self.request("POST", "/content_api/v1/article_draft/list_by_user", data=req,
+                                  raw=True, projection=projection)
+
+    async def describe_user_counts(self) -> Dict[str, Any]:
+        """Get user sign-in information"""
+        return await self.request("GET", "/growth_api/v1/get_counts")
+
+    async def describe_user_today_status(self) -> Dict[str, Any]:
+        """Get today's sign-in status"""
+        return await self.request("GET", "/growth_api/v2/get_today_status")
+
+    async def describe_user_info_package(
+            self,
+            user: bool = True,
+            user_counter: bool = True,
+            user_growth_info: bool = True
+    ) -> Dict[str, Any]:
+        """获取用户信息包
+
+        参数:
+            user: 是否包含用户基本信息
+            user_counter: 是否包含用户计数信息
+            user_growth_info: 是否包含用户成长信息
+
+        返回:
+            包含请求信息的字典
+        """
+        data = {
+            "pack_req": {
+                "user": user,
+                "user_counter": user_counter,
+                "user_growth_info": user_growth_info,
+            }
+        }
+        return await self.request("POST", "/user_api/v1/user/get_info_pack", data=data)
+
+    async def describe_user_rank_info(self, fro: int = 1, item_rank_type: int = 3, item_sub_rank_type: str = "0") \
+            -> Dict[str, Any]:
+        """获取用户排行榜信息"""
+        data = {
+            "from": fro,
+            "item_rank_type": item_rank_type,
+            "item_sub_rank_type": item_sub_rank_type,
+        }
+        return await self.request("POST", "/user_api/v1/quality_user/rank", data=data)
+
+    async def create_user_sign_in(self) -> Dict[str, Any]:
+        """签到"""
+        data = ''
+        return await self.request("POST", "/growth_api/v1/check_in", data=data, extra_auth=True)
+
+    async def describe_user_dynamic(self) -> Dict[str, Any]:
+        """获取动态"""
+        return await self.request("GET", "/user_api/v1/user/dynamic")
@@ -0,0 +1,127 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional
+
+from juejin.error import JuejinAPIError
+
+_END = object()
+
+
+class BatchResult:
+    """Outcome of one item of a batch call"""
+
+    def __init__(self, key: Any, value: Any = None, error: Optional[JuejinAPIError] = None):
+        """
+        Parameters:
+            key: The input the call was made for, e.g. an article ID
+            value: Call result, None when the call failed
+            error: The JuejinAPIError raised by the call, None on success
+        """
+        self.key = key
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"BatchResult(key={self.key!r}, value={self.value!r})"
+        return f"BatchResult(key={self.key!r}, error={self.error!r})"
+
+
+def _call(fn: Callable[[Any], Any], key: Any) -> BatchResult:
+    try:
+        return BatchResult(key, fn(key))
+    except JuejinAPIError as e:
+        return BatchResult(key, error=e)
+
+
+def run_batch(fn: Callable[[Any], Any], keys: Iterable[Any], max_workers: int = 8,
+              ordered: bool = True) -> Iterator[BatchResult]:
+    """
+    Call ``fn`` for every key on a bounded thread pool.
+
+    Args:
+        fn: Function called with one key.
+        keys: Inputs, consumed lazily so arbitrarily long iterables are fine.
+        max_workers: Number of concurrent calls.
+        ordered: Yield results in input order, otherwise as they complete.
+
+    Returns:
+        Iterator[BatchResult]: One result per key. A JuejinAPIError is reported on
+        its BatchResult and does not abort the batch.
+    """
+    keys = iter(keys)
+    # Bound the submitted-but-unconsumed work so memory does not grow with the input
+    window = max_workers * 2
+    pending = deque() if ordered else set()
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="juejin-batch")
+    try:
+        if ordered:
+            for key in keys:
+                pending.append(pool.submit(_call, fn, key))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+            return
+
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                key = next(keys, _END)
+                if key is _END:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(_call, fn, key))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # Drop queued calls when the caller stops iterating early
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+async def arun_batch(fn: Callable[[Any], Awaitable[Any]], keys: Iterable[Any], max_workers: int = 8,
+                     ordered: bool = True) -> AsyncIterator[BatchResult]:
+    """Asyncio counterpart of :func:`run_batch`, running at most ``max_workers`` coroutines at once"""
+
+    async def call(key: Any) -> BatchResult:
+        try:
+            return BatchResult(key, await fn(key))
+        except JuejinAPIError as e:
+            return BatchResult(key, error=e)
+
+    import asyncio  # only async callers pay for importing asyncio
+
+    keys = iter(keys)
+    pending = deque() if ordered else set()
+    try:
+        while True:
+            while len(pending) < max_workers:
+                key = next(keys, _END)
+                if key is _END:
+                    break
+                task = asyncio.ensure_future(call(key))
+                if ordered:
+                    pending.append(task)
+                else:
+                    pending.add(task)
+            if not pending:
+                return
+            if ordered:
+                yield await pending.popleft()
+            else:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
@@ -0,0 +1,199 @@
+"""
+Circuit breaker failing fast while the API is down.
+
+Without one, every call during an outage waits out the timeout once per attempt
+before it fails. A CircuitBreaker watches the outcome of every HTTP attempt per
+endpoint, and optionally per account. Once at least ``min_calls`` of the last
+``window`` attempts were made and ``failure_rate`` of them failed (no response,
+or a status of ``failure_statuses``), the circuit opens: calls fail at once with
+a JuejinAPIError of code CIRCUIT_OPEN (-4) instead of being sent. After
+``open_for`` seconds it turns half-open and lets ``half_open_probes`` calls
+through. If they all succeed it closes again; a failing probe opens it for
+another ``open_for`` seconds.
+
+API errors (a non-zero err_no) come with a response and count as successes, as do
+4xx statuses: the service answered.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from juejin.error import JuejinAPIError
+
+logger = logging.getLogger(__name__)
+
+# Error code of calls rejected by an open circuit
+CIRCUIT_OPEN = -4
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# hook(endpoint, account, old_state, new_state), account is None unless per_account
+TransitionHook = Callable[[str, Optional[str], str, str], None]
+
+
+@lru_cache(maxsize=1024)
+def account_id(cookie: str) -> str:
+    """Short stable ID of an account, so circuits and hooks never see the cookie"""
+    return hashlib.sha256(cookie.encode("utf-8")).hexdigest()[:12]
+
+
+class Circuit:
+    """State of one circuit, guarded by the breaker's lock"""
+
+    __slots__ = ("state", "outcomes", "failures", "opened_at", "probes", "probe_successes")
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        # True for every failed attempt of the window
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitBreaker:
+    """Circuits per endpoint, or per endpoint and account, thread-safe and usable from asyncio"""
+
+    def __init__(self, failure_rate: float = 0.5, min_calls: int = 10, window: int = 20,
+                 open_for: float = 30.0, half_open_probes: int = 1, per_account: bool = False,
+                 failure_statuses: Iterable[int] = (500, 502, 503, 504),
+                 hooks: Iterable[TransitionHook] = ()):
+        """
+        Parameters:
+            failure_rate: Share of failed attempts in the window that opens the circuit
+            min_calls: Attempts the window must hold before the circuit may open
+            window: Number of most recent attempts considered
+            open_for: Seconds an open circuit rejects calls before letting probes through
+            half_open_probes: Calls let through at once when half-open, all must succeed to close
+            per_account: Keep separate circuits for the accounts of the clients sharing the breaker
+            failure_statuses: HTTP statuses counting as failures besides getting no response
+            hooks: Functions called on every state change, see add_hook
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_for = open_for
+        self.half_open_probes = half_open_probes
+        self.per_account = per_account
+        self.failure_statuses = frozenset(failure_statuses)
+        self.rejected = 0
+        self._hooks: List[TransitionHook] = list(hooks)
+        self._circuits: Dict[Tuple[str, Optional[str]], Circuit] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: TransitionHook) -> None:
+        """Call hook(endpoint, account, old_state, new_state) on every state change"""
+        self._hooks.append(hook)
+
+    def _key(self, endpoint: str, cookie: Optional[str]) -> Tuple[str, Optional[str]]:
+        if self.per_account and cookie is not None:
+            return endpoint, account_id(cookie)
+        return endpoint, None
+
+    def _circuit(self, key: Tuple[str, Optional[str]]) -> Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit(self.window)
+        return circuit
+
+    def _transition(self, circuit: Circuit, state: str, now: float, changes: list, key) -> None:
+        changes.append((key, circuit.state, state))
+        circuit.state = state
+        circuit.probes = circuit.probe_successes = 0
+        if state == OPEN:
+            circuit.opened_at = now
+        elif state == CLOSED:
+            circuit.outcomes.clear()
+            circuit.failures = 0
+
+    def _notify(self, changes: list) -> None:
+        for (endpoint, account), old, new in changes:
+            log = logger.warning if new == OPEN else logger.info
+            log(f"Circuit of {endpoint}{f' for account {account}' if account else ''} went from {old} to {new}")
+            for hook in self._hooks:
+                try:
+                    hook(endpoint, account, old, new)
+                except Exception as e:
+                    logger.warning(f"Circuit breaker hook failed: {str(e)}")
+
+    def acquire(self, endpoint: str, cookie: Optional[str] = None) -> None:
+        """
+        Let an attempt through or reject it.
+
+        Every attempt let through must be followed by record(). Raises JuejinAPIError
+        with code CIRCUIT_OPEN if the circuit is open, or half-open with all its probes out.
+        """
+        key = self._key(endpoint, cookie)
+        now = time.monotonic()
+        changes: list = []
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == OPEN and now - circuit.opened_at >= self.open_for:
+                self._transition(circuit, HALF_OPEN, now, changes, key)
+            if circuit.state == CLOSED:
+                allowed = True
+            elif circuit.state == HALF_OPEN and circuit.probes < self.half_open_probes:
+                circuit.probes += 1
+                allowed = True
+            else:
+                allowed = False
+                self.rejected += 1
+                retry_in = max(0.0, circuit.opened_at + self.open_for - now)
+        self._notify(changes)
+        if not allowed:
+            raise JuejinAPIError(f"Circuit open for {endpoint}, next probe in {retry_in:.1f}s", CIRCUIT_OPEN)
+
+    def record(self, endpoint: str, cookie: Optional[str] = None, status: Optional[int] = None) -> None:
+        """Feed back the outcome of an attempt, status None if no response came"""
+        failed = status is None or status in self.failure_statuses
+        key = self._key(endpoint, cookie)
+        now = time.monotonic()
+        changes: list = []
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == HALF_OPEN:
+                if failed:
+                    self._transition(circuit, OPEN, now, changes, key)
+                else:
+                    circuit.probe_successes += 1
+                    if circuit.probe_successes >= self.half_open_probes:
+                        self._transition(circuit, CLOSED, now, changes, key)
+            elif circuit.state == CLOSED:
+                if len(circuit.outcomes) == circuit.outcomes.maxlen and circuit.outcomes[0]:
+                    circuit.failures -= 1
+                circuit.outcomes.append(failed)
+                circuit.failures += failed
+                if (failed and len(circuit.outcomes) >= self.min_calls
+                        and circuit.failures >= self.failure_rate * len(circuit.outcomes)):
+                    self._transition(circuit, OPEN, now, changes, key)
+            # Attempts let through before the circuit opened change nothing
+        self._notify(changes)
+
+    def state(self, endpoint: str, cookie: Optional[str] = None) -> str:
+        """State of the circuit of an endpoint (and account), an open one past open_for reads half-open"""
+        key = self._key(endpoint, cookie)
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and time.monotonic() - circuit.opened_at >= self.open_for:
+                return HALF_OPEN
+            return circuit.state
+
+    def snapshot(self) -> Dict[Tuple[str, Optional[str]], Dict]:
+        """State, attempts and failures in the window of every circuit by (endpoint, account)"""
+        with self._lock:
+            return {key: {"state": c.state, "calls": len(c.outcomes), "failures": c.failures}
+                    for key, c in self._circuits.items()}
+
+    def reset(self) -> None:
+        """Close every circuit"""
+        with self._lock:
+            self._circuits.clear()
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from juejin.const import ARTICLE_ID, DRAFT_ID
+
+# Read endpoints cached by default and their time to live in seconds
+DEFAULT_ENDPOINT_TTLS = {
+    "/content_api/v1/article/detail": 60.0,
+    "/content_api/v1/article_draft/detail": 60.0,
+    "/user_api/v1/quality_user/rank": 300.0,
+    "/growth_api/v1/get_counts": 30.0,
+    "/user_api/v1/user/get_info_pack": 60.0,
+}
+
+# Mutation endpoints and the request field naming the entity they change
+MUTATION_ENTITIES = {
+    "/content_api/v1/article_draft/update": ("draft", "id"),
+    "/content_api/v1/article_draft/delete": ("draft", DRAFT_ID),
+    "/content_api/v1/article/publish": ("draft", DRAFT_ID),
+    "/content_api/v1/article/delete": ("article", ARTICLE_ID),
+}
+
+# Mutation endpoints that make whole read endpoints stale
+MUTATION_ENDPOINTS = {
+    "/growth_api/v1/check_in": ("/growth_api/v1/get_counts", "/user_api/v1/user/get_info_pack"),
+}
+
+
+def entity_tag(kind: str, entity_id: Any) -> str:
+    return f"{kind}:{entity_id}"
+
+
+def endpoint_tag(endpoint: str) -> str:
+    return f"endpoint:{endpoint}"
+
+
+class ResponseCache:
+    """Thread-safe in-memory LRU cache of decoded API responses
+
+    Entries expire after the TTL of their endpoint and are tagged with the
+    article/draft IDs they describe, so mutations can invalidate them. Cached
+    values are shared between callers and must be treated as read-only. The
+    clients scope keys and tags by account, so clients of several accounts
+    may share one cache.
+    """
+
+    def __init__(self, max_size: int = 1024, default_ttl: Optional[float] = None,
+                 endpoint_ttls: Optional[Dict[str, float]] = None):
+        """
+        Parameters:
+            max_size: Maximum number of entries, least recently used ones are evicted first
+            default_ttl: TTL of endpoints missing from the TTL table, None leaves them uncached
+            endpoint_ttls: Per-endpoint TTL overrides merged over DEFAULT_ENDPOINT_TTLS,
+                a TTL of 0 disables caching of that endpoint
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = dict(DEFAULT_ENDPOINT_TTLS)
+        self.endpoint_ttls.update(endpoint_ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """TTL of an endpoint, None or 0 when it is not cached"""
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        """Store a value for ttl seconds under the given invalidation tags"""
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tag: str) -> int:
+        """Drop every entry carrying a tag, returning the number of dropped entries"""
+        with self._lock:
+            keys = self._tags.pop(tag, ())
+            for key in list(keys):
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def _field(data: Any, name: str) -> Any:
+    if isinstance(data, dict):
+        return data.get(name)
+    return getattr(data, name, None)
+
+
+def response_tags(endpoint: str, data: Any, result: Any) -> Tuple[str, ...]:
+    """Invalidation tags of a read: its endpoint and every article/draft it describes"""
+    tags = [endpoint_tag(endpoint)]
+    sources = [data]
+    if isinstance(result, dict):
+        sources += [result, result.get("article_info"), result.get("article_draft")]
+    for source in sources:
+        if not source:
+            continue
+        article_id = _field(source, ARTICLE_ID)
+        if article_id and article_id != "0":
+            tags.append(entity_tag("article", article_id))
+        draft_id = _field(source, DRAFT_ID)
+        if draft_id and draft_id != "0":
+            tags.append(entity_tag("draft", draft_id))
+    if isinstance(result, dict) and isinstance(result.get("article_draft"), dict):
+        draft_id = result["article_draft"].get("id")
+        if draft_id:
+            tags.append(entity_tag("draft", draft_id))
+    return tuple(dict.fromkeys(tags))
+
+
+def mutation_tags(endpoint: str, data: Any) -> Tuple[str, ...]:
+    """Tags made stale by a call to a mutation endpoint, empty for reads"""
+    tags = [endpoint_tag(stale) for stale in MUTATION_ENDPOINTS.get(endpoint, ())]
+    entity = MUTATION_ENTITIES.get(endpoint)
+    if entity is not None and data is not None:
+        entity_id = _field(data, entity[1])
+        if entity_id:
+            tags.append(entity_tag(entity[0], entity_id))
+    return tuple(tags)
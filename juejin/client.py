@@ -1,26 +1,113 @@
-import json
-import logging
-from typing import Optional, Dict, Any, Union
+from __future__ import annotations
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import logging
+import threading
+import time
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Optional, Dict, Any, Union, Iterator, Iterable, List, Mapping, Tuple
 
 from juejin.const import DRAFT_ID, ARTICLE_ID
 from juejin.error import JuejinAPIError
-from juejin.models import BaseModule, ArticleRequest, UpdateArticleRequest, DescribeArticleDetailRequest, \
-    DescribeArticleListRequest, DescribeArticleDetailResponse
+
+if TYPE_CHECKING:
+    # requests, the JSON backend, the compression libraries and the feature modules are
+    # loaded by the first call using them, so creating a client stays cheap
+    import requests
+    from requests.adapters import BaseAdapter
+
+    from juejin.batch import BatchResult
+    from juejin.breaker import CircuitBreaker
+    from juejin.cache import ResponseCache
+    from juejin.disk_cache import DiskCache, DiskEntry
+    from juejin.endpoints import Endpoint
+    from juejin.fingerprint import DraftUpdate, FingerprintStore
+    from juejin.metrics import Instrumentation, RequestEvent
+    from juejin.models import BaseModule, ArticleRequest, UpdateArticleRequest, DescribeArticleDetailRequest, \
+        DescribeArticleListRequest, DescribeArticleDetailResponse
+    from juejin.projection import Projection
+    from juejin.ratelimit import RateLimiter
+    from juejin.retry import RetryPolicy
+    from juejin.search import SearchIndex
+    from juejin.singleflight import AsyncSingleFlight, SingleFlight
+    from juejin.streaming import ItemStream, JSONArrayParser
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _urllib3_accept_encoding() -> str:
+    """The encodings of ACCEPT_ENCODING urllib3 decodes too, it decodes the bodies of the sync client"""
+    from urllib3.util.request import ACCEPT_ENCODING as urllib3_encodings
+
+    from juejin.compression import available_encodings
+
+    # zstd depends on the urllib3 version as well as on zstandard being installed
+    decodable = {e.strip() for e in urllib3_encodings.split(",")}
+    return ", ".join(e for e in available_encodings() if e in decodable)
+
+
+@lru_cache(maxsize=64)
+def _account_key(cookie: str) -> str:
+    """Short hash of a cookie, keeping the keys of different accounts apart in shared caches and groups"""
+    import hashlib
+
+    return hashlib.sha1(cookie.encode("utf-8")).hexdigest()[:16]
+
+
+def _projection(fields: Optional[Iterable[str]], exclude: Optional[Iterable[str]]) -> Optional[Projection]:
+    """Projection.of(fields, exclude), without loading juejin.projection when there is none"""
+    if fields is None and exclude is None:
+        return None
+    from juejin.projection import Projection
+
+    return Projection.of(fields, exclude)
+
+
+def _connect_failed(error: requests.exceptions.RequestException) -> bool:
+    """Whether a request failed before a connection was made, so the server never saw it"""
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _wire_bytes(response: requests.Response) -> int:
+    """Body bytes of a read response as they came over the wire, before decoding"""
+    tell = getattr(response.raw, "tell", None)
+    if tell is not None:
+        try:
+            return tell()
+        except (OSError, ValueError):
+            pass
+    return len(response.content)
+
+
 class RequestConfig:
     """Request configuration class"""
     timeout: int = 10
     max_retries: int = 3
     retry_backoff_factor: float = 0.5
-    retry_status_codes: tuple = (500, 502, 503, 504)
+    retry_status_codes: tuple = (429, 500, 502, 503, 504)
+    # Upper bound in seconds of one computed retry backoff
+    retry_max_backoff: float = 30.0
+    # Connection limit of the AsyncJuejinClient connector
+    max_connections: int = 100
+    # Number of per-host connection pools the HTTPAdapter caches
+    pool_connections: int = 10
+    # Keep-alive connections kept per host, size it to the number of threads sharing the client
+    pool_maxsize: int = 10
+    # Wait for a free connection instead of opening (and then discarding) an extra one
+    pool_block: bool = False
+    # Give every thread its own requests.Session instead of sharing one
+    session_per_thread: bool = False
+    # Send request bodies of at least this many bytes compressed, None sends them as is
+    compress_request_min_size: Optional[int] = None
+    # Content coding of compressed request bodies
+    request_encoding: str = "gzip"
 
 
 class AuthConfig:
@@ -31,42 +118,60 @@ class AuthConfig:
     a_bogus: str
 
 
-class JuejinClient:
-    """Juejin API client"""
+class BaseJuejinClient:
+    """Transport independent parts shared by the sync and async clients"""
 
     BASE_URL = "https://api.juejin.cn"
     DEFAULT_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36"
 
-    def __init__(self, cookie: str, auth_config=AuthConfig(), config: RequestConfig = RequestConfig()):
-        """
-        Initialize the Juejin client
+    # Read size of streamed responses
+    STREAM_CHUNK_SIZE = 64 * 1024
 
-        Parameters:
-            cookie: Juejin authentication cookie
-            a_bogus: Authentication parameter
-            ms_token: Authentication token
-        """
-        self._config = config
-        self.session = requests.Session()
-        self._set_session(cookie)
-        self.auth_config = auth_config
-
-    def _set_session(self, cookie: str) -> None:
-        # Set retry strategy
-        retry_strategy = Retry(
-            total=self._config.max_retries,
-            backoff_factor=self._config.retry_backoff_factor,
-            status_forcelist=self._config.retry_status_codes
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
+    auth_config: AuthConfig
+    cache: Optional[ResponseCache] = None
+    rate_limiter: Optional[RateLimiter] = None
+    single_flight: Optional[Union[SingleFlight, AsyncSingleFlight]] = None
+    instrumentation: Optional[Instrumentation] = None
+    search_index: Optional["SearchIndex"] = None
+    disk_cache: Optional["DiskCache"] = None
+    fingerprints: Optional["FingerprintStore"] = None
+    circuit_breaker: Optional[CircuitBreaker] = None
+    _config: RequestConfig
+    _cookie: str = ""
+    _retry_policy: Optional[RetryPolicy] = None
+    # Endpoints that answered a compressed request body with 415
+    _plain_endpoints: frozenset = frozenset()
 
-        # Set default request headers
-        self.session.headers.update({
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Retry policy of the client, built from its RequestConfig on first use unless one was given"""
+        if self._retry_policy is None:
+            from juejin.retry import RetryPolicy
+
+            self._retry_policy = RetryPolicy.from_config(self._config)
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, policy: Optional[RetryPolicy]) -> None:
+        self._retry_policy = policy
+
+    @property
+    def _account(self) -> str:
+        return _account_key(self._cookie)
+
+    def _accept_encoding(self) -> str:
+        """Content codings offered to the server, the ones the client can decode"""
+        from juejin.compression import ACCEPT_ENCODING
+
+        return ACCEPT_ENCODING
+
+    def _default_headers(self, cookie: str) -> Dict[str, str]:
+        return {
             "Cookie": cookie,
             "User-Agent": self.DEFAULT_USER_AGENT,
-            "Accept": "application/json"
-        })
+            "Accept": "application/json",
+            "Accept-Encoding": self._accept_encoding()
+        }
 
     def _prepare_request(
             self,
@@ -76,14 +181,14 @@ class JuejinClient:
             data: Optional[Union[Dict[str, Any], BaseModule]] = None,
             headers: Optional[Dict[str, str]] = None,
             extra_auth: bool = False
-    ) -> tuple[str, Optional[str], Dict[str, str], Dict[str, str]]:
+    ) -> tuple[str, Optional[bytes], Dict[str, str], Dict[str, str]]:
         """Prepare request parameters"""
         url = f"{self.BASE_URL}{endpoint}"
         headers = headers or {}
 
         # Set POST request headers
         if method.upper() == "POST":
-            headers.setdefault("Content-Type", "application/json")
+            headers.setdefault("Content-Type", "application/json; charset=utf-8")
 
         # Add additional authentication parameters
         if extra_auth:
@@ -97,32 +202,374 @@ class JuejinClient:
             )
 
         # Serialize the request body
+        from juejin import codec
+        from juejin.models import BaseModule
+
         request_data = None
         if data is not None:
             if isinstance(data, BaseModule):
                 request_data = data._serialize()
             elif isinstance(data, dict):
-                request_data = json.dumps(data, ensure_ascii=False)
+                request_data = codec.dumps(data, ensure_ascii=False)
 
         return url, request_data, headers, params
 
-    def _parse_response(self, response: requests.Response) -> Dict[str, Any]:
-        """Parse the response data"""
-        try:
-            rsp = response.json()
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing failed: {e}\nResponse content: {response.text[:200]}")
-            raise JuejinAPIError(f"JSON parsing failed: {str(e)}", -1)
+    def _compress_request(self, endpoint: str, body: Optional[bytes],
+                          headers: Optional[Dict[str, str]]) -> tuple[Optional[bytes], Optional[Dict[str, str]]]:
+        """Body and headers to send, the body compressed if it is large enough and the endpoint accepts that"""
+        min_size = self._config.compress_request_min_size
+        if min_size is None or body is None or len(body) < min_size or endpoint in self._plain_endpoints:
+            return body, headers
+        from juejin.compression import compress
+
+        encoding = self._config.request_encoding
+        return compress(body, encoding), dict(headers or {}, **{"Content-Encoding": encoding})
 
-        # Check the API error code
+    def _reject_compression(self, endpoint: str) -> None:
+        """Send plain bodies to an endpoint from now on"""
+        logger.info(f"{endpoint} does not accept compressed request bodies, sending them as is")
+        self._plain_endpoints = self._plain_endpoints | {endpoint}
+
+    def _check_response(self, rsp: Dict[str, Any], raw: bool = False,
+                        projection: Optional[Projection] = None) -> Dict[str, Any]:
+        """Check the API error code of a decoded response and return its data, or the whole body if raw"""
         if rsp.get("err_no") != 0:
             error_msg = rsp.get("err_msg", "Unknown error")
             error_code = rsp.get("err_no", -1)
             logger.error(f"API error: {error_code} - {error_msg}")
             raise JuejinAPIError(error_msg, error_code)
 
+        if projection is not None and rsp.get("data") is not None:
+            rsp["data"] = projection.apply(rsp["data"])
+        if raw:
+            return rsp
         return rsp.get("data", {})
 
+    def _parse_body(self, body: bytes, raw: bool = False,
+                    projection: Optional[Projection] = None) -> Dict[str, Any]:
+        """Parse a response body"""
+        from juejin import codec
+
+        try:
+            rsp = codec.loads(body)
+        except codec.DecodeError as e:
+            logger.error(f"JSON parsing failed: {e}\nResponse content: {body[:200]!r}")
+            raise JuejinAPIError(f"JSON parsing failed: {str(e)}", -1)
+
+        return self._check_response(rsp, raw, projection)
+
+    def _check_stream(self, parser: JSONArrayParser, final: bool = False) -> None:
+        """Raise as soon as a streamed response carries a non-zero err_no, and at its end if it has none"""
+        if final or parser.envelope.get("err_no", 0) != 0:
+            self._check_response(parser.envelope)
+
+    def _request_key(self, method: str, endpoint: str, request_data: Optional[bytes],
+                     params: Optional[Dict[str, Any]], raw: bool, projection: Optional[Projection] = None):
+        """Key of a prepared request, equal for requests of the same account getting the same result"""
+        return (self._account, method.upper(), endpoint, request_data,
+                tuple(sorted(params.items())) if params else None, raw, projection)
+
+    def _cache_key(self, method: str, endpoint: str, request_data: Optional[bytes],
+                   params: Optional[Dict[str, Any]], raw: bool, projection: Optional[Projection] = None):
+        """Cache key of a request, None when the endpoint is not cached"""
+        if not self.cache.ttl_for(endpoint):
+            return None
+        return self._request_key(method, endpoint, request_data, params, raw, projection)
+
+    def _coalesce(self, method: str, endpoint: str) -> bool:
+        """Whether identical in-flight calls of an endpoint share one request"""
+        if self.single_flight is None:
+            return False
+        from juejin.endpoints import get_endpoint
+
+        return get_endpoint(endpoint, method).idempotent
+
+    def _start_event(self, method: str, endpoint: str) -> RequestEvent:
+        from juejin.metrics import RequestEvent
+
+        event = RequestEvent(method, endpoint)
+        try:
+            self.instrumentation.on_request_start(event)
+        except Exception as e:
+            logger.warning(f"Instrumentation hook failed: {str(e)}")
+        return event
+
+    def _end_event(self, event: RequestEvent) -> None:
+        event.finish()
+        try:
+            self.instrumentation.on_request_end(event)
+        except Exception as e:
+            logger.warning(f"Instrumentation hook failed: {str(e)}")
+
+    def _search_observe(self, endpoint: str, data: Any, result: Any) -> None:
+        try:
+            self.search_index.observe(endpoint, data, result)
+        except Exception as e:
+            logger.warning(f"Search index update failed: {str(e)}")
+
+    def _retry_decision(self, spec: Endpoint, attempt: int, sent: bool, status: Optional[int]) -> str:
+        """Retry decision of a failed attempt"""
+        from juejin.retry import GIVE_UP
+
+        decision = self.retry_policy.decide(spec, attempt, sent, status)
+        if decision != GIVE_UP:
+            logger.debug(f"Attempt {attempt} of {spec} failed (status {status}, sent {sent}): {decision}")
+        return decision
+
+    def _cache_tag(self, tag: str) -> str:
+        """Tag scoped to the client's account, a shared cache keeps the entries of each account apart"""
+        return f"{self._account}:{tag}"
+
+    def _cache_store(self, key, endpoint: str, data: Any, result: Dict[str, Any]) -> None:
+        from juejin.cache import response_tags
+
+        tags = [self._cache_tag(tag) for tag in response_tags(endpoint, data, result)]
+        self.cache.set(key, result, self.cache.ttl_for(endpoint), tags)
+
+    def _cache_invalidate(self, endpoint: str, data: Any) -> None:
+        """Invalidate the entries a mutation may have made stale, whether or not it succeeded"""
+        from juejin.cache import mutation_tags
+
+        for tag in mutation_tags(endpoint, data):
+            if self.cache is not None:
+                self.cache.invalidate(self._cache_tag(tag))
+            if self.disk_cache is not None:
+                try:
+                    self.disk_cache.invalidate(tag)
+                except Exception as e:
+                    logger.warning(f"Disk cache invalidation failed: {str(e)}")
+
+    def _disk_key(self, method: str, endpoint: str, request_data: Optional[bytes],
+                  params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Disk cache key of a request, None when the endpoint is not stored"""
+        return self.disk_cache.key(self._cookie, method, endpoint, request_data, params)
+
+    def _disk_get(self, key: str) -> Optional["DiskEntry"]:
+        try:
+            return self.disk_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Disk cache read failed: {str(e)}")
+            return None
+
+    def _disk_refresh(self, key: str, headers: Mapping[str, str]) -> None:
+        try:
+            self.disk_cache.refresh(key, headers)
+        except Exception as e:
+            logger.warning(f"Disk cache write failed: {str(e)}")
+
+    def _disk_store(self, key: str, endpoint: str, data: Any, body: bytes, headers: Mapping[str, str],
+                    result: Any) -> None:
+        from juejin.cache import response_tags
+
+        try:
+            self.disk_cache.set(key, endpoint, body, headers, response_tags(endpoint, data, result))
+        except Exception as e:
+            logger.warning(f"Disk cache write failed: {str(e)}")
+
+    def _draft_changes(self, req: UpdateArticleRequest) -> Tuple[Dict[str, str], List[str]]:
+        """Field hashes of an update and the fields it changes, all of them without a fingerprint store"""
+        from juejin.fingerprint import fingerprint
+
+        digests = fingerprint(req)
+        if self.fingerprints is None:
+            return digests, list(digests)
+        try:
+            return digests, self.fingerprints.changed_fields(str(req.id), digests)
+        except Exception as e:
+            logger.warning(f"Fingerprint store read failed: {str(e)}")
+            return digests, list(digests)
+
+    def _fingerprint_record(self, req: UpdateArticleRequest, digests: Optional[Dict[str, str]] = None) -> None:
+        from juejin.fingerprint import fingerprint
+
+        try:
+            self.fingerprints.record(str(req.id), digests if digests is not None else fingerprint(req))
+        except Exception as e:
+            logger.warning(f"Fingerprint store write failed: {str(e)}")
+
+    def _fingerprint_forget(self, draft_id: str) -> None:
+        try:
+            self.fingerprints.forget(str(draft_id))
+        except Exception as e:
+            logger.warning(f"Fingerprint store write failed: {str(e)}")
+
+
+class JuejinClient(BaseJuejinClient):
+    """Juejin API client"""
+
+    def __init__(self, cookie: str, auth_config: Optional[AuthConfig] = None,
+                 config: Optional[RequestConfig] = None, cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None,
+                 single_flight: Optional[SingleFlight] = None, instrumentation: Optional[Instrumentation] = None,
+                 transport: Optional[BaseAdapter] = None, search_index: Optional["SearchIndex"] = None,
+                 disk_cache: Optional["DiskCache"] = None, fingerprints: Optional["FingerprintStore"] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        """
+        Initialize the Juejin client
+
+        One client can be shared by many threads: requests reuse keep-alive
+        connections from a pool of ``RequestConfig.pool_maxsize`` connections per host.
+
+        Parameters:
+            cookie: Juejin authentication cookie
+            auth_config: Authentication parameters, required for sign-in
+            config: Request configuration
+            cache: Optional response cache for read endpoints
+            rate_limiter: Optional client-side rate limiter, may be shared between clients
+            retry_policy: Retry policy, built from config by default
+            single_flight: Optional group coalescing identical concurrent calls of read endpoints
+            instrumentation: Optional request hooks, e.g. a juejin.metrics.MetricsCollector
+            transport: Optional requests adapter used instead of the pooled HTTPAdapter,
+                e.g. a juejin.transport.ReplayTransport
+            search_index: Optional local full-text index kept current with fetched and updated content
+            disk_cache: Optional persistent cache of read responses, revalidated with the server
+            fingerprints: Optional store of the drafts' last updates, letting unchanged updates be skipped
+            circuit_breaker: Optional circuit breaker failing calls fast during outages, may be shared between clients
+        """
+        self._config = config if config is not None else RequestConfig()
+        self._cookie = cookie
+        self._transport = transport
+        self.auth_config = auth_config if auth_config is not None else AuthConfig()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.single_flight = single_flight
+        self.instrumentation = instrumentation
+        self.search_index = search_index
+        self.disk_cache = disk_cache
+        self.fingerprints = fingerprints
+        self.circuit_breaker = circuit_breaker
+        self._local = threading.local()
+        # Created by the first request, a client that never sends one never builds a session
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """The session of the client, or of the calling thread with RequestConfig.session_per_thread"""
+        if self._session is not None:
+            return self._session
+        if not self._config.session_per_thread:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._new_session()
+                return self._session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self._session = session
+
+    def _accept_encoding(self) -> str:
+        return _urllib3_accept_encoding()
+
+    def _new_session(self) -> requests.Session:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+
+        # Retries are decided per endpoint by _send, not by urllib3 which never retries POST
+        adapter = self._transport
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=self._config.pool_connections,
+                pool_maxsize=self._config.pool_maxsize,
+                pool_block=self._config.pool_block,
+                max_retries=0
+            )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        # Set default request headers
+        session.headers.update(self._default_headers(self._cookie))
+        return session
+
+    def _parse_response(self, response: requests.Response, raw: bool = False,
+                        projection: Optional[Projection] = None) -> Dict[str, Any]:
+        """Parse the response data"""
+        from juejin import codec
+
+        try:
+            rsp = codec.loads(response.content)
+        except codec.DecodeError as e:
+            logger.error(f"JSON parsing failed: {e}\nResponse content: {response.text[:200]}")
+            raise JuejinAPIError(f"JSON parsing failed: {str(e)}", -1)
+
+        return self._check_response(rsp, raw, projection)
+
+    def _send(self, method: str, endpoint: str, url: str, req: Any,
+              event: Optional[RequestEvent] = None, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying the failures the retry policy allows for the endpoint.
+
+        req is the unserialized request data handed to the endpoint's probe. Returns the
+        last response, whose status the caller still has to check.
+        """
+        import requests
+
+        from juejin.endpoints import get_endpoint
+        from juejin.retry import GIVE_UP, PROBE, RETRY
+
+        spec = get_endpoint(endpoint, method)
+        body, headers = kwargs.get("data"), kwargs.get("headers")
+        kwargs["data"], kwargs["headers"] = self._compress_request(endpoint, body, headers)
+        attempt = 0
+        while True:
+            attempt += 1
+            if event is not None:
+                event.attempts = attempt
+                if body is not None:
+                    event.bytes_sent += len(body)
+                    event.wire_bytes_sent += len(kwargs["data"])
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.acquire(endpoint, self._cookie)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+
+            error = response = status = retry_after = None
+            try:
+                response = self.session.request(method=method, url=url, timeout=self._config.timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                sent = not _connect_failed(e)
+            finally:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record(endpoint, self._cookie,
+                                                response.status_code if response is not None else None)
+            if error is None:
+                if self.rate_limiter is not None and response.status_code >= 400:
+                    # Failed attempts are fed back here once each, successes once their err_no is read
+                    self.rate_limiter.record(endpoint, status=response.status_code)
+                if response.status_code == 415 and kwargs["data"] is not body:
+                    # Rejected before processing, resending the plain body is safe even for mutations
+                    response.close()
+                    self._reject_compression(endpoint)
+                    kwargs["data"], kwargs["headers"] = body, headers
+                    continue
+                if not self.retry_policy.retryable_status(response.status_code):
+                    return response
+                status = response.status_code
+                retry_after = self.retry_policy.parse_retry_after(response.headers.get("Retry-After"))
+                sent = True
+
+            decision = self._retry_decision(spec, attempt, sent, status)
+            if decision == PROBE:
+                # The probe reads the entity, which must not come from the cache
+                if self.cache is not None or self.disk_cache is not None:
+                    self._cache_invalidate(endpoint, req)
+                decision = RETRY if spec.probe(self, req) else GIVE_UP
+            if decision == GIVE_UP:
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            time.sleep(self.retry_policy.backoff(attempt, retry_after))
+
     def request(
             self,
             method: str,
@@ -130,32 +577,195 @@ class JuejinClient:
             params: Optional[Dict[str, Any]] = None,
             data: Optional[Union[Dict[str, Any], BaseModule]] = None,
             headers: Optional[Dict[str, str]] = None,
-            extra_auth: bool = False
+            extra_auth: bool = False,
+            raw: bool = False,
+            projection: Optional[Projection] = None
     ) -> Dict[str, Any]:
+        event = self._start_event(method, endpoint) if self.instrumentation is not None else None
         try:
             # Prepare request parameters
             url, request_data, headers, params = self._prepare_request(
                 method, endpoint, params, data, headers, extra_auth
             )
 
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self._cache_key(method, endpoint, request_data, params, raw, projection)
+                if cache_key is not None:
+                    hit, value = self.cache.get(cache_key)
+                    if hit:
+                        logger.debug(f"Cache hit: {method} {url}")
+                        if event is not None:
+                            event.cached = True
+                        return value
+
+            disk_key = None
+            if self.disk_cache is not None:
+                disk_key = self._disk_key(method, endpoint, request_data, params)
+
+            fetch = partial(self._fetch, method, endpoint, url, params, data, request_data, headers, raw,
+                            projection, cache_key, event, disk_key)
+            if self._coalesce(method, endpoint):
+                key = self._request_key(method, endpoint, request_data, params, raw, projection)
+                return self.single_flight.do(key, fetch)
+            return fetch()
+
+        except JuejinAPIError as e:
+            if event is not None:
+                event.error_code = e.code
+            raise
+        except Exception as e:
+            logger.error(f"Unknown error: {str(e)}", exc_info=True)
+            if event is not None:
+                event.error_code = -3
+            raise JuejinAPIError(f"Unknown error: {str(e)}", -3)
+        finally:
+            if self.cache is not None or self.disk_cache is not None:
+                self._cache_invalidate(endpoint, data)
+            if event is not None:
+                self._end_event(event)
+
+    def _fetch(self, method: str, endpoint: str, url: str, params, data, request_data: Optional[bytes],
+               headers: Dict[str, str], raw: bool, projection: Optional[Projection], cache_key,
+               event: Optional[RequestEvent] = None, disk_key: Optional[str] = None) -> Dict[str, Any]:
+        """Send a prepared request and parse its response, raising JuejinAPIError on failure"""
+        import requests
+
+        try:
+            entry = self._disk_get(disk_key) if disk_key is not None else None
+            validators = None
+            if entry is not None:
+                if entry.fresh:
+                    logger.debug(f"Disk cache hit: {method} {url}")
+                    if event is not None:
+                        event.cached = True
+                    result = self._parse_body(entry.body, raw, projection)
+                    if cache_key is not None:
+                        self._cache_store(cache_key, endpoint, data, result)
+                    return result
+                validators = entry.validators()
+                if validators:
+                    headers = dict(headers, **validators)
+
             logger.debug(f"Sending request: {method} {url}")
 
             # Send the request
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                data=request_data,
-                headers=headers,
-                timeout=self._config.timeout
+            response = self._send(method, endpoint, url, data, params=params, data=request_data, headers=headers,
+                                  event=event)
+            if event is not None:
+                event.status = response.status_code
+                event.bytes_received = len(response.content)
+                event.wire_bytes_received = _wire_bytes(response)
+
+            if validators and response.status_code == 304:
+                # Unchanged since it was stored
+                self._disk_refresh(disk_key, response.headers)
+                result = self._parse_body(entry.body, raw, projection)
+            else:
+                # Check the HTTP status code
+                response.raise_for_status()
+
+                # Parse the response
+                result = self._parse_response(response, raw, projection)
+                if disk_key is not None:
+                    self._disk_store(disk_key, endpoint, data, response.content, response.headers, result)
+            if cache_key is not None:
+                self._cache_store(cache_key, endpoint, data, result)
+            if self.search_index is not None:
+                self._search_observe(endpoint, data, result)
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=0)
+            return result
+
+        except JuejinAPIError as e:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=e.code)
+            raise
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Network request failed: {str(e)}")
+            raise JuejinAPIError(f"Network request failed: {str(e)}", -2)
+
+    def request_stream(
+            self,
+            method: str,
+            endpoint: str,
+            params: Optional[Dict[str, Any]] = None,
+            data: Optional[Union[Dict[str, Any], BaseModule]] = None,
+            headers: Optional[Dict[str, str]] = None,
+            extra_auth: bool = False,
+            key: str = "data",
+            projection: Optional[Projection] = None
+    ) -> ItemStream:
+        """
+        Send a request and stream the items of the array under ``key`` as the body arrives.
+
+        The err_no check raises as soon as a non-zero err_no is read. If the server sends
+        err_no after the array, it is checked once the stream is exhausted. Responses are
+        never cached.
+        """
+        from juejin.streaming import ItemStream, JSONArrayParser
+
+        parser = JSONArrayParser(key)
+        items = self._stream_items(parser, method, endpoint, params, data, headers, extra_auth, projection)
+        return ItemStream(items, parser)
+
+    def _stream_items(self, parser: JSONArrayParser, method: str, endpoint: str, params, data, headers,
+                      extra_auth: bool, projection: Optional[Projection]) -> Iterator[Any]:
+        event = self._start_event(method, endpoint) if self.instrumentation is not None else None
+        try:
+            yield from self._stream_response(parser, method, endpoint, params, data, headers, extra_auth,
+                                             projection, event)
+        except JuejinAPIError as e:
+            if event is not None:
+                event.error_code = e.code
+            raise
+        finally:
+            if event is not None:
+                self._end_event(event)
+
+    def _stream_response(self, parser: JSONArrayParser, method: str, endpoint: str, params, data, headers,
+                         extra_auth: bool, projection: Optional[Projection],
+                         event: Optional[RequestEvent] = None) -> Iterator[Any]:
+        """Send a request and parse its response as it arrives, raising JuejinAPIError on failure"""
+        import requests
+
+        from juejin import codec
+
+        try:
+            url, request_data, headers, params = self._prepare_request(
+                method, endpoint, params, data, headers, extra_auth
             )
 
-            # Check the HTTP status code
-            response.raise_for_status()
+            logger.debug(f"Streaming request: {method} {url}")
 
-            # Parse the response
-            return self._parse_response(response)
+            with self._send(method, endpoint, url, data, params=params, data=request_data, headers=headers,
+                            event=event, stream=True) as response:
+                if event is not None:
+                    event.status = response.status_code
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+                    if event is not None:
+                        event.bytes_received += len(chunk)
+                    items = parser.feed(chunk)
+                    self._check_stream(parser)
+                    for item in items:
+                        yield item if projection is None else projection.apply(item)
+                items = parser.close()
+                self._check_stream(parser, final=True)
+                if event is not None:
+                    event.wire_bytes_received = _wire_bytes(response)
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=0)
+            for item in items:
+                yield item if projection is None else projection.apply(item)
 
+        except JuejinAPIError as e:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(endpoint, err_no=e.code)
+            raise
+        except codec.DecodeError as e:
+            logger.error(f"JSON parsing failed: {e}")
+            raise JuejinAPIError(f"JSON parsing failed: {str(e)}", -1)
         except requests.exceptions.RequestException as e:
             logger.error(f"Network request failed: {str(e)}")
             raise JuejinAPIError(f"Network request failed: {str(e)}", -2)
@@ -185,7 +795,32 @@ class JuejinClient:
         Returns:
             Dict[str, Any]: API response.
         """
-        return self.request("POST", "/content_api/v1/article_draft/update", data=req)
+        result = self.request("POST", "/content_api/v1/article_draft/update", data=req)
+        if self.fingerprints is not None:
+            self._fingerprint_record(req)
+        return result
+
+    def update_article_draft_if_changed(self, req: UpdateArticleRequest) -> "DraftUpdate":
+        """
+        Update an article draft unless it equals the last update sent, see juejin.fingerprint.
+
+        Args:
+            req (UpdateArticleRequest): Request object containing updated article draft details.
+
+        Returns:
+            DraftUpdate: The fields that changed and the API response, or skipped when no
+            field changed. Without a fingerprint store every update is sent.
+        """
+        from juejin.fingerprint import DraftUpdate
+
+        digests, changed = self._draft_changes(req)
+        if not changed:
+            logger.debug(f"Draft {req.id} is unchanged, skipping its update")
+            return DraftUpdate(str(req.id), changed)
+        result = self.request("POST", "/content_api/v1/article_draft/update", data=req)
+        if self.fingerprints is not None:
+            self._fingerprint_record(req, digests)
+        return DraftUpdate(str(req.id), changed, result)
 
     def describe_article_draft_detail(self, draft_id: str) -> Dict[str, Any]:
         """
@@ -199,20 +834,56 @@ class JuejinClient:
         """
         return self.request("POST", "/content_api/v1/article_draft/detail", data={DRAFT_ID: draft_id})
 
-    def describe_article_detail(self, req: DescribeArticleDetailRequest) -> DescribeArticleDetailResponse:
+    def describe_article_detail(self, req: DescribeArticleDetailRequest, fields: Optional[Iterable[str]] = None,
+                                exclude: Optional[Iterable[str]] = None) -> DescribeArticleDetailResponse:
         """
         Get details of an article.
 
         Args:
             req (DescribeArticleDetailRequest): Request object containing article ID.
+            fields (Iterable[str]): Dotted paths to keep, e.g. "article_info.title". Defaults to all.
+            exclude (Iterable[str]): Dotted paths to drop while parsing, e.g. HEAVY_CONTENT_FIELDS.
 
         Returns:
             Dict[str, Any]: API response containing article details.
         """
-        data = self.request("POST", "/content_api/v1/article/detail", data=req)
+        data = self.request("POST", "/content_api/v1/article/detail", data=req,
+                            projection=_projection(fields, exclude))
+        from juejin.models import DescribeArticleDetailResponse
+
         resp = DescribeArticleDetailResponse(data)
         return resp
 
+    def describe_article_details(self, ids: Iterable[str], max_workers: int = 8, ordered: bool = True,
+                                 fields: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) \
+            -> Iterator[BatchResult]:
+        """
+        Get details of many articles concurrently.
+
+        Args:
+            ids (Iterable[str]): Article IDs, consumed lazily.
+            max_workers (int): Maximum number of requests in flight.
+            ordered (bool): Yield results in input order, otherwise as they complete.
+            fields (Iterable[str]): Dotted paths to keep, see describe_article_detail.
+            exclude (Iterable[str]): Dotted paths to drop, see describe_article_detail.
+
+        Returns:
+            Iterator[BatchResult]: One result per ID with the DescribeArticleDetailResponse as value,
+            or the JuejinAPIError of that ID as error.
+        """
+        from juejin.batch import run_batch
+
+        return run_batch(partial(self._describe_article_detail_by_id, fields=fields, exclude=exclude),
+                         ids, max_workers, ordered)
+
+    def _describe_article_detail_by_id(self, article_id: str, fields: Optional[Iterable[str]] = None,
+                                       exclude: Optional[Iterable[str]] = None) -> DescribeArticleDetailResponse:
+        from juejin.models import DescribeArticleDetailRequest
+
+        req = DescribeArticleDetailRequest()
+        req.article_id = article_id
+        return self.describe_article_detail(req, fields, exclude)
+
     def delete_article_draft(self, draft_id: str) -> Dict[str, Any]:
         """
         Delete an article draft.
@@ -223,7 +894,10 @@ class JuejinClient:
         Returns:
             Dict[str, Any]: API response indicating the result of the delete operation.
         """
-        return self.request("POST", "/content_api/v1/article_draft/delete", data={DRAFT_ID: draft_id})
+        result = self.request("POST", "/content_api/v1/article_draft/delete", data={DRAFT_ID: draft_id})
+        if self.fingerprints is not None:
+            self._fingerprint_forget(draft_id)
+        return result
 
     def delete_article(self, article_id: str) -> Dict[str, Any]:
         """
@@ -249,29 +923,147 @@ class JuejinClient:
         """
         return self.request("POST", "/content_api/v1/article/publish", data={DRAFT_ID: draft_id})
 
-    def describe_article_list(self, req: DescribeArticleListRequest) -> Dict[str, Any]:
+    def describe_article_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                              exclude: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Get a list of articles.
 
         Args:
             req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item, e.g. "article_info.title".
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
 
         Returns:
             Dict[str, Any]: API response containing a list of articles.
         """
-        return self.request("POST", "/content_api/v1/article/list_by_user", data=req)
+        return self.request("POST", "/content_api/v1/article/list_by_user", data=req,
+                            projection=_projection(fields, exclude))
 
-    def describe_article_draft_list(self, req: DescribeArticleListRequest) -> Dict[str, Any]:
+    def describe_article_draft_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                                    exclude: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Get a list of article drafts.
 
         Args:
             req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item, e.g. "article_info.title".
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
 
         Returns:
             Dict[str, Any]: API response containing a list of article drafts.
         """
-        return self.request("POST", "/content_api/v1/article_draft/list_by_user", data=req)
+        return self.request("POST", "/content_api/v1/article_draft/list_by_user", data=req,
+                            projection=_projection(fields, exclude))
+
+    def stream_article_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                            exclude: Optional[Iterable[str]] = None) -> ItemStream:
+        """
+        Get one page of articles, parsing the response incrementally.
+
+        Args:
+            req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item.
+
+        Returns:
+            ItemStream: Items yielded one at a time as they are parsed, has_more/cursor are
+            available on it once exhausted.
+        """
+        return self.request_stream("POST", "/content_api/v1/article/list_by_user", data=req,
+                                   projection=_projection(fields, exclude))
+
+    def stream_article_draft_list(self, req: DescribeArticleListRequest, fields: Optional[Iterable[str]] = None,
+                                  exclude: Optional[Iterable[str]] = None) -> ItemStream:
+        """
+        Get one page of article drafts, parsing the response incrementally.
+
+        Args:
+            req (DescribeArticleListRequest): Request object containing filters and pagination details.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item.
+
+        Returns:
+            ItemStream: Items yielded one at a time as they are parsed, has_more/cursor are
+            available on it once exhausted.
+        """
+        return self.request_stream("POST", "/content_api/v1/article_draft/list_by_user", data=req,
+                                   projection=_projection(fields, exclude))
+
+    def iter_articles(self, req: Optional[DescribeArticleListRequest] = None, prefetch: int = 2,
+                      fields: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) \
+            -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all articles, following pagination until the server reports no more pages.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the first page, defaults to page 1.
+            prefetch (int): Number of pages fetched in the background ahead of the caller.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Article items, yielded lazily.
+        """
+        from juejin.models import DescribeArticleListRequest
+        from juejin.pagination import iter_pages
+
+        fetch = partial(self.fetch_article_page, projection=_projection(fields, exclude))
+        return iter_pages(fetch, req or DescribeArticleListRequest(), prefetch)
+
+    def iter_drafts(self, req: Optional[DescribeArticleListRequest] = None, prefetch: int = 2,
+                    fields: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) \
+            -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all article drafts, following pagination until the server reports no more pages.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the first page, defaults to page 1.
+            prefetch (int): Number of pages fetched in the background ahead of the caller.
+            fields (Iterable[str]): Dotted paths to keep in each item.
+            exclude (Iterable[str]): Dotted paths to drop from each item while parsing.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Draft items, yielded lazily.
+        """
+        from juejin.models import DescribeArticleListRequest
+        from juejin.pagination import iter_pages
+
+        fetch = partial(self.fetch_draft_page, projection=_projection(fields, exclude))
+        return iter_pages(fetch, req or DescribeArticleListRequest(), prefetch)
+
+    def fetch_article_page(self, req: DescribeArticleListRequest, projection: Optional[Projection] = None) \
+            -> Dict[str, Any]:
+        """
+        Get one page of the user's articles as the full response body, the page
+        fetch behind iter_articles.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the page to fetch.
+            projection (Projection): Fields to keep in or drop from each item while parsing.
+
+        Returns:
+            Dict[str, Any]: Response body with the items under ``data`` and the ``has_more``, ``cursor``
+            and ``count`` pagination fields.
+        """
+        return self.request("POST", "/content_api/v1/article/list_by_user", data=req,
+                            raw=True, projection=projection)
+
+    def fetch_draft_page(self, req: DescribeArticleListRequest, projection: Optional[Projection] = None) \
+            -> Dict[str, Any]:
+        """
+        Get one page of the user's article drafts as the full response body, the page
+        fetch behind iter_drafts.
+
+        Args:
+            req (DescribeArticleListRequest): Filters and the page to fetch.
+            projection (Projection): Fields to keep in or drop from each item while parsing.
+
+        Returns:
+            Dict[str, Any]: Response body with the items under ``data`` and the ``has_more``, ``cursor``
+            and ``count`` pagination fields.
+        """
+        return self.request("POST", "/content_api/v1/article_draft/list_by_user", data=req,
+                            raw=True, projection=projection)
 
     def describe_user_counts(self) -> Dict[str, Any]:
         """Get user sign-in information"""
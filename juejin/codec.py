@@ -0,0 +1,76 @@
+"""
+JSON codec used for request bodies and responses.
+
+The fastest installed backend is picked at import time: orjson, then ujson,
+then the standard library. Set the JUEJIN_JSON_BACKEND environment variable
+or call :func:`set_backend` to force one.
+
+Encoding always returns compact UTF-8 bytes, and every backend produces the
+same bytes for the same input. Request bodies are sent as raw UTF-8. A caller
+asking for ``ensure_ascii`` gets the standard library encoder whatever the
+backend, since orjson cannot escape and escaping its output afterwards is
+slower still. None values are encoded as-is, so stripping them stays the
+caller's job. ``default`` is called with every object the backend cannot
+encode and returns an encodable replacement.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+
+def _json_dumps(obj: Any, ensure_ascii: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return json.dumps(obj, ensure_ascii=ensure_ascii, default=default, separators=(",", ":")).encode("utf-8")
+
+
+def _orjson_dumps(obj: Any, ensure_ascii: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    if ensure_ascii:
+        return _json_dumps(obj, True, default)
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _ujson_dumps(obj: Any, ensure_ascii: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    if ensure_ascii:
+        return _json_dumps(obj, True, default)
+    return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=default).encode("utf-8")
+
+
+BACKENDS: Dict[str, tuple] = {"json": (_json_dumps, json.loads)}
+if ujson is not None:
+    BACKENDS["ujson"] = (_ujson_dumps, ujson.loads)
+if orjson is not None:
+    BACKENDS["orjson"] = (_orjson_dumps, orjson.loads)
+
+# Every backend raises a ValueError subclass on malformed input
+DecodeError = ValueError
+
+backend: str = "json"
+dumps: Callable[..., bytes] = _json_dumps
+loads: Callable[[Union[bytes, str]], Any] = json.loads
+
+
+def set_backend(name: str) -> None:
+    """
+    Select the JSON backend.
+
+    Args:
+        name (str): One of "orjson", "ujson" or "json", the backend must be installed.
+    """
+    global backend, dumps, loads
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not available, installed: {', '.join(BACKENDS)}")
+    backend = name
+    dumps, loads = BACKENDS[name]
+
+
+set_backend(os.environ.get("JUEJIN_JSON_BACKEND") or next(
+    name for name in ("orjson", "ujson", "json") if name in BACKENDS))
@@ -0,0 +1,150 @@
+"""
+Compressed transfer of request and response bodies.
+
+Clients advertise in ``Accept-Encoding`` every encoding they can decode: gzip and
+deflate always, br when brotli (or brotlicffi) is installed and zstd when
+zstandard is installed (``pip install occrq-juejin-python-sdk[compress]``). The
+sync client leaves decoding to urllib3, which supports the same encodings; the
+async client reads the body as sent and decodes it chunk by chunk with decoder(),
+so both can count the bytes that went over the wire.
+
+Request bodies are sent as is unless RequestConfig.compress_request_min_size is
+set, see BaseJuejinClient._compress_request.
+"""
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Content codings this installation can decode, best first"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    return tuple(encodings) + ("gzip", "deflate")
+
+
+ACCEPT_ENCODING = ", ".join(available_encodings())
+
+
+def compress(body: bytes, encoding: str = "gzip") -> bytes:
+    """Encode a body with a content coding"""
+    if encoding == "gzip":
+        return zlib.compress(body, 6, wbits=16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(body)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+class _Identity:
+    def decompress(self, chunk: bytes) -> bytes:
+        return chunk
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _Zlib:
+    """gzip or deflate, the latter with or without its zlib header as servers disagree on it"""
+
+    def __init__(self, wbits: int):
+        self._obj = zlib.decompressobj(wbits)
+        self._deflate = wbits == zlib.MAX_WBITS
+        self._first = True
+
+    def decompress(self, chunk: bytes) -> bytes:
+        if not chunk:
+            return b""
+        if self._deflate and self._first:
+            self._first = False
+            try:
+                return self._obj.decompress(chunk)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _Brotli:
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        self._decompress = getattr(self._obj, "process", None) or self._obj.decompress
+
+    def decompress(self, chunk: bytes) -> bytes:
+        return self._decompress(chunk) if chunk else b""
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _Zstd:
+    def __init__(self):
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        return self._obj.decompress(chunk) if chunk else b""
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _Chain:
+    """Codings applied in sequence, decoded in reverse order"""
+
+    def __init__(self, decoders: List):
+        self._decoders = decoders
+
+    def decompress(self, chunk: bytes) -> bytes:
+        for decoder in self._decoders:
+            chunk = decoder.decompress(chunk)
+        return chunk
+
+    def flush(self) -> bytes:
+        data = b""
+        for decoder in self._decoders:
+            data = decoder.decompress(data) + decoder.flush()
+        return data
+
+
+def _decoder(encoding: str):
+    if encoding in ("gzip", "x-gzip"):
+        return _Zlib(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _Zlib(zlib.MAX_WBITS)
+    if encoding == "br" and brotli is not None:
+        return _Brotli()
+    if encoding == "zstd" and zstandard is not None:
+        return _Zstd()
+    if encoding == "identity":
+        return _Identity()
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def decoder(content_encoding: Optional[str]):
+    """Incremental decoder of a Content-Encoding header, with decompress(chunk) and flush()"""
+    encodings = [e.strip().lower() for e in (content_encoding or "").split(",") if e.strip()]
+    if not encodings:
+        return _Identity()
+    if len(encodings) == 1:
+        return _decoder(encodings[0])
+    return _Chain([_decoder(e) for e in reversed(encodings)])
@@ -0,0 +1,269 @@
+"""
+Persistent HTTP cache of read responses, kept across restarts.
+
+DiskCache stores the zlib-compressed response bodies of read endpoints in an
+SQLite file, keyed by a fingerprint of the account, endpoint and request, the
+session signing parameters left out. The client consults it below the in-memory
+ResponseCache:
+
+* A response carrying ``Cache-Control: max-age`` is served from disk for that long.
+* A response carrying an ``ETag`` or ``Last-Modified`` is revalidated on every use
+  with ``If-None-Match`` / ``If-Modified-Since``; a 304 reuses the stored body.
+* Any other response is served from disk for the configured max-age of its endpoint.
+
+Responses with ``Cache-Control: no-store`` are not stored, ``no-cache`` ones are
+always revalidated. Mutations drop the entries they make stale, like they do in
+ResponseCache.
+
+Several processes may share one file: the total size lives in the database and
+every write updates it inside an immediate transaction, so eviction always sees
+the entries stored by the other processes.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from juejin import endpoints
+from juejin.cache import endpoint_tag
+
+# Read endpoints stored by default and their max-age in seconds when the server sends no validators
+DEFAULT_MAX_AGES = {
+    endpoints.ARTICLE_DETAIL: 3600.0,
+    endpoints.ARTICLE_DRAFT_DETAIL: 600.0,
+    endpoints.USER_RANK: 3600.0,
+    endpoints.USER_COUNTS: 300.0,
+    endpoints.USER_INFO_PACK: 600.0,
+}
+
+# Signing parameters that change on every session, left out of the keys
+SIGNING_PARAMS = frozenset({"msToken", "a_bogus"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    max_age REAL NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS http_cache_stored_at ON http_cache (stored_at);
+CREATE TABLE IF NOT EXISTS http_cache_tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS http_cache_size (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO http_cache_size (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM http_cache;
+"""
+
+
+def _cache_control(headers: Mapping[str, str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (headers.get("Cache-Control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+class DiskEntry:
+    """A stored response body and its validators"""
+
+    __slots__ = ("body", "etag", "last_modified", "max_age", "stored_at")
+
+    def __init__(self, body: bytes, etag: Optional[str], last_modified: Optional[str], max_age: float,
+                 stored_at: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.max_age = max_age
+        self.stored_at = stored_at
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry can be used without asking the server"""
+        return time.time() - self.stored_at < self.max_age
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers revalidating the entry, empty when the server sent no validators"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DiskCache:
+    """SQLite cache of compressed response bodies, safe to share between threads and processes"""
+
+    def __init__(self, path: str, default_max_age: Optional[float] = None,
+                 endpoint_max_ages: Optional[Dict[str, float]] = None, max_bytes: int = 256 * 1024 * 1024,
+                 compress_level: int = 6):
+        """
+        Parameters:
+            path: SQLite database file
+            default_max_age: Max-age of endpoints missing from the table, None leaves them unstored
+            endpoint_max_ages: Per-endpoint max-age overrides merged over DEFAULT_MAX_AGES,
+                a max-age of 0 disables storing that endpoint
+            max_bytes: Compressed size above which the oldest entries are dropped
+            compress_level: zlib level of the stored bodies
+        """
+        self.path = path
+        self.default_max_age = default_max_age
+        self.endpoint_max_ages = dict(DEFAULT_MAX_AGES)
+        self.endpoint_max_ages.update(endpoint_max_ages or {})
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.lock = threading.RLock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def max_age_for(self, endpoint: str) -> Optional[float]:
+        """Max-age of an endpoint, None or 0 when it is not stored"""
+        return self.endpoint_max_ages.get(endpoint, self.default_max_age)
+
+    def key(self, cookie: str, method: str, endpoint: str, request_data: Optional[bytes],
+            params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Key of a request, None when its endpoint is not stored"""
+        if not self.max_age_for(endpoint):
+            return None
+        digest = hashlib.sha1(cookie.encode("utf-8"))
+        query = sorted((k, str(v)) for k, v in (params or {}).items() if k not in SIGNING_PARAMS)
+        digest.update(f"\n{method.upper()} {endpoint}?{query}\n".encode("utf-8"))
+        if request_data:
+            digest.update(request_data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[DiskEntry]:
+        """The stored entry of a key, fresh or not"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, max_age, stored_at FROM http_cache WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+        entry = DiskEntry(zlib.decompress(row[0]), row[1], row[2], row[3], row[4])
+        if entry.fresh:
+            self.hits += 1
+        elif not entry.validators():
+            self.misses += 1
+        return entry
+
+    def set(self, key: str, endpoint: str, body: bytes, headers: Mapping[str, str],
+            tags: Iterable[str] = ()) -> bool:
+        """Store the body of a successful response, returning False when its headers forbid it"""
+        directives = _cache_control(headers)
+        if "no-store" in directives:
+            return False
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if "no-cache" in directives:
+            max_age = 0.0
+        elif directives.get("max-age") is not None:
+            try:
+                max_age = float(directives["max-age"])
+            except ValueError:
+                max_age = 0.0
+        elif etag or last_modified:
+            max_age = 0.0
+        else:
+            max_age = self.max_age_for(endpoint) or 0.0
+        compressed = zlib.compress(body, self.compress_level)
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            old = self.conn.execute("SELECT size FROM http_cache WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache (key, endpoint, body, size, etag, last_modified, max_age, "
+                "stored_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, compressed, len(compressed), etag, last_modified, max_age, time.time()))
+            self.conn.execute("DELETE FROM http_cache_tags WHERE key = ?", (key,))
+            self.conn.executemany("INSERT OR IGNORE INTO http_cache_tags (tag, key) VALUES (?, ?)",
+                                  [(tag, key) for tag in (endpoint_tag(endpoint),) + tuple(tags)])
+            size = self._add_size(len(compressed) - (old[0] if old is not None else 0))
+            if size > self.max_bytes:
+                self._evict(size)
+        return True
+
+    def refresh(self, key: str, headers: Mapping[str, str]) -> None:
+        """Restart the lifetime of an entry the server confirmed with a 304"""
+        with self.lock, self.conn:
+            self.revalidated += 1
+            self.conn.execute(
+                "UPDATE http_cache SET stored_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time(), headers.get("ETag"), headers.get("Last-Modified"), key))
+
+    def _add_size(self, delta: int) -> int:
+        """Add to the stored total size inside the current transaction, returning the new total"""
+        self.conn.execute("UPDATE http_cache_size SET bytes = bytes + ? WHERE id = 0", (delta,))
+        return self.conn.execute("SELECT bytes FROM http_cache_size WHERE id = 0").fetchone()[0]
+
+    def _evict(self, size: int) -> None:
+        """Drop the oldest entries until the cache is back to 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        dropped = []
+        freed = 0
+        for key, entry_size in self.conn.execute("SELECT key, size FROM http_cache ORDER BY stored_at"):
+            if size - freed <= target:
+                break
+            dropped.append((key,))
+            freed += entry_size
+        self.conn.executemany("DELETE FROM http_cache WHERE key = ?", dropped)
+        self.conn.executemany("DELETE FROM http_cache_tags WHERE key = ?", dropped)
+        self._add_size(-freed)
+        self.evictions += len(dropped)
+
+    def invalidate(self, tag: str) -> int:
+        """Drop every entry carrying a tag, returning the number of dropped entries"""
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            # Subqueries rather than one bound parameter per key, which could pass SQLITE_MAX_VARIABLE_NUMBER
+            count, freed = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache "
+                "WHERE key IN (SELECT key FROM http_cache_tags WHERE tag = ?)", (tag,)).fetchone()
+            self.conn.execute("DELETE FROM http_cache WHERE key IN (SELECT key FROM http_cache_tags WHERE tag = ?)",
+                              (tag,))
+            self.conn.execute(
+                "DELETE FROM http_cache_tags WHERE key IN (SELECT key FROM http_cache_tags WHERE tag = ?)", (tag,))
+            if freed:
+                self._add_size(-freed)
+            return count
+
+    def clear(self) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM http_cache")
+            self.conn.execute("DELETE FROM http_cache_tags")
+            self.conn.execute("UPDATE http_cache_size SET bytes = 0 WHERE id = 0")
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+            size = self.conn.execute("SELECT bytes FROM http_cache_size WHERE id = 0").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": size,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
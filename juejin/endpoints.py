@@ -0,0 +1,131 @@
+"""
+Registry of the API endpoints the SDK calls.
+
+Nearly every endpoint is a POST, including pure reads, so the HTTP method says
+nothing about whether a call is safe to repeat. Each endpoint is registered with
+an ``idempotent`` flag. Mutations may also carry a probe that can show a write
+did not land, which is what retries of ambiguous failures rely on.
+"""
+from collections.abc import Awaitable
+from typing import Any, Callable, Dict, Optional
+
+from juejin.const import ARTICLE_ID, DRAFT_ID
+from juejin.error import JuejinAPIError
+from juejin.models import DescribeArticleDetailRequest
+
+ARTICLE_DRAFT_CREATE = "/content_api/v1/article_draft/create"
+ARTICLE_DRAFT_UPDATE = "/content_api/v1/article_draft/update"
+ARTICLE_DRAFT_DETAIL = "/content_api/v1/article_draft/detail"
+ARTICLE_DRAFT_DELETE = "/content_api/v1/article_draft/delete"
+ARTICLE_DRAFT_LIST = "/content_api/v1/article_draft/list_by_user"
+ARTICLE_DETAIL = "/content_api/v1/article/detail"
+ARTICLE_DELETE = "/content_api/v1/article/delete"
+ARTICLE_PUBLISH = "/content_api/v1/article/publish"
+ARTICLE_LIST = "/content_api/v1/article/list_by_user"
+USER_COUNTS = "/growth_api/v1/get_counts"
+USER_TODAY_STATUS = "/growth_api/v2/get_today_status"
+USER_CHECK_IN = "/growth_api/v1/check_in"
+USER_INFO_PACK = "/user_api/v1/user/get_info_pack"
+USER_RANK = "/user_api/v1/quality_user/rank"
+USER_DYNAMIC = "/user_api/v1/user/dynamic"
+
+# Methods idempotent by HTTP semantics, used for endpoints missing from the registry
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+
+# A probe is called with the client and the request data of a failed mutation and
+# returns True (or an awaitable of True) only when the write provably did not land
+Probe = Callable[[Any, Any], Any]
+
+
+class Endpoint:
+    """Description of one API endpoint"""
+
+    def __init__(self, path: str, method: str = "POST", idempotent: bool = False,
+                 probe: Optional[Probe] = None):
+        """
+        Parameters:
+            path: Endpoint path, e.g. "/content_api/v1/article/detail"
+            method: HTTP method
+            idempotent: Whether repeating the call is harmless, i.e. it is a read
+            probe: For mutations, checks whether a failed write did not land
+        """
+        self.path = path
+        self.method = method
+        self.idempotent = idempotent
+        self.probe = probe
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.method} {self.path}, idempotent={self.idempotent})"
+
+
+def _field(data: Any, name: str) -> Any:
+    if isinstance(data, dict):
+        return data.get(name)
+    return getattr(data, name, None)
+
+
+def _succeeds(call: Callable[[], Any], check: Callable[[Any], bool] = lambda result: True) -> Any:
+    """Whether a client call succeeds and passes check, for sync and async clients alike"""
+    try:
+        result = call()
+    except JuejinAPIError:
+        return False
+    if isinstance(result, Awaitable):
+        async def wait():
+            try:
+                return check(await result)
+            except JuejinAPIError:
+                return False
+        return wait()
+    return check(result)
+
+
+def _draft_still_exists(client, data) -> Any:
+    return _succeeds(lambda: client.describe_article_draft_detail(_field(data, DRAFT_ID)))
+
+
+def _article_still_exists(client, data) -> Any:
+    req = DescribeArticleDetailRequest()
+    req.article_id = _field(data, ARTICLE_ID)
+    return _succeeds(lambda: client.describe_article_detail(req, fields=(ARTICLE_ID,)))
+
+
+def _not_checked_in(client, data) -> Any:
+    return _succeeds(client.describe_user_today_status, lambda checked_in: checked_in is False)
+
+
+ENDPOINTS: Dict[str, Endpoint] = {}
+
+
+def register(endpoint: Endpoint) -> Endpoint:
+    """Add or replace an endpoint of the registry"""
+    ENDPOINTS[endpoint.path] = endpoint
+    return endpoint
+
+
+def get_endpoint(path: str, method: str = "POST") -> Endpoint:
+    """Registered endpoint of a path, or one whose idempotency follows its HTTP method"""
+    endpoint = ENDPOINTS.get(path)
+    if endpoint is None:
+        endpoint = Endpoint(path, method, idempotent=method.upper() in IDEMPOTENT_METHODS)
+    return endpoint
+
+
+for _endpoint in (
+        Endpoint(ARTICLE_DRAFT_CREATE),
+        Endpoint(ARTICLE_DRAFT_UPDATE),
+        Endpoint(ARTICLE_DRAFT_DETAIL, idempotent=True),
+        Endpoint(ARTICLE_DRAFT_DELETE, probe=_draft_still_exists),
+        Endpoint(ARTICLE_DRAFT_LIST, idempotent=True),
+        Endpoint(ARTICLE_DETAIL, idempotent=True),
+        Endpoint(ARTICLE_DELETE, probe=_article_still_exists),
+        Endpoint(ARTICLE_PUBLISH),
+        Endpoint(ARTICLE_LIST, idempotent=True),
+        Endpoint(USER_COUNTS, "GET", idempotent=True),
+        Endpoint(USER_TODAY_STATUS, "GET", idempotent=True),
+        Endpoint(USER_CHECK_IN, probe=_not_checked_in),
+        Endpoint(USER_INFO_PACK, idempotent=True),
+        Endpoint(USER_RANK, idempotent=True),
+        Endpoint(USER_DYNAMIC, "GET", idempotent=True),
+):
+    register(_endpoint)
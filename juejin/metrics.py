@@ -0,0 +1,229 @@
+"""
+Request instrumentation.
+
+A client given an ``instrumentation`` calls its ``on_request_start`` and
+``on_request_end`` hooks around every ``request()`` with a RequestEvent. Without
+one, the request path only pays a few ``is not None`` checks. MetricsCollector is
+the built-in implementation, keeping per-endpoint latency histograms and counters
+that can be exported as a dict or in the Prometheus text format.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket is +Inf
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class RequestEvent:
+    """What happened during one client request"""
+
+    __slots__ = ("method", "endpoint", "started", "duration", "attempts", "status", "error_code",
+                 "bytes_sent", "bytes_received", "wire_bytes_sent", "wire_bytes_received", "cached")
+
+    def __init__(self, method: str, endpoint: str):
+        self.method = method
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        # Seconds from start to end of the call
+        self.duration: Optional[float] = None
+        # HTTP requests sent, 0 when the result came from the cache or another in-flight call
+        self.attempts = 0
+        # HTTP status of the last response, None when there was none
+        self.status: Optional[int] = None
+        # Code of the JuejinAPIError raised, None on success
+        self.error_code: Optional[int] = None
+        # Body bytes before compression and after decompression
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # Body bytes as they went over the wire, compressed
+        self.wire_bytes_sent = 0
+        self.wire_bytes_received = 0
+        self.cached = False
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+
+class Instrumentation:
+    """Base class of request hooks, override the ones you need"""
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        pass
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        pass
+
+
+class Histogram:
+    """Fixed-bucket histogram"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate of the q-quantile, interpolated linearly inside its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class EndpointStats:
+    """Counters of one endpoint"""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.requests = 0
+        self.cache_hits = 0
+        self.http_requests = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wire_bytes_sent = 0
+        self.wire_bytes_received = 0
+        self.latency = Histogram(buckets)
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+
+
+class MetricsCollector(Instrumentation):
+    """
+    Per-endpoint metrics of client requests.
+
+    Counts calls, cache hits, HTTP requests, retries and bytes (decoded and on the
+    wire, whose ratio is the saving of compressed transfer), and keeps a latency
+    histogram and the distribution of JuejinAPIError codes (-1 JSON error, -2 network
+    error, -3 unknown error, otherwise the server err_no). Cache hits are not part of
+    the latency histogram. Thread-safe, one collector can serve several clients.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Parameters:
+            buckets: Upper bounds in seconds of the latency histogram buckets
+        """
+        self.buckets = tuple(buckets)
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._endpoints.get(event.endpoint)
+            if stats is None:
+                stats = self._endpoints[event.endpoint] = EndpointStats(self.buckets)
+            stats.requests += 1
+            if event.cached:
+                stats.cache_hits += 1
+            else:
+                stats.latency.observe(event.duration)
+            stats.http_requests += event.attempts
+            stats.retries += event.retries
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+            stats.wire_bytes_sent += event.wire_bytes_sent
+            stats.wire_bytes_received += event.wire_bytes_received
+            if event.status is not None:
+                stats.statuses[event.status] += 1
+            if event.error_code is not None:
+                stats.errors[event.error_code] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Metrics of every endpoint seen, as plain dicts"""
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": stats.requests,
+                    "cache_hits": stats.cache_hits,
+                    "http_requests": stats.http_requests,
+                    "retries": stats.retries,
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "wire_bytes_sent": stats.wire_bytes_sent,
+                    "wire_bytes_received": stats.wire_bytes_received,
+                    "latency": {
+                        "count": stats.latency.count,
+                        "sum": stats.latency.sum,
+                        "p50": stats.latency.quantile(0.5),
+                        "p90": stats.latency.quantile(0.9),
+                        "p99": stats.latency.quantile(0.99),
+                    },
+                    "statuses": dict(stats.statuses),
+                    "errors": dict(stats.errors),
+                }
+                for endpoint, stats in self._endpoints.items()
+            }
+
+    def to_prometheus(self, prefix: str = "juejin") -> str:
+        """Metrics in the Prometheus text exposition format"""
+        counters = (
+            ("requests_total", "Client requests", "requests"),
+            ("cache_hits_total", "Client requests served from the response cache", "cache_hits"),
+            ("http_requests_total", "HTTP requests sent, retries included", "http_requests"),
+            ("retries_total", "HTTP requests retried", "retries"),
+            ("bytes_sent_total", "Request body bytes sent, before compression", "bytes_sent"),
+            ("bytes_received_total", "Response body bytes received, after decompression", "bytes_received"),
+            ("wire_bytes_sent_total", "Request body bytes sent over the wire", "wire_bytes_sent"),
+            ("wire_bytes_received_total", "Response body bytes received over the wire", "wire_bytes_received"),
+        )
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = []
+            for name, help_text, attr in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for endpoint, stats in endpoints:
+                    lines.append(f'{prefix}_{name}{{endpoint="{_escape(endpoint)}"}} {getattr(stats, attr)}')
+
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} Latency of client requests not served from the cache")
+            lines.append(f"# TYPE {name} histogram")
+            for endpoint, stats in endpoints:
+                label = f'endpoint="{_escape(endpoint)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), stats.latency.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{label}}} {stats.latency.sum}")
+                lines.append(f"{name}_count{{{label}}} {stats.latency.count}")
+
+            for name, help_text, attr, label_name in (
+                    ("responses_total", "HTTP responses by status", "statuses", "status"),
+                    ("errors_total", "JuejinAPIError raised by code", "errors", "code"),
+            ):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for endpoint, stats in endpoints:
+                    for value, count in sorted(getattr(stats, attr).items()):
+                        lines.append(f'{prefix}_{name}{{endpoint="{_escape(endpoint)}",{label_name}="{value}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,32 +1,143 @@
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
+
+from juejin import codec, serializers
+from juejin.projection import Projection
 
 
 class DefaultEncoder(json.JSONEncoder):
     def default(self, obj):
+        if isinstance(obj, (LazyModel, BaseModule)):
+            return obj._encode()
         if isinstance(obj, object) and hasattr(obj, '__dict__'):
             return obj.__dict__
         return super().default(obj)
 
 
 class BaseModule(object):
+    __slots__ = ()
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """原始响应字典，与缓存共享，不应修改"""
+        return self._data
+
+    def _to_dict(self) -> Dict[str, Any]:
+        return self.__dict__
 
-    def _serialize(self):
-        return json.dumps({k: v for k, v in self.__dict__.items() if v is not None})
+    def _encode(self, skip_none: bool = False) -> Dict[str, Any]:
+        """
+        编码为字典，属性中的嵌套模型由JSON编码时的default处理
+
+        编码函数按类生成并缓存，见juejin.serializers
+        """
+        return serializers.module_encoder(self, skip_none)(self)
+
+    def _serialize(self) -> bytes:
+        return codec.dumps(self._encode(skip_none=True), ensure_ascii=False, default=serializers.encode_default)
 
     def to_json(self):
-        return json.dumps(self, cls=DefaultEncoder)
+        return json.dumps(self._encode(), cls=DefaultEncoder)
 
     def from_dict(self, data: dict):
         """
-        从字典自动创建ArticleRequest对象
-        通过类型注解自动获取有效属性名
+        从字典设置已有的属性，其余键忽略
+        """
+        return serializers.module_decoder(self)(self, data)
+
+
+class Field:
+    """
+    响应模型字段描述符
+
+    首次访问时才从原始字典读取取值，嵌套模型在首次访问时构建并缓存
+    """
+
+    __slots__ = ("name", "default", "model", "many")
+
+    def __init__(self, default: Any = None, model: Optional[type] = None, many: bool = False):
+        """
+        参数:
+            default: 原始字典中缺少该字段时的默认值
+            model: 嵌套模型类，取值为字典(或many=True时为字典列表)时使用
+            many: 取值是否为嵌套模型列表
+        """
+        self.default = default
+        self.model = model
+        self.many = many
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        values = obj._values
+        if values is not None and self.name in values:
+            return values[self.name]
+        value = obj._data.get(self.name, self.default)
+        if self.model is not None:
+            if self.many:
+                value = [self.model(item) for item in value or ()]
+            else:
+                value = self.model(value)
+        elif not isinstance(value, (list, dict)) or self.name in obj._data:
+            return value
+        else:
+            # 缺省的可变默认值每个对象各持有一份
+            value = type(value)(value)
+        if values is None:
+            values = obj._values = {}
+        values[self.name] = value
+        return value
+
+    def __set__(self, obj, value):
+        if obj._values is None:
+            obj._values = {}
+        obj._values[self.name] = value
+
+
+class LazyModel:
+    """
+    惰性响应模型基类
+
+    只保存原始响应字典，字段和嵌套对象在首次访问时才构建，
+    原始字典不会被修改，可以与缓存共享
+    """
+
+    __slots__ = ("_data", "_values")
+
+    _fields: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(dict.fromkeys(name for klass in reversed(cls.__mro__)
+                                          for name, attr in vars(klass).items() if isinstance(attr, Field)))
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, **kwargs):
+        self._data = data if data is not None else kwargs
+        self._values = None
+
+    def _to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def _encode(self, skip_none: bool = False) -> Dict[str, Any]:
+        """
+        编码为字典
+
+        未访问过的嵌套字段直接从原始字典编码，不构建嵌套模型
         """
-        attrs = self.__dict__
-        for k, v in data.items():
-            if k in attrs:
-                setattr(self, k, v)
-        return self
+        out = serializers.lazy_encoder(type(self))(self)
+        if skip_none:
+            return {k: v for k, v in out.items() if v is not None}
+        return out
+
+    def from_dict(self, data: dict):
+        return serializers.lazy_decoder(type(self))(self, data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r:.80})"
 
 
 class ArticleRequest(BaseModule):
@@ -102,218 +213,244 @@ class DescribeArticleDetailRequest(BaseModule):
         self.req_from = 1
 
 
-class University:
-    def __init__(self, university_id: str, name: str, logo: str):
-        self.university_id = university_id
-        self.name = name
-        self.logo = logo
-
-
-class Major:
-    def __init__(self, major_id: str, parent_id: str, name: str):
-        self.major_id = major_id
-        self.parent_id = parent_id
-        self.name = name
-
-
-class UserGrowthInfo:
-    def __init__(self, data: Dict[str, Any]):
-        self.user_id = data.get("user_id")
-        self.jpower = data.get("jpower")
-        self.jscore = data.get("jscore")
-        self.jpower_level = data.get("jpower_level")
-        self.jscore_level = data.get("jscore_level")
-        self.jscore_title = data.get("jscore_title")
-        self.author_achievement_list = data.get("author_achievement_list", [])
-        self.vip_level = data.get("vip_level")
-        self.vip_title = data.get("vip_title")
-        self.jscore_next_level_score = data.get("jscore_next_level_score")
-        self.jscore_this_level_mini_score = data.get("jscore_this_level_mini_score")
-        self.vip_score = data.get("vip_score")
-
-
-class UserPrivInfo:
-    def __init__(self, data: Dict[str, Any]):
-        self.administrator = data.get("administrator", 0)
-        self.builder = data.get("builder", 0)
-        self.favorable_author = data.get("favorable_author", 0)
-        self.book_author = data.get("book_author", 0)
-        self.forbidden_words = data.get("forbidden_words", 0)
-        self.can_tag_cnt = data.get("can_tag_cnt", 0)
-        self.auto_recommend = data.get("auto_recommend", 0)
-        self.signed_author = data.get("signed_author", 0)
-        self.popular_author = data.get("popular_author", 0)
-        self.can_add_video = data.get("can_add_video", 0)
-
-
-class AuthorUserInfo:
-    def __init__(self, data: Dict[str, Any]):
-        self.user_id = data.get("user_id")
-        self.user_name = data.get("user_name")
-        self.company = data.get("company")
-        self.job_title = data.get("job_title")
-        self.avatar_large = data.get("avatar_large")
-        self.level = data.get("level")
-        self.description = data.get("description")
-        self.followee_count = data.get("followee_count")
-        self.follower_count = data.get("follower_count")
-        self.post_article_count = data.get("post_article_count")
-        self.digg_article_count = data.get("digg_article_count")
-        self.got_digg_count = data.get("got_digg_count")
-        self.got_view_count = data.get("got_view_count")
-        self.post_shortmsg_count = data.get("post_shortmsg_count")
-        self.digg_shortmsg_count = data.get("digg_shortmsg_count")
-        self.isfollowed = data.get("isfollowed", False)
-        self.favorable_author = data.get("favorable_author", 0)
-        self.power = data.get("power")
-        self.study_point = data.get("study_point")
-        self.university = University(**data.get("university", {}))
-        self.major = Major(**data.get("major", {}))
-        self.student_status = data.get("student_status")
-        self.select_event_count = data.get("select_event_count")
-        self.select_online_course_count = data.get("select_online_course_count")
-        self.identity = data.get("identity")
-        self.is_select_annual = data.get("is_select_annual", False)
-        self.select_annual_rank = data.get("select_annual_rank")
-        self.annual_list_type = data.get("annual_list_type")
-        self.extraMap = data.get("extraMap", {})
-        self.is_logout = data.get("is_logout")
-        self.annual_info = data.get("annual_info", [])
-        self.account_amount = data.get("account_amount")
-        self.user_growth_info = UserGrowthInfo(data.get("user_growth_info", {}))
-        self.is_vip = data.get("is_vip", False)
-        self.become_author_days = data.get("become_author_days")
-        self.collection_set_article_count = data.get("collection_set_article_count")
-        self.recommend_article_count_daily = data.get("recommend_article_count_daily")
-        self.article_collect_count_daily = data.get("article_collect_count_daily")
-        self.user_priv_info = UserPrivInfo(data.get("user_priv_info", {}))
-
-
-class Tag:
-    def __init__(self, data: Dict[str, Any]):
-        self.id = data.get("id")
-        self.tag_id = data.get("tag_id")
-        self.tag_name = data.get("tag_name")
-        self.color = data.get("color")
-        self.icon = data.get("icon")
-        self.back_ground = data.get("back_ground")
-        self.show_navi = data.get("show_navi")
-        self.ctime = data.get("ctime")
-        self.mtime = data.get("mtime")
-        self.id_type = data.get("id_type")
-        self.tag_alias = data.get("tag_alias")
-        self.post_article_count = data.get("post_article_count")
-        self.concern_user_count = data.get("concern_user_count")
-
-
-class UserInteract:
-    def __init__(self, data: Dict[str, Any]):
-        self.id = data.get("id")
-        self.omitempty = data.get("omitempty")
-        self.user_id = data.get("user_id")
-        self.is_digg = data.get("is_digg", False)
-        self.is_follow = data.get("is_follow", False)
-        self.is_collect = data.get("is_collect", False)
-        self.collect_set_count = data.get("collect_set_count")
-
-
-class Org:
-    def __init__(self, data: Dict[str, Any]):
-        self.is_followed = data.get("is_followed", False)
-
-
-class Status:
-    def __init__(self, data: Dict[str, Any]):
-        self.push_status = data.get("push_status")
-
-
-class Theme:
-    def __init__(self, data: Dict[str, Any]):
-        self.theme_id = data.get("theme_id")
-        self.name = data.get("name")
-        self.cover = data.get("cover")
-        self.brief = data.get("brief")
-        self.is_lottery = data.get("is_lottery", False)
-        self.is_rec = data.get("is_rec", False)
-        self.rec_rank = data.get("rec_rank")
-        self.topic_ids = data.get("topic_ids", [])
-        self.hot = data.get("hot")
-        self.view_cnt = data.get("view_cnt")
-        self.user_cnt = data.get("user_cnt")
-        self.status = data.get("status")
-        self.ctime = data.get("ctime")
-        self.mtime = data.get("mtime")
-        self.lottery_begin_time = data.get("lottery_begin_time")
-        self.lottery_end_time = data.get("lottery_end_time")
-        self.theme_type = data.get("theme_type")
-        self.last_hot = data.get("last_hot")
-        self.has_expiration = data.get("has_expiration", False)
-        self.valid_begin_time = data.get("valid_begin_time")
-        self.valid_end_time = data.get("valid_end_time")
-        self.expired = data.get("expired")
-
-
-class ThemeListItem:
-    def __init__(self, data: Dict[str, Any]):
-        self.theme = Theme(data.get("theme", {}))
-
-
-class ArticleInfo:
-    def __init__(self, data: Dict[str, Any]):
-        self.article_id = data.get("article_id")
-        self.user_id = data.get("user_id")
-        self.category_id = data.get("category_id")
-        self.tag_ids = data.get("tag_ids", [])
-        self.visible_level = data.get("visible_level")
-        self.link_url = data.get("link_url")
-        self.cover_image = data.get("cover_image")
-        self.is_gfw = data.get("is_gfw")
-        self.title = data.get("title")
-        self.brief_content = data.get("brief_content")
-        self.is_english = data.get("is_english")
-        self.is_original = data.get("is_original")
-        self.user_index = data.get("user_index")
-        self.original_type = data.get("original_type")
-        self.original_author = data.get("original_author")
-        self.content = data.get("content")
-        self.ctime = data.get("ctime")
-        self.mtime = data.get("mtime")
-        self.rtime = data.get("rtime")
-        self.draft_id = data.get("draft_id")
-        self.view_count = data.get("view_count")
-        self.collect_count = data.get("collect_count")
-        self.digg_count = data.get("digg_count")
-        self.comment_count = data.get("comment_count")
-        self.hot_index = data.get("hot_index")
-        self.is_hot = data.get("is_hot")
-        self.rank_index = data.get("rank_index")
-        self.status = data.get("status")
-        self.verify_status = data.get("verify_status")
-        self.audit_status = data.get("audit_status")
-        self.mark_content = data.get("mark_content")
-        self.display_count = data.get("display_count")
-        self.is_markdown = data.get("is_markdown")
-        self.app_html_content = data.get("app_html_content")
-        self.version = data.get("version")
-        self.web_html_content = data.get("web_html_content")
-        self.meta_info = data.get("meta_info")
-        self.catalog = data.get("catalog")
-        self.homepage_top_time = data.get("homepage_top_time")
-        self.homepage_top_status = data.get("homepage_top_status")
-        self.content_count = data.get("content_count")
-        self.read_time = data.get("read_time")
-        self.pics_expire_time = data.get("pics_expire_time")
-
-
-class DescribeArticleDetailResponse(BaseModule):
-    def __init__(self, data: Dict[str, Any]):
-        self.article_id = data.get("article_id")
-        self.article_info = ArticleInfo(data.get("article_info", {}))
-        self.author_user_info = AuthorUserInfo(data.get("author_user_info", {}))
-        self.category = data.get("category")
-        self.tags = [Tag(tag) for tag in data.get("tags", [])]
-        self.user_interact = UserInteract(data.get("user_interact", {}))
-        self.org = Org(data.get("org", {}))
-        self.req_id = data.get("req_id")
-        self.status = Status(data.get("status", {}))
-        self.theme_list = [ThemeListItem(item) for item in data.get("theme_list", [])]
+class University(LazyModel):
+    __slots__ = ()
+
+    university_id = Field()
+    name = Field()
+    logo = Field()
+
+
+class Major(LazyModel):
+    __slots__ = ()
+
+    major_id = Field()
+    parent_id = Field()
+    name = Field()
+
+
+class UserGrowthInfo(LazyModel):
+    __slots__ = ()
+
+    user_id = Field()
+    jpower = Field()
+    jscore = Field()
+    jpower_level = Field()
+    jscore_level = Field()
+    jscore_title = Field()
+    author_achievement_list = Field(default=[])
+    vip_level = Field()
+    vip_title = Field()
+    jscore_next_level_score = Field()
+    jscore_this_level_mini_score = Field()
+    vip_score = Field()
+
+
+class UserPrivInfo(LazyModel):
+    __slots__ = ()
+
+    administrator = Field(default=0)
+    builder = Field(default=0)
+    favorable_author = Field(default=0)
+    book_author = Field(default=0)
+    forbidden_words = Field(default=0)
+    can_tag_cnt = Field(default=0)
+    auto_recommend = Field(default=0)
+    signed_author = Field(default=0)
+    popular_author = Field(default=0)
+    can_add_video = Field(default=0)
+
+
+class AuthorUserInfo(LazyModel):
+    __slots__ = ()
+
+    user_id = Field()
+    user_name = Field()
+    company = Field()
+    job_title = Field()
+    avatar_large = Field()
+    level = Field()
+    description = Field()
+    followee_count = Field()
+    follower_count = Field()
+    post_article_count = Field()
+    digg_article_count = Field()
+    got_digg_count = Field()
+    got_view_count = Field()
+    post_shortmsg_count = Field()
+    digg_shortmsg_count = Field()
+    isfollowed = Field(default=False)
+    favorable_author = Field(default=0)
+    power = Field()
+    study_point = Field()
+    university = Field(model=University)
+    major = Field(model=Major)
+    student_status = Field()
+    select_event_count = Field()
+    select_online_course_count = Field()
+    identity = Field()
+    is_select_annual = Field(default=False)
+    select_annual_rank = Field()
+    annual_list_type = Field()
+    extraMap = Field(default={})
+    is_logout = Field()
+    annual_info = Field(default=[])
+    account_amount = Field()
+    user_growth_info = Field(model=UserGrowthInfo)
+    is_vip = Field(default=False)
+    become_author_days = Field()
+    collection_set_article_count = Field()
+    recommend_article_count_daily = Field()
+    article_collect_count_daily = Field()
+    user_priv_info = Field(model=UserPrivInfo)
+
+
+class Tag(LazyModel):
+    __slots__ = ()
+
+    id = Field()
+    tag_id = Field()
+    tag_name = Field()
+    color = Field()
+    icon = Field()
+    back_ground = Field()
+    show_navi = Field()
+    ctime = Field()
+    mtime = Field()
+    id_type = Field()
+    tag_alias = Field()
+    post_article_count = Field()
+    concern_user_count = Field()
+
+
+class UserInteract(LazyModel):
+    __slots__ = ()
+
+    id = Field()
+    omitempty = Field()
+    user_id = Field()
+    is_digg = Field(default=False)
+    is_follow = Field(default=False)
+    is_collect = Field(default=False)
+    collect_set_count = Field()
+
+
+class Org(LazyModel):
+    __slots__ = ()
+
+    is_followed = Field(default=False)
+
+
+class Status(LazyModel):
+    __slots__ = ()
+
+    push_status = Field()
+
+
+class Theme(LazyModel):
+    __slots__ = ()
+
+    theme_id = Field()
+    name = Field()
+    cover = Field()
+    brief = Field()
+    is_lottery = Field(default=False)
+    is_rec = Field(default=False)
+    rec_rank = Field()
+    topic_ids = Field(default=[])
+    hot = Field()
+    view_cnt = Field()
+    user_cnt = Field()
+    status = Field()
+    ctime = Field()
+    mtime = Field()
+    lottery_begin_time = Field()
+    lottery_end_time = Field()
+    theme_type = Field()
+    last_hot = Field()
+    has_expiration = Field(default=False)
+    valid_begin_time = Field()
+    valid_end_time = Field()
+    expired = Field()
+
+
+class ThemeListItem(LazyModel):
+    __slots__ = ()
+
+    theme = Field(model=Theme)
+
+
+class ArticleInfo(LazyModel):
+    __slots__ = ()
+
+    article_id = Field()
+    user_id = Field()
+    category_id = Field()
+    tag_ids = Field(default=[])
+    visible_level = Field()
+    link_url = Field()
+    cover_image = Field()
+    is_gfw = Field()
+    title = Field()
+    brief_content = Field()
+    is_english = Field()
+    is_original = Field()
+    user_index = Field()
+    original_type = Field()
+    original_author = Field()
+    content = Field()
+    ctime = Field()
+    mtime = Field()
+    rtime = Field()
+    draft_id = Field()
+    view_count = Field()
+    collect_count = Field()
+    digg_count = Field()
+    comment_count = Field()
+    hot_index = Field()
+    is_hot = Field()
+    rank_index = Field()
+    status = Field()
+    verify_status = Field()
+    audit_status = Field()
+    mark_content = Field()
+    display_count = Field()
+    is_markdown = Field()
+    app_html_content = Field()
+    version = Field()
+    web_html_content = Field()
+    meta_info = Field()
+    catalog = Field()
+    homepage_top_time = Field()
+    homepage_top_status = Field()
+    content_count = Field()
+    read_time = Field()
+    pics_expire_time = Field()
+
+
+class DescribeArticleDetailResponse(LazyModel, BaseModule):
+    __slots__ = ()
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, fields: Optional[Iterable[str]] = None,
+                 exclude: Optional[Iterable[str]] = None):
+        """
+        参数:
+            data: 文章详情接口返回的data字段
+            fields: 只保留的字段路径，如"article_info.title"，默认保留全部
+            exclude: 丢弃的字段路径，如HEAVY_CONTENT_FIELDS，原始字典不会被修改
+        """
+        projection = Projection.of(fields, exclude)
+        if projection is not None and data is not None:
+            data = projection.apply(data)
+        super().__init__(data)
+
+    article_id = Field()
+    article_info = Field(model=ArticleInfo)
+    author_user_info = Field(model=AuthorUserInfo)
+    category = Field()
+    tags = Field(model=Tag, many=True)
+    user_interact = Field(model=UserInteract)
+    org = Field(model=Org)
+    req_id = Field()
+    status = Field(model=Status)
+    theme_list = Field(model=ThemeListItem, many=True)
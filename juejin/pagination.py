@@ -0,0 +1,144 @@
+import copy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from juejin.models import DescribeArticleListRequest
+
+
+def page_items(rsp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Items of a list page"""
+    return rsp.get("data") or []
+
+
+def has_more(rsp: Dict[str, Any], page_size: int) -> bool:
+    """Whether the server reports pages after this one"""
+    items = page_items(rsp)
+    if not items:
+        return False
+    if "has_more" in rsp:
+        return bool(rsp["has_more"])
+    # Without the flag, the cursor (offset after this page) tells whether items are left
+    try:
+        return int(rsp["cursor"]) < int(rsp["count"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    # Fall back to a short page when the server omits both
+    return len(items) >= page_size
+
+
+def total_count(rsp: Dict[str, Any]) -> Optional[int]:
+    """Total number of items the server reports, None if it reports none"""
+    try:
+        return int(rsp["count"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _last_page(rsp: Dict[str, Any], page_size: int) -> Optional[int]:
+    """Number of the last page by the total count the server reports, None if it reports none"""
+    count = total_count(rsp)
+    if count is None:
+        return None
+    return max(1, -(-count // page_size))
+
+
+def _prefetch_limit(rsp: Dict[str, Any], page_size: int, page_no: int, prefetch: int) -> int:
+    """Last page to have in flight while page_no is consumed, never past the last page"""
+    limit = page_no + prefetch
+    last_page = _last_page(rsp, page_size)
+    if last_page is not None:
+        # has_more said there is a next page, so fetch it even if count disagrees
+        limit = min(limit, max(last_page, page_no + 1))
+    return limit
+
+
+def page_request(req: DescribeArticleListRequest, page_no: int) -> DescribeArticleListRequest:
+    """Copy of a list request asking for another page"""
+    page = copy.copy(req)
+    page.page_no = page_no
+    return page
+
+
+def iter_pages(fetch: Callable[[DescribeArticleListRequest], Dict[str, Any]],
+               req: DescribeArticleListRequest,
+               prefetch: int = 2) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the items of every page, fetching up to ``prefetch`` pages ahead.
+
+    Args:
+        fetch: Callable returning the full response body of one page.
+        req: Request of the first page, it is copied and never modified.
+        prefetch: Number of pages fetched in the background while the caller
+            consumes the current one. 0 fetches pages strictly on demand.
+
+    At most ``prefetch + 1`` pages are held in memory at any time. Prefetching
+    starts once the first page shows there are more, and never goes past the
+    last page by the count the server reports.
+    """
+    page_no = req.page_no or 1
+    rsp = fetch(page_request(req, page_no))
+    if prefetch <= 0:
+        while True:
+            yield from page_items(rsp)
+            if not has_more(rsp, req.page_size):
+                return
+            page_no += 1
+            rsp = fetch(page_request(req, page_no))
+
+    pool = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="juejin-prefetch")
+    pending = deque()
+    next_page = page_no + 1
+    try:
+        while True:
+            more = has_more(rsp, req.page_size)
+            if more:
+                # Keep the window full before handing items to the caller
+                limit = _prefetch_limit(rsp, req.page_size, page_no, prefetch)
+                while next_page <= limit:
+                    pending.append(pool.submit(fetch, page_request(req, next_page)))
+                    next_page += 1
+            yield from page_items(rsp)
+            if not more:
+                return
+            rsp = pending.popleft().result()
+            page_no += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+async def aiter_pages(fetch: Callable[[DescribeArticleListRequest], Awaitable[Dict[str, Any]]],
+                      req: DescribeArticleListRequest,
+                      prefetch: int = 2) -> AsyncIterator[Dict[str, Any]]:
+    """Asyncio counterpart of :func:`iter_pages`, prefetching with tasks"""
+    import asyncio  # only async callers pay for importing asyncio
+
+    page_no = req.page_no or 1
+    prefetch = max(prefetch, 0)
+    rsp = await fetch(page_request(req, page_no))
+    pending = deque()
+    next_page = page_no + 1
+    try:
+        while True:
+            more = has_more(rsp, req.page_size)
+            if more:
+                limit = _prefetch_limit(rsp, req.page_size, page_no, prefetch)
+                while next_page <= limit:
+                    pending.append(asyncio.ensure_future(fetch(page_request(req, next_page))))
+                    next_page += 1
+            for item in page_items(rsp):
+                yield item
+            if not more:
+                return
+            if pending:
+                rsp = await pending.popleft()
+            else:
+                # No prefetching, the next page is fetched on demand
+                rsp = await fetch(page_request(req, next_page))
+                next_page += 1
+            page_no += 1
+    finally:
+        for task in pending:
+            task.cancel()
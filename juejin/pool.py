@@ -0,0 +1,186 @@
+"""
+Many accounts behind one object.
+
+JuejinClientPool holds the credentials of many accounts and runs one operation
+for all of them (or a subset) on a bounded thread pool, collecting a BatchResult
+per account. Every account gets its own JuejinClient and its own RateLimiter, so
+an account that gets throttled slows down only itself. Clients are created on
+first use and share one connection pool, so parallel calls for different
+accounts reuse the same keep-alive connections instead of each account opening
+its own.
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from juejin.batch import BatchResult, run_batch
+from juejin.breaker import CircuitBreaker
+from juejin.client import AuthConfig, JuejinClient, RequestConfig
+from juejin.metrics import Instrumentation
+from juejin.ratelimit import RateLimiter
+from juejin.retry import RetryPolicy
+
+# An operation is a client method name or a function called with the account's client
+Operation = Union[str, Callable[[JuejinClient], Any]]
+
+
+class Account:
+    """Credentials of one account"""
+
+    def __init__(self, name: str, cookie: str, auth_config: Optional[AuthConfig] = None):
+        """
+        Parameters:
+            name: Unique name of the account, the key of its results
+            cookie: Juejin authentication cookie
+            auth_config: Authentication parameters, required for sign-in
+        """
+        self.name = name
+        self.cookie = cookie
+        self.auth_config = auth_config
+
+    @classmethod
+    def from_dict(cls, record: Mapping[str, Any]) -> "Account":
+        """Account of a record with name and cookie, and optionally aid, uuid, spider, ms_token and a_bogus"""
+        auth_config = None
+        if any(key in record for key in ("aid", "uuid", "ms_token", "a_bogus")):
+            auth_config = AuthConfig()
+            for key in ("aid", "uuid", "spider", "ms_token", "a_bogus"):
+                if record.get(key) is not None:
+                    setattr(auth_config, key, str(record[key]))
+        return cls(str(record["name"]), record["cookie"], auth_config)
+
+    def __repr__(self) -> str:
+        return f"Account({self.name!r})"
+
+
+class JuejinClientPool:
+    """Clients of many accounts running the same operation in parallel, thread-safe"""
+
+    # Class of the account clients, override it to point the pool at another server
+    client_class = JuejinClient
+
+    def __init__(self, accounts: Iterable[Union[Account, Mapping[str, Any]]] = (),
+                 config: Optional[RequestConfig] = None, max_workers: int = 32,
+                 rate_limiter_factory: Optional[Callable[[], RateLimiter]] = RateLimiter,
+                 retry_policy: Optional[RetryPolicy] = None, instrumentation: Optional[Instrumentation] = None,
+                 transport: Optional[BaseAdapter] = None, circuit_breaker: Optional[CircuitBreaker] = None):
+        """
+        Parameters:
+            accounts: Accounts, or records accepted by Account.from_dict
+            config: Request configuration of every client
+            max_workers: Accounts processed at once by run()
+            rate_limiter_factory: Builds the rate limiter of each account, None disables rate limiting
+            retry_policy: Retry policy of every client, built from config by default
+            instrumentation: Request hooks shared by every client, e.g. a juejin.metrics.MetricsCollector
+            transport: Requests adapter shared by every client, by default a pooled HTTPAdapter
+                with max_workers connections per host
+            circuit_breaker: Circuit breaker shared by every client, give it per_account=True to
+                keep the circuits of the accounts apart
+        """
+        self.config = config if config is not None else RequestConfig()
+        self.max_workers = max_workers
+        self.rate_limiter_factory = rate_limiter_factory
+        self.retry_policy = retry_policy
+        self.instrumentation = instrumentation
+        self.circuit_breaker = circuit_breaker
+        if transport is None:
+            # Retries are decided per endpoint by the clients
+            transport = HTTPAdapter(pool_connections=self.config.pool_connections,
+                                    pool_maxsize=max(max_workers, self.config.pool_maxsize),
+                                    pool_block=self.config.pool_block, max_retries=0)
+        self.transport = transport
+        self._accounts: Dict[str, Account] = {}
+        self._clients: Dict[str, JuejinClient] = {}
+        self._lock = threading.Lock()
+        for account in accounts:
+            self.add(account)
+
+    def add(self, account: Union[Account, Mapping[str, Any]]) -> None:
+        """Add an account, replacing the account of the same name"""
+        if not isinstance(account, Account):
+            account = Account.from_dict(account)
+        with self._lock:
+            self._accounts[account.name] = account
+            self._clients.pop(account.name, None)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            del self._accounts[name]
+            self._clients.pop(name, None)
+
+    @property
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._accounts)
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._accounts
+
+    def client(self, name: str) -> JuejinClient:
+        """The client of an account, created on first use"""
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                account = self._accounts[name]
+                client = self._clients[name] = self.client_class(
+                    cookie=account.cookie,
+                    auth_config=account.auth_config,
+                    config=self.config,
+                    rate_limiter=self.rate_limiter_factory() if self.rate_limiter_factory is not None else None,
+                    retry_policy=self.retry_policy,
+                    instrumentation=self.instrumentation,
+                    transport=self.transport,
+                    circuit_breaker=self.circuit_breaker,
+                )
+            return client
+
+    def _call(self, operation: Operation, args, kwargs) -> Callable[[str], Any]:
+        if isinstance(operation, str):
+            return lambda name: getattr(self.client(name), operation)(*args, **kwargs)
+        return lambda name: operation(self.client(name), *args, **kwargs)
+
+    def iter_run(self, operation: Operation, *args, names: Optional[Iterable[str]] = None,
+                 max_workers: Optional[int] = None, ordered: bool = False, **kwargs) -> Iterator[BatchResult]:
+        """
+        Run an operation for many accounts, yielding results as they complete.
+
+        Args:
+            operation: Client method name, e.g. "create_user_sign_in", or a function
+                called with the account's client. Further arguments are passed on.
+            names: Accounts to run for, all accounts by default.
+            max_workers: Accounts processed at once, the pool's max_workers by default.
+            ordered: Yield results in the order of names instead.
+
+        Returns:
+            Iterator[BatchResult]: One result per account, keyed by account name. A
+            JuejinAPIError is reported on its BatchResult and does not stop the others.
+        """
+        names = self.names if names is None else names
+        return run_batch(self._call(operation, args, kwargs), names, max_workers or self.max_workers, ordered)
+
+    def run(self, operation: Operation, *args, names: Optional[Iterable[str]] = None,
+            max_workers: Optional[int] = None, **kwargs) -> Dict[str, BatchResult]:
+        """
+        Run an operation for many accounts and wait for all of them.
+
+        Takes the arguments of iter_run. Returns the BatchResult of every account by
+        account name, in the order of names.
+        """
+        names = self.names if names is None else list(names)
+        results = {result.key: result for result in
+                   self.iter_run(operation, *args, names=names, max_workers=max_workers, **kwargs)}
+        return {name: results[name] for name in names}
+
+    def close(self) -> None:
+        """Close the shared connection pool"""
+        self.transport.close()
+
+    def __enter__(self) -> "JuejinClientPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,105 @@
+from typing import Any, Dict, Iterable, Optional, Union
+
+# Article body fields, together often several times the size of the rest of a response
+HEAVY_CONTENT_FIELDS = (
+    "article_info.content",
+    "article_info.mark_content",
+    "article_info.web_html_content",
+    "article_info.app_html_content",
+)
+
+_Tree = Dict[str, Union[bool, "_Tree"]]
+
+
+def _compile(paths: Iterable[str]) -> _Tree:
+    tree: _Tree = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for part in parents:
+            child = node.get(part)
+            if child is True:
+                break
+            if child is None:
+                child = node[part] = {}
+            node = child
+        else:
+            node[leaf] = True
+    return tree
+
+
+def _include(value: Any, tree: _Tree) -> Any:
+    if isinstance(value, list):
+        return [_include(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    out = {}
+    for key, sub in tree.items():
+        if key in value:
+            out[key] = value[key] if sub is True else _include(value[key], sub)
+    return out
+
+
+def _exclude(value: Any, tree: _Tree) -> Any:
+    if isinstance(value, list):
+        return [_exclude(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    out = {}
+    for key, item in value.items():
+        sub = tree.get(key)
+        if sub is True:
+            continue
+        out[key] = _exclude(item, sub) if sub else item
+    return out
+
+
+class Projection:
+    """
+    Field projection applied to decoded response data.
+
+    Paths are dotted keys relative to one response object, e.g. ``article_info.title``.
+    They apply to every element when they meet a list, so the same projection works
+    for a detail response and for each item of a list page.
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None):
+        """
+        Parameters:
+            fields: Paths to keep, everything else is dropped. None keeps everything
+            exclude: Paths to drop, applied after ``fields``
+        """
+        self.fields = tuple(fields) if fields is not None else None
+        self.exclude = tuple(exclude) if exclude is not None else None
+        self._fields_tree = _compile(self.fields) if self.fields is not None else None
+        self._exclude_tree = _compile(self.exclude) if self.exclude else None
+
+    @classmethod
+    def of(cls, fields: Optional[Iterable[str]] = None,
+           exclude: Optional[Iterable[str]] = None) -> Optional["Projection"]:
+        """Build a projection, or None when neither fields nor exclude is given"""
+        if fields is None and exclude is None:
+            return None
+        return cls(fields, exclude)
+
+    def apply(self, data: Any) -> Any:
+        """
+        Return a projected copy of data.
+
+        The input is never modified. Only the dicts along projected paths are copied,
+        so dropped values are released as soon as the caller drops the input.
+        """
+        if self._fields_tree is not None:
+            data = _include(data, self._fields_tree)
+        if self._exclude_tree is not None:
+            data = _exclude(data, self._exclude_tree)
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Projection) and (self.fields, self.exclude) == (other.fields, other.exclude)
+
+    def __hash__(self) -> int:
+        return hash((self.fields, self.exclude))
+
+    def __repr__(self) -> str:
+        return f"Projection(fields={self.fields!r}, exclude={self.exclude!r})"
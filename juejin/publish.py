@@ -0,0 +1,311 @@
+"""
+Draft-to-publish pipeline with a durable journal.
+
+Publishing an article takes three writes: create the draft, update it with the
+content, publish it. PublishPipeline runs them for a stream of ArticleRequests
+with a thread pool per stage, so drafts get created while earlier ones are being
+updated and published.
+
+Every write is recorded in a PublishJournal, an append-only JSON lines file
+fsynced after each record, keyed by an idempotency key of the request (a hash of
+its fields by default). Running the pipeline again with the same journal skips
+finished writes: a published request is not sent at all, a created draft is
+updated and published but not created again. Each write is journaled before it
+is sent too, so after a crash in between the pipeline looks the outcome up
+(the draft by title, the article on the draft) instead of writing twice.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from juejin.batch import BatchResult
+from juejin.client import JuejinClient
+from juejin.error import JuejinAPIError
+from juejin.models import ArticleRequest, DescribeArticleListRequest, UpdateArticleRequest
+
+logger = logging.getLogger(__name__)
+
+# Journal events in pipeline order, "creating" and "publishing" are written before the request is sent
+CREATING = "creating"
+CREATED = "created"
+UPDATED = "updated"
+PUBLISHING = "publishing"
+PUBLISHED = "published"
+
+CREATE = "create"
+UPDATE = "update"
+PUBLISH = "publish"
+STAGES = (CREATE, UPDATE, PUBLISH)
+
+# Stage to run after the last journaled event of a request, None once it is published
+_NEXT_STAGE = {None: CREATE, CREATING: CREATE, CREATED: UPDATE, UPDATED: PUBLISH, PUBLISHING: PUBLISH,
+               PUBLISHED: None}
+
+# Seconds a draft may appear to be created before its "creating" record, for clock skew
+_CLOCK_SKEW = 300
+
+
+def request_key(req: ArticleRequest) -> str:
+    """Default idempotency key of a request, a hash of its fields"""
+    body = json.dumps(req._to_dict(), sort_keys=True, ensure_ascii=True, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class PublishJournal:
+    """Append-only record of the pipeline's writes, thread-safe"""
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Parameters:
+            path: JSON lines file, created if missing and replayed if present
+            fsync: Flush every record to disk before the next write is sent
+        """
+        self.path = path
+        self.fsync = fsync
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        torn = False
+        if os.path.exists(path):
+            self._replay()
+            with open(path, "rb") as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+        self._file = open(path, "a", encoding="utf-8")
+        if torn:
+            # Keep the next record off the line of a record cut short by a crash
+            self._file.write("\n")
+
+    def _replay(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A record cut short by a crash, the write it announced is looked up on resume
+                    logger.warning(f"Skipping malformed journal record in {self.path}: {line[:80]!r}")
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        state = self._states.setdefault(record["key"], {})
+        state.update({k: v for k, v in record.items() if v is not None})
+
+    @staticmethod
+    def _public(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in state.items() if k != "run"}
+
+    def state(self, key: str) -> Dict[str, Any]:
+        """The last event of a key with the draft_id and article_id recorded so far, empty if unknown"""
+        with self._lock:
+            return self._public(self._states.get(key, {}))
+
+    def claim(self, key: str, run: object) -> Optional[Dict[str, Any]]:
+        """
+        Claim a key for a pipeline run, in memory only.
+
+        Returns the state of the key as state() does, None if the run claimed it already.
+        """
+        with self._lock:
+            state = self._states.setdefault(key, {})
+            if state.get("run") is run:
+                return None
+            state["run"] = run
+            return self._public(state)
+
+    def record(self, key: str, event: str, draft_id: Optional[str] = None,
+               article_id: Optional[str] = None) -> None:
+        """Append an event of a key, durable once this returns"""
+        record = {"key": key, "event": event, "draft_id": draft_id, "article_id": article_id, "at": time.time()}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._apply(record)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for state in self._states.values() if "event" in state)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "PublishJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class PublishResult(BatchResult):
+    """Outcome of one request of the pipeline, keyed by its idempotency key"""
+
+    def __init__(self, key: str, draft_id: Optional[str] = None, article_id: Optional[str] = None,
+                 error: Optional[JuejinAPIError] = None, stage: Optional[str] = None):
+        """
+        Parameters:
+            key: Idempotency key of the request
+            draft_id: ID of the draft, None if it was not created
+            article_id: ID of the published article, the value of the result
+            error: The JuejinAPIError of the failed stage, None on success
+            stage: The stage that failed, None on success
+        """
+        super().__init__(key, article_id if error is None else None, error)
+        self.draft_id = draft_id
+        self.article_id = article_id
+        self.stage = stage
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"PublishResult(key={self.key!r}, draft_id={self.draft_id!r}, article_id={self.article_id!r})"
+        return f"PublishResult(key={self.key!r}, draft_id={self.draft_id!r}, stage={self.stage!r}, error={self.error!r})"
+
+
+class _Item:
+    __slots__ = ("key", "req", "state")
+
+    def __init__(self, key: str, req: ArticleRequest, state: Dict[str, Any]):
+        self.key = key
+        self.req = req
+        self.state = state
+
+
+class PublishPipeline:
+    """Creates, updates and publishes drafts concurrently, resuming from a journal"""
+
+    def __init__(self, client: JuejinClient, journal: PublishJournal, create_workers: int = 2,
+                 update_workers: int = 4, publish_workers: int = 2,
+                 key: Callable[[ArticleRequest], str] = request_key):
+        """
+        Parameters:
+            client: Client of the account publishing the articles
+            journal: Journal of the writes, shared by the runs that should not repeat them
+            create_workers: Drafts created at once
+            update_workers: Drafts updated at once
+            publish_workers: Drafts published at once
+            key: Idempotency key of a request, requests with the same key are published once
+        """
+        self.client = client
+        self.journal = journal
+        self.workers = {CREATE: create_workers, UPDATE: update_workers, PUBLISH: publish_workers}
+        self.key = key
+
+    def run(self, reqs: Iterable[ArticleRequest]) -> Iterator[PublishResult]:
+        """
+        Publish articles, yielding results as they complete.
+
+        Args:
+            reqs (Iterable[ArticleRequest]): Articles to publish, consumed lazily.
+                A request whose key was seen earlier in the same run is skipped.
+
+        Returns:
+            Iterator[PublishResult]: One result per request. A failed stage is reported on
+            its result and does not stop the others; running again resumes at that stage.
+        """
+        results: "queue.Queue[PublishResult]" = queue.Queue()
+        executors = {stage: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"juejin-{stage}")
+                     for stage, workers in self.workers.items()}
+        # Bound the requests in flight so memory does not grow with the input
+        window = 2 * sum(self.workers.values())
+        in_flight = 0
+        # Claims of this run in the journal, the journal holds a state per key anyway
+        run = object()
+        # Set once the caller stops iterating, so steps still queued do not run
+        stopped = threading.Event()
+
+        def advance(item: _Item) -> None:
+            stage = _NEXT_STAGE[item.state.get("event")]
+            if stage is None:
+                results.put(PublishResult(item.key, item.state.get("draft_id"), item.state.get("article_id")))
+                return
+            try:
+                executors[stage].submit(step, stage, item)
+            except RuntimeError:
+                # The executor is shut down, the caller stopped iterating
+                pass
+
+        def step(stage: str, item: _Item) -> None:
+            if stopped.is_set():
+                return
+            try:
+                getattr(self, f"_{stage}")(item)
+            except Exception as e:
+                if not isinstance(e, JuejinAPIError):
+                    logger.error(f"Unknown error in stage {stage}: {str(e)}", exc_info=True)
+                    e = JuejinAPIError(f"Unknown error: {str(e)}", -3)
+                results.put(PublishResult(item.key, item.state.get("draft_id"), error=e, stage=stage))
+                return
+            advance(item)
+
+        try:
+            for req in reqs:
+                key = self.key(req)
+                state = self.journal.claim(key, run)
+                if state is None:
+                    continue
+                advance(_Item(key, req, state))
+                in_flight += 1
+                while in_flight >= window:
+                    yield results.get()
+                    in_flight -= 1
+            while in_flight:
+                yield results.get()
+                in_flight -= 1
+        finally:
+            # Stages feed the next one, so shut them down in order; running writes finish and are journaled
+            stopped.set()
+            for stage in STAGES:
+                executors[stage].shutdown(wait=True)
+
+    def _record(self, item: _Item, event: str, **ids: Optional[str]) -> None:
+        self.journal.record(item.key, event, **ids)
+        item.state = self.journal.state(item.key)
+
+    def _create(self, item: _Item) -> None:
+        if item.state.get("event") == CREATING:
+            draft_id = self._find_created_draft(item.req, item.state["at"])
+            if draft_id is not None:
+                logger.info(f"Resuming {item.key} with the draft {draft_id} created before")
+                self._record(item, CREATED, draft_id=draft_id)
+                return
+        self._record(item, CREATING)
+        data = self.client.create_article_draft(item.req)
+        self._record(item, CREATED, draft_id=str(data["id"]))
+
+    def _find_created_draft(self, req: ArticleRequest, since: float) -> Optional[str]:
+        """ID of a draft titled like the request created after since, None if there is none"""
+        query = DescribeArticleListRequest()
+        query.keyword = req.title
+        query.page_size = 20
+        for item in self.client.describe_article_draft_list(query) or ():
+            draft = item.get("article_draft", item)
+            if draft.get("title") == req.title and int(draft.get("ctime") or 0) >= since - _CLOCK_SKEW:
+                return str(draft["id"])
+        return None
+
+    def _update(self, item: _Item) -> None:
+        draft_id = item.state["draft_id"]
+        update = UpdateArticleRequest(draft_id).from_dict(item.req._to_dict())
+        update.id = draft_id
+        self.client.update_article_draft(update)
+        self._record(item, UPDATED)
+
+    def _publish(self, item: _Item) -> None:
+        draft_id = item.state["draft_id"]
+        if item.state.get("event") == PUBLISHING:
+            draft = self.client.describe_article_draft_detail(draft_id).get("article_draft") or {}
+            if str(draft.get("article_id") or "0") != "0":
+                self._record(item, PUBLISHED, article_id=str(draft["article_id"]))
+                return
+        self._record(item, PUBLISHING)
+        data = self.client.publish_article_draft(draft_id)
+        self._record(item, PUBLISHED, article_id=str(data["article_id"]))
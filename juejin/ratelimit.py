@@ -0,0 +1,150 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket handing out reservations.
+
+    reserve() always takes a token and returns how long the caller must wait
+    before using it, so the bucket can go into debt. That way blocking callers and
+    asyncio callers can share a bucket without holding a lock while they wait.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Parameters:
+            rate: Tokens added per second
+            capacity: Maximum burst, defaults to one second worth of tokens
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take one token, returning the seconds to wait before it is available"""
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def set_rate(self, rate: float, now: float) -> None:
+        self._refill(now)
+        self.rate = rate
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter with a global bucket and optional per-endpoint buckets.
+
+    The limiter is thread-safe and can be shared by several JuejinClient and
+    AsyncJuejinClient instances. When a response shows throttling it applies AIMD
+    (additive increase, multiplicative decrease): every throttled response cuts the
+    current rates by ``decrease_factor``, and every successful response (err_no 0)
+    wins back ``recovery`` of the configured rate, until the configured rate is
+    reached again. Clients feed back every HTTP attempt once, retries included.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: Optional[float] = None,
+                 endpoint_rates: Optional[Dict[str, float]] = None,
+                 throttle_status_codes: Iterable[int] = (429,),
+                 throttle_err_nos: Iterable[int] = (),
+                 decrease_factor: float = 0.5, recovery: float = 0.02,
+                 min_rate: float = 0.2, cooldown: float = 1.0):
+        """
+        Parameters:
+            rate: Global requests per second
+            burst: Global burst size, defaults to one second worth of requests
+            endpoint_rates: Requests per second of individual endpoints
+            throttle_status_codes: HTTP status codes meaning the server throttled us
+            throttle_err_nos: API err_no values meaning the server throttled us
+            decrease_factor: Factor applied to the current rate on throttling
+            recovery: Fraction of the configured rate regained per successful response
+            min_rate: Lower bound of the adaptive rate
+            cooldown: Seconds during which further throttled responses do not cut the rate again
+        """
+        self.throttle_status_codes = frozenset(throttle_status_codes)
+        self.throttle_err_nos = frozenset(throttle_err_nos)
+        self.decrease_factor = decrease_factor
+        self.recovery = recovery
+        self.min_rate = min_rate
+        self.cooldown = cooldown
+        self.throttled = 0
+        self._base_rates: Dict[Optional[str], float] = {None: rate}
+        self._buckets: Dict[Optional[str], TokenBucket] = {None: TokenBucket(rate, burst)}
+        for endpoint, endpoint_rate in (endpoint_rates or {}).items():
+            self._base_rates[endpoint] = endpoint_rate
+            self._buckets[endpoint] = TokenBucket(endpoint_rate)
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def reserve(self, endpoint: str) -> float:
+        """Reserve a request slot, returning the seconds to wait before sending"""
+        now = time.monotonic()
+        with self._lock:
+            wait = self._buckets[None].reserve(now)
+            bucket = self._buckets.get(endpoint)
+            if bucket is not None:
+                wait = max(wait, bucket.reserve(now))
+            return wait
+
+    def acquire(self, endpoint: str) -> None:
+        """Block the calling thread until a request to endpoint may be sent"""
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: str) -> None:
+        """Suspend the calling coroutine until a request to endpoint may be sent"""
+        import asyncio  # only async callers pay for importing asyncio
+
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def is_throttled(self, status: Optional[int] = None, err_no: Optional[int] = None) -> bool:
+        return status in self.throttle_status_codes or err_no in self.throttle_err_nos
+
+    def record(self, endpoint: str, status: Optional[int] = None, err_no: Optional[int] = None) -> None:
+        """
+        Feed back the outcome of a request, adapting the rates.
+
+        A throttled outcome cuts the rates and a response with err_no 0 wins some back.
+        Any other failure, e.g. a network error (-2) or a 5xx, leaves them unchanged.
+        """
+        if self.is_throttled(status, err_no):
+            self._decrease(endpoint)
+        elif err_no == 0:
+            self._increase(endpoint)
+
+    def rate(self, endpoint: Optional[str] = None) -> float:
+        """Current rate of an endpoint bucket, or of the global bucket"""
+        bucket = self._buckets.get(endpoint, self._buckets[None])
+        return bucket.rate
+
+    def _decrease(self, endpoint: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.throttled += 1
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            for key in (None, endpoint):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.set_rate(max(self.min_rate, bucket.rate * self.decrease_factor), now)
+
+    def _increase(self, endpoint: str) -> None:
+        with self._lock:
+            for key in (None, endpoint):
+                bucket = self._buckets.get(key)
+                base = self._base_rates.get(key)
+                if bucket is not None and bucket.rate < base:
+                    bucket.set_rate(min(base, bucket.rate + base * self.recovery), time.monotonic())
@@ -0,0 +1,96 @@
+import email.utils
+import random
+import time
+from typing import Iterable, Optional
+
+from juejin.endpoints import Endpoint
+
+# Retry decisions
+GIVE_UP = "give_up"
+RETRY = "retry"
+PROBE = "probe"
+
+# Statuses telling the request was refused before it was processed
+REJECTED_STATUS_CODES = frozenset({429})
+
+
+class RetryPolicy:
+    """
+    Decides which failed calls are retried and how long to wait in between.
+
+    Idempotent endpoints are retried on connection errors, timeouts and the
+    configured statuses. A mutation is retried only when the failure shows the
+    write did not land: the connection was never established, or the server
+    refused the request (429). Otherwise it is retried only when the endpoint's
+    probe confirms the write is absent. Waits use exponential backoff with full
+    jitter and honour ``Retry-After``.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5,
+                 status_codes: Iterable[int] = (429, 500, 502, 503, 504),
+                 max_backoff: float = 30.0, max_retry_after: float = 120.0):
+        """
+        Parameters:
+            max_retries: Retries after the first attempt
+            backoff_factor: Base of the exponential backoff in seconds
+            status_codes: HTTP statuses worth retrying
+            max_backoff: Upper bound of a computed backoff
+            max_retry_after: Upper bound of a server supplied Retry-After
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.status_codes = frozenset(status_codes)
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+    @classmethod
+    def from_config(cls, config) -> "RetryPolicy":
+        """Policy of a RequestConfig"""
+        return cls(config.max_retries, config.retry_backoff_factor, config.retry_status_codes,
+                   config.retry_max_backoff)
+
+    def retryable_status(self, status: int) -> bool:
+        return status in self.status_codes
+
+    def decide(self, endpoint: Endpoint, attempt: int, sent: bool, status: Optional[int] = None) -> str:
+        """
+        Decide what to do after a failed attempt.
+
+        Args:
+            endpoint (Endpoint): The endpoint called.
+            attempt (int): Number of attempts made so far, starting at 1.
+            sent (bool): Whether the request may have reached the server.
+            status (int): HTTP status of the response, None when there was none.
+
+        Returns:
+            str: RETRY, PROBE (retry only if the endpoint's probe says the write did not land) or GIVE_UP.
+        """
+        if attempt > self.max_retries:
+            return GIVE_UP
+        if status is not None and not self.retryable_status(status):
+            return GIVE_UP
+        if endpoint.idempotent or not sent or status in REJECTED_STATUS_CODES:
+            return RETRY
+        if endpoint.probe is not None:
+            return PROBE
+        return GIVE_UP
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before the next attempt, attempt starting at 1"""
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1))))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Seconds of a Retry-After header given as delta-seconds or an HTTP date"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return date.timestamp() - time.time()
@@ -0,0 +1,208 @@
+"""
+Local full-text search over fetched articles and drafts.
+
+SearchIndex keeps an SQLite FTS5 index of title, brief_content and mark_content.
+FTS5's own tokenizers do not split Chinese text into words, so text is tokenized
+here: latin words are lowercased and CJK runs become overlapping bigrams, the
+usual approach for CJK search without a dictionary. A query word matches as a
+phrase of its bigrams, so "性能优化" finds exactly that character sequence.
+The last character of a run is indexed alone too, so a one-character query
+matches as a prefix of a bigram or as that character.
+Results are ranked with bm25, title matches weighing most.
+
+Give the index to a client (``JuejinClient(search_index=...)``) to index article
+and draft details as they are fetched, drafts as they are created or updated,
+and to drop deleted ones. Give it to a SyncEngine to index what a sync fetches.
+Documents whose text did not change are not rewritten.
+"""
+import functools
+import hashlib
+import re
+import sqlite3
+import threading
+from typing import Any, Iterator, List, Optional, Tuple
+
+from juejin import endpoints
+from juejin.const import ARTICLE_ID, DRAFT_ID
+
+ARTICLES = "articles"
+DRAFTS = "drafts"
+
+# bm25 weights of the title, brief_content and content columns
+COLUMN_WEIGHTS = (10.0, 3.0, 1.0)
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    UNIQUE (kind, doc_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    title, brief_content, content, tokenize = 'unicode61 remove_diacritics 0'
+);
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _patterns() -> Tuple["re.Pattern", "re.Pattern"]:
+    # Compiled on first use, these ranges take milliseconds to compile
+    return re.compile(f"[{_CJK}]+|(?:(?![{_CJK}])[^\\W_])+"), re.compile(f"[{_CJK}]")
+
+
+def _words(text: str) -> Iterator[Tuple[str, List[str], bool]]:
+    """Each word of text with its tokens and whether it is a CJK run"""
+    token_re, cjk_re = _patterns()
+    for match in token_re.finditer(text.lower()):
+        word = match.group()
+        if not cjk_re.match(word):
+            yield word, [word], False
+        elif len(word) > 1:
+            yield word, [word[i:i + 2] for i in range(len(word) - 1)], True
+        else:
+            yield word, [word], True
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Index tokens of a text: lowercased words, CJK runs as bigrams followed by their last character"""
+    if not text:
+        return []
+    tokens = []
+    for word, word_tokens, cjk in _words(text):
+        tokens.extend(word_tokens)
+        if cjk and len(word) > 1:
+            tokens.append(word[-1])
+    return tokens
+
+
+def _match_query(query: str) -> Optional[str]:
+    """FTS5 MATCH expression requiring every query word, each as a phrase of its tokens"""
+    phrases = []
+    for word, tokens, cjk in _words(query):
+        if cjk and len(word) == 1:
+            # The first character of a bigram, or the last one of a run indexed alone
+            phrases.append(f'"{word}"*')
+        else:
+            phrases.append('"' + " ".join(tokens) + '"')
+    return " AND ".join(phrases) if phrases else None
+
+
+def _field(data: Any, name: str) -> Any:
+    if isinstance(data, dict):
+        return data.get(name)
+    return getattr(data, name, None)
+
+
+class SearchIndex:
+    """SQLite FTS5 index of articles and drafts, thread-safe"""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Parameters:
+            path: SQLite database file, may be the file of a SyncStore
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        with self.lock, self.conn:
+            self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def index(self, kind: str, doc_id: str, title: Optional[str], brief_content: Optional[str],
+              content: Optional[str]) -> bool:
+        """Add or replace a document, returning False when its text did not change"""
+        columns = (" ".join(tokenize(title)), " ".join(tokenize(brief_content)), " ".join(tokenize(content)))
+        fingerprint = hashlib.sha1("\0".join(columns).encode("utf-8")).hexdigest()
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT id, fingerprint FROM search_docs WHERE kind = ? AND doc_id = ?",
+                                    (kind, doc_id)).fetchone()
+            if row is not None and row[1] == fingerprint:
+                return False
+            if row is not None:
+                rowid = row[0]
+                self.conn.execute("UPDATE search_docs SET fingerprint = ? WHERE id = ?", (fingerprint, rowid))
+                self.conn.execute("DELETE FROM search_fts WHERE rowid = ?", (rowid,))
+            else:
+                rowid = self.conn.execute("INSERT INTO search_docs (kind, doc_id, fingerprint) VALUES (?, ?, ?)",
+                                          (kind, doc_id, fingerprint)).lastrowid
+            self.conn.execute("INSERT INTO search_fts (rowid, title, brief_content, content) VALUES (?, ?, ?, ?)",
+                              (rowid,) + columns)
+        return True
+
+    def remove(self, kind: str, doc_id: str) -> bool:
+        """Drop a document, returning whether it was indexed"""
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT id FROM search_docs WHERE kind = ? AND doc_id = ?",
+                                    (kind, doc_id)).fetchone()
+            if row is None:
+                return False
+            self.conn.execute("DELETE FROM search_fts WHERE rowid = ?", (row[0],))
+            self.conn.execute("DELETE FROM search_docs WHERE id = ?", (row[0],))
+        return True
+
+    def index_article(self, detail: Any) -> bool:
+        """
+        Index an article detail, the data of /content_api/v1/article/detail.
+
+        Details whose content was projected out are skipped, so an index entry
+        never loses its content. Returns whether the index changed.
+        """
+        info = _field(detail, "article_info")
+        if info is None or (_field(info, "mark_content") is None and _field(info, "content") is None):
+            return False
+        article_id = _field(detail, ARTICLE_ID) or _field(info, ARTICLE_ID)
+        if not article_id:
+            return False
+        return self.index(ARTICLES, str(article_id), _field(info, "title"), _field(info, "brief_content"),
+                          _field(info, "mark_content") or _field(info, "content"))
+
+    def index_draft(self, draft_id: str, draft: Any) -> bool:
+        """Index a draft, a dict or an ArticleRequest. Returns whether the index changed"""
+        if _field(draft, "mark_content") is None:
+            return False
+        return self.index(DRAFTS, str(draft_id), _field(draft, "title"), _field(draft, "brief_content"),
+                          _field(draft, "mark_content"))
+
+    def observe(self, endpoint: str, data: Any, result: Any) -> None:
+        """Keep the index current with the successful call of an endpoint"""
+        if endpoint == endpoints.ARTICLE_DETAIL and isinstance(result, dict):
+            self.index_article(result)
+        elif endpoint == endpoints.ARTICLE_DRAFT_DETAIL and isinstance(result, dict):
+            draft = result.get("article_draft")
+            if isinstance(draft, dict) and draft.get("id"):
+                self.index_draft(draft["id"], draft)
+        elif endpoint == endpoints.ARTICLE_DRAFT_UPDATE and _field(data, "id"):
+            self.index_draft(_field(data, "id"), data)
+        elif endpoint == endpoints.ARTICLE_DRAFT_CREATE and isinstance(result, dict) and result.get("id"):
+            self.index_draft(result["id"], data)
+        elif endpoint == endpoints.ARTICLE_DRAFT_DELETE and _field(data, DRAFT_ID):
+            self.remove(DRAFTS, str(_field(data, DRAFT_ID)))
+        elif endpoint == endpoints.ARTICLE_DELETE and _field(data, ARTICLE_ID):
+            self.remove(ARTICLES, str(_field(data, ARTICLE_ID)))
+
+    def search_with_scores(self, query: str, kind: str = ARTICLES, limit: int = 20) -> List[Tuple[str, float]]:
+        """Ids of the documents matching every word of query with their bm25 score, best first"""
+        match = _match_query(query)
+        if match is None:
+            return []
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT d.doc_id, bm25(search_fts, ?, ?, ?) AS score FROM search_fts "
+                "JOIN search_docs d ON d.id = search_fts.rowid "
+                "WHERE search_fts MATCH ? AND d.kind = ? ORDER BY score LIMIT ?",
+                COLUMN_WEIGHTS + (match, kind, limit)).fetchall()
+        # bm25() is lower for better matches, flip it so higher scores rank first
+        return [(doc_id, -score) for doc_id, score in rows]
+
+    def search(self, query: str, kind: str = ARTICLES, limit: int = 20) -> List[str]:
+        """Ids of the documents matching every word of query, best first"""
+        return [doc_id for doc_id, _ in self.search_with_scores(query, kind, limit)]
+
+    def count(self, kind: str = ARTICLES) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM search_docs WHERE kind = ?", (kind,)).fetchone()[0]
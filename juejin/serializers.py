@@ -0,0 +1,195 @@
+"""
+Encoders and decoders generated per model class.
+
+Encoding a model used to reflect on every object: BaseModule._serialize
+filtered ``__dict__`` in a comprehension, and to_json went through
+DefaultEncoder.default, which probed each nested object for ``__dict__`` and
+built every nested LazyModel only to turn it back into a dict. Instead, the
+first use of a class compiles straight-line functions for its field list and
+caches them by class: fields are read by name and None values skipped without
+a loop, and nested LazyModel fields that were never accessed are encoded from
+the raw response by the nested class's own generated encoder, without building
+models.
+
+Encoders are shallow: a model held by another model's attribute is left in place
+and encoded by the JSON layer through :func:`encode_default`.
+
+Request models (BaseModule) declare their fields in ``__init__``, so their field
+list is taken from the first instance seen. An instance with other attributes
+takes the generic path.
+"""
+from typing import Any, Callable, Dict, Optional
+
+_EMPTY: Dict[str, Any] = {}
+
+# Generated functions by class, one table per kind
+_raw_encoders: Dict[type, Callable] = {}
+_lazy_encoders: Dict[type, Callable] = {}
+_lazy_decoders: Dict[type, Callable] = {}
+_module_encoders: Dict[type, Callable] = {}
+_module_serializers: Dict[type, Callable] = {}
+_module_decoders: Dict[type, Callable] = {}
+
+
+def _compile(name: str, lines, namespace: Dict[str, Any]) -> Callable:
+    exec(compile("\n".join(lines), f"<juejin.serializers {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def encode_default(obj: Any) -> Any:
+    """JSON ``default`` hook encoding models, and other objects by their ``__dict__``"""
+    encode = getattr(obj.__class__, "_encode", None)
+    if encode is not None:
+        return encode(obj)
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def _field(cls: type, name: str):
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return vars(klass)[name]
+    raise AttributeError(name)
+
+
+def raw_encoder(cls: type) -> Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Encoder of the raw data of a LazyModel class.
+
+    Returns what a model built from that data encodes to: every declared field,
+    with its default when missing, nested models encoded from their raw data.
+    """
+    encode = _raw_encoders.get(cls)
+    if encode is not None:
+        return encode
+
+    from juejin.models import LazyModel
+
+    namespace: Dict[str, Any] = {"_EMPTY": _EMPTY}
+    lines = ["def encode_raw(data):",
+             "    if data is None:",
+             "        data = _EMPTY",
+             "    get = data.get",
+             "    return {"]
+    for i, name in enumerate(cls._fields):
+        field = _field(cls, name)
+        key = repr(name)
+        namespace[f"_d{i}"] = field.default
+        if field.model is not None:
+            if field.model.__init__ is LazyModel.__init__:
+                namespace[f"_m{i}"] = raw_encoder(field.model)
+            else:
+                namespace[f"_m{i}"] = lambda value, model=field.model: model(value)._encode()
+            if field.many:
+                lines.append(f"        {key}: [_m{i}(item) for item in get({key}, _d{i}) or ()],")
+            else:
+                lines.append(f"        {key}: _m{i}(get({key}, _d{i})),")
+        elif isinstance(field.default, (list, dict)):
+            # Missing mutable defaults are copied, as Field does
+            lines.append(f"        {key}: data[{key}] if {key} in data else type(_d{i})(_d{i}),")
+        else:
+            lines.append(f"        {key}: get({key}, _d{i}),")
+    lines.append("    }")
+    encode = _raw_encoders[cls] = _compile("encode_raw", lines, namespace)
+    return encode
+
+
+def lazy_encoder(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """Encoder of LazyModel instances of a class, fields set or accessed since construction included"""
+    encode = _lazy_encoders.get(cls)
+    if encode is not None:
+        return encode
+    encode_raw = raw_encoder(cls)
+
+    def encode(obj) -> Dict[str, Any]:
+        out = encode_raw(obj._data)
+        if obj._values:
+            out.update(obj._values)
+        return out
+
+    _lazy_encoders[cls] = encode
+    return encode
+
+
+def lazy_decoder(cls: type) -> Callable[[Any, Dict[str, Any]], Any]:
+    """Decoder setting the declared fields of a LazyModel instance from a dict, other keys ignored"""
+    decode = _lazy_decoders.get(cls)
+    if decode is not None:
+        return decode
+    lines = ["def decode(obj, data):",
+             "    values = obj._values",
+             "    if values is None:",
+             "        values = obj._values = {}"]
+    for name in cls._fields:
+        lines.append(f"    if {name!r} in data:")
+        lines.append(f"        values[{name!r}] = data[{name!r}]")
+    lines.append("    return obj")
+    decode = _lazy_decoders[cls] = _compile("decode", lines, {})
+    return decode
+
+
+def module_encoder(obj: Any, skip_none: bool = False) -> Callable[[Any], Dict[str, Any]]:
+    """Encoder of BaseModule instances of the class of obj, compiled for its attributes"""
+    table = _module_serializers if skip_none else _module_encoders
+    encode = table.get(obj.__class__)
+    if encode is not None:
+        return encode
+
+    keys = tuple(obj.__dict__)
+    namespace: Dict[str, Any] = {"_generic": _generic_skip if skip_none else _generic}
+    # An instance with as many attributes either has these keys or is missing one of them
+    lines = ["def encode(obj):",
+             "    d = obj.__dict__",
+             f"    if len(d) != {len(keys)}:",
+             "        return _generic(d)",
+             "    try:"]
+    if skip_none:
+        lines.append("        out = {}")
+        for name in keys:
+            lines.append(f"        v = d[{name!r}]")
+            lines.append("        if v is not None:")
+            lines.append(f"            out[{name!r}] = v")
+        lines.append("        return out")
+    else:
+        lines.append("        return {" + ", ".join(f"{name!r}: d[{name!r}]" for name in keys) + "}")
+    lines.append("    except KeyError:")
+    lines.append("        return _generic(d)")
+    encode = table[obj.__class__] = _compile("encode", lines, namespace)
+    return encode
+
+
+def _generic(d: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(d)
+
+
+def _generic_skip(d: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in d.items() if v is not None}
+
+
+def module_decoder(obj: Any) -> Callable[[Any, Dict[str, Any]], Any]:
+    """Decoder setting the existing attributes of a BaseModule instance from a dict, other keys ignored"""
+    decode = _module_decoders.get(obj.__class__)
+    if decode is not None:
+        return decode
+
+    keys = tuple(obj.__dict__)
+    lines = ["def decode(obj, data):",
+             "    d = obj.__dict__",
+             f"    if len(d) != {len(keys)} or d.keys() != _keys:",
+             "        return _generic(obj, data)"]
+    for name in keys:
+        lines.append(f"    if {name!r} in data:")
+        lines.append(f"        d[{name!r}] = data[{name!r}]")
+    lines.append("    return obj")
+    namespace = {"_keys": frozenset(keys), "_generic": _generic_decode}
+    decode = _module_decoders[obj.__class__] = _compile("decode", lines, namespace)
+    return decode
+
+
+def _generic_decode(obj: Any, data: Dict[str, Any]) -> Any:
+    attrs = obj.__dict__
+    for k, v in data.items():
+        if k in attrs:
+            setattr(obj, k, v)
+    return obj
@@ -0,0 +1,94 @@
+"""
+Coalescing of identical in-flight requests.
+
+While a call for a key is running, further calls for the same key do not start
+their own. They wait for the running one and get its result or its exception.
+Results are shared between the callers, so treat them as read-only, like cached
+responses. Only use it for idempotent requests. The clients key requests by
+account too, so a group may be shared by clients of different accounts.
+"""
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-based single-flight group, thread-safe and shareable between clients"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        # Calls that ran, and calls that got the result of another one instead
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn unless a call for key is already in flight, and return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of the group"""
+        with self._lock:
+            return {"executed": self.executed, "deduplicated": self.deduplicated, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio single-flight group, for the coroutines of one event loop.
+
+    The shared call runs as a task, so a waiting caller being cancelled does not
+    cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.executed = 0
+        self.deduplicated = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() unless a call for key is already in flight, and return its result"""
+        import asyncio  # only async callers pay for importing asyncio
+
+        task = self._calls.get(key)
+        if task is not None:
+            self.deduplicated += 1
+        else:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.executed += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of the group"""
+        return {"executed": self.executed, "deduplicated": self.deduplicated, "in_flight": len(self._calls)}
@@ -0,0 +1,211 @@
+"""
+Incremental parsing of list responses.
+
+A list response looks like ``{"err_no": 0, "err_msg": "success", "data": [...], "has_more": true}``.
+JSONArrayParser is fed the body chunk by chunk and hands back the items of the
+``data`` array as soon as each one is complete. Every other top-level key is
+collected in ``envelope``. So peak memory stays near one item plus one chunk,
+not the whole page.
+"""
+import codecs
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+# Parser states
+_START, _KEY, _COLON, _VALUE, _NEXT_KEY, _FIRST_ITEM, _ITEM, _NEXT_ITEM, _DONE = range(9)
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+# Sentinel returned while a value is not complete yet
+_MORE = object()
+
+
+class JSONArrayParser:
+    """Push parser streaming the items of one top-level array of a JSON object"""
+
+    def __init__(self, key: str = "data"):
+        """
+        Parameters:
+            key: Top-level key of the array to stream
+        """
+        self.key = key
+        self.envelope: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._current_key = None
+        # Pending text a retried value needs before decoding is attempted again,
+        # doubling on each miss so large items are not re-parsed once per chunk
+        self._min_pending = 0
+        self._eof = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume a chunk of the body and return the items it completed"""
+        self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return self._advance()
+
+    def close(self) -> List[Any]:
+        """Signal the end of the body and return the remaining items"""
+        self._buf = self._buf[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        items = self._advance()
+        if self._state != _DONE:
+            raise json.JSONDecodeError("Truncated JSON document", self._buf, self._pos)
+        return items
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def _value(self) -> Any:
+        """Decode the value at the current position, or return _MORE if it may be incomplete"""
+        pending = len(self._buf) - self._pos
+        if not self._eof and pending < self._min_pending:
+            return _MORE
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            self._min_pending = pending * 2
+            return _MORE
+        # A number cut by the end of the buffer ("3." of "3.25") may continue in the next chunk
+        if not self._eof and (end >= len(self._buf) or self._buf[end] not in _DELIMITERS):
+            self._min_pending = pending + 1
+            return _MORE
+        self._min_pending = 0
+        self._pos = end
+        return value
+
+    def _advance(self) -> List[Any]:
+        items = []
+        buf = self._buf
+        while True:
+            while self._pos < len(buf) and buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos >= len(buf):
+                return items
+            char = buf[self._pos]
+            state = self._state
+
+            if state == _DONE:
+                raise self._error("Extra data after JSON document")
+            if state == _START:
+                if char != "{":
+                    raise self._error("Expecting '{'")
+                self._pos += 1
+                self._state = _KEY
+            elif state == _KEY:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                if char != '"':
+                    raise self._error("Expecting property name enclosed in double quotes")
+                key = self._value()
+                if key is _MORE:
+                    return items
+                self._current_key = key
+                self._state = _COLON
+            elif state == _COLON:
+                if char != ":":
+                    raise self._error("Expecting ':' delimiter")
+                self._pos += 1
+                self._state = _VALUE
+            elif state == _VALUE:
+                if self._current_key == self.key and char == "[":
+                    self._pos += 1
+                    self._state = _FIRST_ITEM
+                    continue
+                value = self._value()
+                if value is _MORE:
+                    return items
+                self.envelope[self._current_key] = value
+                self._state = _NEXT_KEY
+            elif state == _NEXT_KEY:
+                if char not in ",}":
+                    raise self._error("Expecting ',' delimiter")
+                self._pos += 1
+                self._state = _KEY if char == "," else _DONE
+            elif state in (_FIRST_ITEM, _ITEM):
+                if char == "]":
+                    if state == _ITEM:
+                        raise self._error("Expecting value")
+                    self._pos += 1
+                    self._state = _NEXT_KEY
+                    continue
+                item = self._value()
+                if item is _MORE:
+                    return items
+                items.append(item)
+                self._state = _NEXT_ITEM
+            elif state == _NEXT_ITEM:
+                if char not in ",]":
+                    raise self._error("Expecting ',' delimiter")
+                self._pos += 1
+                self._state = _ITEM if char == "," else _NEXT_KEY
+
+
+class ItemStream:
+    """
+    Iterator over the items of a streamed list response.
+
+    The other top-level fields (``has_more``, ``cursor``, ``count``...) are in
+    ``envelope`` once iteration has finished.
+    """
+
+    def __init__(self, items: Iterator[Any], parser: JSONArrayParser):
+        self._items = items
+        self._parser = parser
+
+    @property
+    def envelope(self) -> Dict[str, Any]:
+        return self._parser.envelope
+
+    @property
+    def has_more(self) -> bool:
+        return bool(self._parser.envelope.get("has_more"))
+
+    def __iter__(self) -> "ItemStream":
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._items)
+
+    def close(self) -> None:
+        """Stop iterating and release the connection"""
+        self._items.close()
+
+
+class AsyncItemStream:
+    """Asyncio counterpart of :class:`ItemStream`"""
+
+    def __init__(self, items: AsyncIterator[Any], parser: JSONArrayParser):
+        self._items = items
+        self._parser = parser
+
+    @property
+    def envelope(self) -> Dict[str, Any]:
+        return self._parser.envelope
+
+    @property
+    def has_more(self) -> bool:
+        return bool(self._parser.envelope.get("has_more"))
+
+    def __aiter__(self) -> "AsyncItemStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._items.__anext__()
+
+    async def close(self) -> None:
+        """Stop iterating and release the connection"""
+        await self._items.aclose()
@@ -0,0 +1,300 @@
+"""
+Incremental mirror of a user's articles and drafts in SQLite.
+
+SyncEngine walks the article and draft lists page by page and compares the
+``mtime``/``version`` of every listed item with the stored one. Only new and changed
+items get their detail fetched. Each page is committed together with a checkpoint,
+so an interrupted sync resumes at the page after the last committed one. With
+prune, items not listed by a completed sync are removed from the store, but only
+when the server reported the same count on every page and the sync listed that
+many items: offset pages shift when items are added or deleted during a sync, and
+an item skipped that way must not be mistaken for a deleted one.
+"""
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from juejin import codec
+from juejin.batch import run_batch
+from juejin.client import JuejinClient
+from juejin.models import DescribeArticleListRequest, LazyModel
+from juejin.pagination import has_more, page_items, page_request, total_count
+from juejin.projection import HEAVY_CONTENT_FIELDS, Projection
+from juejin.search import ARTICLES, DRAFTS, SearchIndex
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id TEXT PRIMARY KEY,
+    draft_id TEXT,
+    title TEXT,
+    mtime TEXT,
+    version TEXT,
+    detail TEXT NOT NULL,
+    seen_run TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS drafts (
+    draft_id TEXT PRIMARY KEY,
+    article_id TEXT,
+    title TEXT,
+    mtime TEXT,
+    version TEXT,
+    detail TEXT NOT NULL,
+    seen_run TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS sync_checkpoints (
+    kind TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    page_no INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    updated_at REAL
+);
+"""
+
+_KEYS = {ARTICLES: "article_id", DRAFTS: "draft_id"}
+
+
+class SyncStore:
+    """SQLite store of synced articles and drafts, keyed by article_id and draft_id"""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Parameters:
+            path: SQLite database file, ":memory:" for a throwaway store
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def versions(self, kind: str, ids: List[str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """Stored (mtime, version) of the given ids that are in the store"""
+        if not ids:
+            return {}
+        key = _KEYS[kind]
+        marks = ",".join("?" * len(ids))
+        with self.lock:
+            rows = self.conn.execute(f"SELECT {key}, mtime, version FROM {kind} WHERE {key} IN ({marks})", ids)
+            return {row[0]: (row[1], row[2]) for row in rows}
+
+    def get(self, kind: str, item_id: str) -> Optional[Dict[str, Any]]:
+        """Stored detail of an article or draft"""
+        with self.lock:
+            row = self.conn.execute(f"SELECT detail FROM {kind} WHERE {_KEYS[kind]} = ?", (item_id,)).fetchone()
+        return codec.loads(row[0]) if row is not None else None
+
+    def get_article(self, article_id: str) -> Optional[Dict[str, Any]]:
+        return self.get(ARTICLES, article_id)
+
+    def get_draft(self, draft_id: str) -> Optional[Dict[str, Any]]:
+        return self.get(DRAFTS, draft_id)
+
+    def ids(self, kind: str) -> List[str]:
+        with self.lock:
+            return [row[0] for row in self.conn.execute(f"SELECT {_KEYS[kind]} FROM {kind} ORDER BY 1")]
+
+    def count(self, kind: str) -> int:
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {kind}").fetchone()[0]
+
+    def checkpoint(self, kind: str) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute("SELECT * FROM sync_checkpoints WHERE kind = ?", (kind,)).fetchone()
+
+    def commit_page(self, kind: str, run_id: str, page_no: int, seen: List[str],
+                    rows: List[Dict[str, Any]]) -> None:
+        """Store the fetched items of a page and advance the checkpoint, in one transaction"""
+        key = _KEYS[kind]
+        other = "draft_id" if kind == ARTICLES else "article_id"
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {kind} ({key}, {other}, title, mtime, version, detail, seen_run, synced_at) "
+                f"VALUES (:id, :other, :title, :mtime, :version, :detail, :run_id, :now) "
+                f"ON CONFLICT({key}) DO UPDATE SET {other} = excluded.{other}, title = excluded.title, "
+                f"mtime = excluded.mtime, version = excluded.version, detail = excluded.detail, "
+                f"seen_run = excluded.seen_run, synced_at = excluded.synced_at",
+                [dict(row, run_id=run_id, now=now) for row in rows],
+            )
+            self.conn.executemany(f"UPDATE {kind} SET seen_run = ? WHERE {key} = ?",
+                                  [(run_id, item_id) for item_id in seen])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_checkpoints (kind, run_id, page_no, done, updated_at) "
+                "VALUES (?, ?, ?, 0, ?)", (kind, run_id, page_no, now))
+
+    def finish(self, kind: str, run_id: str, prune: bool, count: Optional[int] = None) -> List[str]:
+        """
+        Mark a sync complete and return the ids of the items it removed
+
+        With prune, the items the sync did not see are removed, provided it saw
+        all ``count`` items the server reports; nothing is removed without a count.
+        """
+        key = _KEYS[kind]
+        with self.lock, self.conn:
+            removed = []
+            if prune and count is not None and count == self.conn.execute(
+                    f"SELECT COUNT(*) FROM {kind} WHERE seen_run = ?", (run_id,)).fetchone()[0]:
+                # Select then delete in the same transaction, DELETE ... RETURNING needs SQLite 3.35
+                removed = [row[0] for row in self.conn.execute(
+                    f"SELECT {key} FROM {kind} WHERE seen_run IS NOT ?", (run_id,))]
+                self.conn.execute(f"DELETE FROM {kind} WHERE seen_run IS NOT ?", (run_id,))
+            self.conn.execute("UPDATE sync_checkpoints SET done = 1, updated_at = ? WHERE kind = ?",
+                              (time.time(), kind))
+        return removed
+
+
+class SyncReport:
+    """Outcome of one sync of articles or drafts"""
+
+    def __init__(self, kind: str, run_id: str, resumed: bool):
+        self.kind = kind
+        self.run_id = run_id
+        self.resumed = resumed
+        self.pages = 0
+        self.listed = 0
+        self.fetched = 0
+        self.unchanged = 0
+        self.removed = 0
+        # Item id -> JuejinAPIError of the details that could not be fetched, retried on the next sync
+        self.failed: Dict[str, Exception] = {}
+
+    def __repr__(self) -> str:
+        return (f"SyncReport({self.kind}, pages={self.pages}, listed={self.listed}, fetched={self.fetched}, "
+                f"unchanged={self.unchanged}, removed={self.removed}, failed={len(self.failed)})")
+
+
+def _article_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    info = item.get("article_info") or {}
+    return {
+        "id": item.get("article_id") or info.get("article_id"),
+        "other": info.get("draft_id"),
+        "title": info.get("title"),
+        "mtime": info.get("mtime"),
+        "version": info.get("version"),
+    }
+
+
+def _draft_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    draft = item.get("article_draft") or item
+    return {
+        "id": draft.get("id") or draft.get("draft_id"),
+        "other": draft.get("article_id"),
+        "title": draft.get("title"),
+        "mtime": draft.get("mtime"),
+        "version": draft.get("version"),
+    }
+
+
+def _str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class SyncEngine:
+    """Incremental sync of the articles and drafts of the client's user into a SyncStore"""
+
+    def __init__(self, client: JuejinClient, store: SyncStore, max_workers: int = 8, prune: bool = False,
+                 page_size: int = 20, search_index: Optional[SearchIndex] = None):
+        """
+        Parameters:
+            client: Client of the user to mirror
+            store: Store to sync into
+            max_workers: Detail requests in flight
+            prune: Remove items a completed sync did not list, i.e. deleted ones, when the list did not
+                change during the sync
+            page_size: Items per list page
+            search_index: Optional full-text index updated with fetched and removed items
+        """
+        self.client = client
+        self.store = store
+        self.max_workers = max_workers
+        self.prune = prune
+        self.page_size = page_size
+        self.search_index = search_index
+
+    def sync(self) -> Dict[str, SyncReport]:
+        """Sync articles, then drafts"""
+        return {ARTICLES: self.sync_articles(), DRAFTS: self.sync_drafts()}
+
+    def sync_articles(self, req: Optional[DescribeArticleListRequest] = None) -> SyncReport:
+        return self._sync(ARTICLES, req, self.client.fetch_article_page, _article_entry, self._fetch_articles)
+
+    def sync_drafts(self, req: Optional[DescribeArticleListRequest] = None) -> SyncReport:
+        return self._sync(DRAFTS, req, self.client.fetch_draft_page, _draft_entry, self._fetch_drafts)
+
+    def _fetch_articles(self, ids: List[str]) -> Iterator:
+        return self.client.describe_article_details(ids, max_workers=self.max_workers)
+
+    def _fetch_drafts(self, ids: List[str]) -> Iterator:
+        return run_batch(self.client.describe_article_draft_detail, ids, self.max_workers)
+
+    def _sync(self, kind: str, req, fetch_page, entry_of, fetch_details) -> SyncReport:
+        if req is None:
+            req = DescribeArticleListRequest()
+            req.page_size = self.page_size
+
+        checkpoint = self.store.checkpoint(kind)
+        resumed = checkpoint is not None and not checkpoint["done"]
+        run_id = checkpoint["run_id"] if resumed else uuid.uuid4().hex
+        page_no = checkpoint["page_no"] + 1 if resumed else (req.page_no or 1)
+        report = SyncReport(kind, run_id, resumed)
+        # Bodies are dropped from list items, the detail request fetches them
+        projection = Projection(exclude=HEAVY_CONTENT_FIELDS) if kind == ARTICLES else None
+        counts = set()
+
+        while True:
+            rsp = fetch_page(page_request(req, page_no), projection)
+            entries = [entry_of(item) for item in page_items(rsp)]
+            entries = [e for e in entries if e["id"]]
+            report.pages += 1
+            counts.add(total_count(rsp))
+            report.listed += len(entries)
+
+            stored = self.store.versions(kind, [e["id"] for e in entries])
+            changed = {e["id"]: e for e in entries
+                       if stored.get(e["id"]) != (_str(e["mtime"]), _str(e["version"]))}
+            report.unchanged += len(entries) - len(changed)
+
+            rows = []
+            for result in fetch_details(list(changed)):
+                if not result.ok:
+                    report.failed[result.key] = result.error
+                    continue
+                detail = result.value
+                data = detail.raw if isinstance(detail, LazyModel) else detail
+                e = changed[result.key]
+                rows.append(dict(e, mtime=_str(e["mtime"]), version=_str(e["version"]),
+                                 detail=codec.dumps(data, ensure_ascii=False).decode("utf-8")))
+                if self.search_index is not None:
+                    self._index(kind, e["id"], data)
+            report.fetched += len(rows)
+
+            # Items whose detail failed keep their stored version, so they are fetched again next time
+            more = has_more(rsp, req.page_size)
+            self.store.commit_page(kind, run_id, page_no, [e["id"] for e in entries], rows)
+            if not more:
+                break
+            page_no += 1
+
+        # A count that changed between pages means items shifted, pages listed before resuming are not known
+        count = next(iter(counts)) if len(counts) == 1 and not resumed else None
+        removed = self.store.finish(kind, run_id, self.prune, count)
+        if self.search_index is not None:
+            for item_id in removed:
+                self.search_index.remove(kind, item_id)
+        report.removed = len(removed)
+        return report
+
+    def _index(self, kind: str, item_id: str, data: Dict[str, Any]) -> None:
+        if kind == ARTICLES:
+            self.search_index.index_article(data)
+        else:
+            self.search_index.index_draft(item_id, data.get("article_draft") or {})
@@ -0,0 +1,276 @@
+"""
+Record and replay of HTTP exchanges for network-free runs.
+
+RecordingTransport and ReplayTransport are requests transport adapters, pass one
+as ``JuejinClient(transport=...)``. A cassette is a JSONL file with one exchange
+per line, keyed by a hash of method, path, query and body. Its sidecar
+``<cassette>.idx`` maps every key to the byte offsets of its lines, so replay
+looks an exchange up in O(1) and reads only that line, whatever the cassette size.
+The index is rebuilt with one scan whenever it does not match the cassette.
+"""
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from juejin import codec
+
+INDEX_VERSION = 1
+
+# Signing parameters that change on every session, left out of the exchange keys
+DEFAULT_IGNORED_PARAMS = ("msToken", "a_bogus")
+
+# Headers describing the wire encoding of a body, which is recorded decoded
+_WIRE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """The cassette holds no exchange for a request"""
+
+
+def request_key(method: str, url: str, body: Union[bytes, str, None],
+                ignore_params: Iterable[str] = DEFAULT_IGNORED_PARAMS) -> str:
+    """Key of a request: sha1 of method, path, sorted query without ignored params and body"""
+    parts = urlsplit(url)
+    ignored = set(ignore_params)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in ignored)
+    digest = hashlib.sha1(f"{method.upper()} {parts.path}?{urlencode(query)}\n".encode("utf-8"))
+    if body:
+        digest.update(body.encode("utf-8") if isinstance(body, str) else body)
+    return digest.hexdigest()
+
+
+class Cassette:
+    """JSONL file of recorded exchanges with a sidecar offset index"""
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path: Cassette file, created on the first append
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self._index: Optional[Dict[str, List[int]]] = None
+        self._reader = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> Dict[str, List[int]]:
+        """Offsets of the lines of every key, loaded or rebuilt on first use"""
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index()
+            return self._index
+
+    def _load_index(self) -> Dict[str, List[int]]:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        try:
+            with open(self.index_path, "rb") as f:
+                saved = codec.loads(f.read())
+            if saved.get("version") == INDEX_VERSION and saved.get("size") == size:
+                return saved["entries"]
+        except (OSError, codec.DecodeError):
+            pass
+        index = self._scan()
+        self._dirty = True
+        return index
+
+    def _scan(self) -> Dict[str, List[int]]:
+        index = defaultdict(list)
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    index[codec.loads(line)["key"]].append(offset)
+                offset += len(line)
+        return dict(index)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Append an exchange, entry["key"] must be set"""
+        line = codec.dumps(entry, ensure_ascii=False) + b"\n"
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index()
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            self._index.setdefault(entry["key"], []).append(offset)
+            self._dirty = True
+
+    def read(self, offset: int) -> Dict[str, Any]:
+        """The exchange whose line starts at offset"""
+        with self._lock:
+            if self._reader is None:
+                self._reader = open(self.path, "rb")
+            self._reader.seek(offset)
+            line = self._reader.readline()
+        return codec.loads(line)
+
+    def save_index(self) -> None:
+        """Write the sidecar index if it changed"""
+        with self._lock:
+            if not self._dirty or self._index is None:
+                return
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(codec.dumps({"version": INDEX_VERSION, "size": size, "entries": self._index}))
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+    def close(self) -> None:
+        self.save_index()
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+
+def _cassette(cassette: Union[str, Cassette]) -> Cassette:
+    return cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+
+
+def _entry(key: str, request: requests.PreparedRequest, response: requests.Response) -> Dict[str, Any]:
+    parts = urlsplit(request.url)
+    body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+    entry = {
+        "key": key,
+        "method": request.method,
+        "path": parts.path,
+        "query": parts.query,
+        "request_body": body.decode("utf-8", "replace") if body else None,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS},
+    }
+    try:
+        entry["body"] = response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        entry["body_b64"] = base64.b64encode(response.content).decode("ascii")
+    return entry
+
+
+class RecordingTransport(BaseAdapter):
+    """Transport sending requests through another adapter and appending every exchange to a cassette"""
+
+    def __init__(self, cassette: Union[str, Cassette], adapter: Optional[BaseAdapter] = None,
+                 ignore_params: Iterable[str] = DEFAULT_IGNORED_PARAMS):
+        """
+        Parameters:
+            cassette: Cassette or path of the cassette file, appended to
+            adapter: Adapter doing the real requests, a default HTTPAdapter if None
+            ignore_params: Query parameters left out of the exchange keys
+        """
+        super().__init__()
+        self.cassette = _cassette(cassette)
+        self.adapter = adapter if adapter is not None else HTTPAdapter()
+        self.ignore_params = tuple(ignore_params)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = self.adapter.send(request, **kwargs)
+        key = request_key(request.method, request.url, request.body, self.ignore_params)
+        # Reading the content up front keeps iter_content working for streaming callers
+        self.cassette.append(_entry(key, request, response))
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+        self.cassette.close()
+
+
+class ReplayTransport(BaseAdapter):
+    """
+    Transport answering requests from a cassette, without any network access.
+
+    The n-th request with a key gets the n-th exchange recorded with it, and the
+    last one once they are used up. A request missing from the cassette raises
+    CassetteMissError, which the client reports as a network error (-2).
+    """
+
+    def __init__(self, cassette: Union[str, Cassette], ignore_params: Iterable[str] = DEFAULT_IGNORED_PARAMS,
+                 cache_size: int = 1024):
+        """
+        Parameters:
+            cassette: Cassette or path of the cassette file
+            ignore_params: Query parameters left out of the exchange keys
+            cache_size: Decoded exchanges kept in memory, 0 disables the cache
+        """
+        super().__init__()
+        self.cassette = _cassette(cassette)
+        self.ignore_params = tuple(ignore_params)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._served: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _read(self, offset: int) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._cache.get(offset)
+            if entry is not None:
+                self._cache.move_to_end(offset)
+                return entry
+        entry = self.cassette.read(offset)
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[offset] = entry
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return entry
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None, verify=True,
+             cert=None, proxies=None) -> requests.Response:
+        key = request_key(request.method, request.url, request.body, self.ignore_params)
+        offsets = self.cassette.index.get(key)
+        if not offsets:
+            raise CassetteMissError(f"No recorded exchange for {request.method} {request.url}", request=request)
+        with self._lock:
+            served = self._served[key]
+            self._served[key] = served + 1
+        entry = self._read(offsets[min(served, len(offsets) - 1)])
+
+        if "body_b64" in entry:
+            body = base64.b64decode(entry["body_b64"])
+        else:
+            body = entry.get("body", "").encode("utf-8")
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(0)
+        return response
+
+    def close(self) -> None:
+        self.cassette.close()
+
+
+def transport_from_env(environ: Optional[Dict[str, str]] = None) -> Optional[BaseAdapter]:
+    """
+    Transport selected by environment variables, None when JUEJIN_CASSETTE is not set.
+
+    JUEJIN_CASSETTE is the cassette path. It is replayed, or recorded if JUEJIN_RECORD=1.
+    """
+    environ = os.environ if environ is None else environ
+    path = environ.get("JUEJIN_CASSETTE")
+    if not path:
+        return None
+    if environ.get("JUEJIN_RECORD") == "1":
+        return RecordingTransport(path)
+    return ReplayTransport(path)
@@ -8,10 +8,15 @@ setup(
     long_description_content_type="text/markdown",
     author="occrq",
     author_email="1310874029@qq.com ",
-    packages=find_packages(),
+    packages=find_packages(exclude=("benchmarks", "benchmarks.*")),
     install_requires=[
         "requests>=2.25.1",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "fast": ["orjson>=3.6"],
+        "compress": ["brotli>=1.0.9", "zstandard>=0.18"],
+    },
     python_requires=">=3.7",
     classifiers=[
         "Programming Language :: Python :: 3",